@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# /benchmarks/concurrent_writers.py
+# Version: 19-10-2026 15:00:00
+# Pre-Suader AI Agent - Multi-Writer Throughput Benchmark
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Sustained multi-process write throughput against one metrics database.
+Compares workers writing directly (WAL, busy timeout and jittered retry)
+with workers feeding the single-writer funnel process.
+
+Usage:
+    python benchmarks/concurrent_writers.py --workers 8 --rows 20000 --batch 500
+"""
+
+import argparse
+import json
+import multiprocessing
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+
+import instrumentation
+from metrics_tracker import MetricsTracker
+from metrics_writer import MetricsWriterProcess
+
+def _rows(worker: int, start: int, count: int):
+    return [(f"writer_{worker:02d}", "clicks", float(i), "2026-01-01T00:00:00",
+             "control", "benchmark") for i in range(start, start + count)]
+
+def _direct_worker(db_path: str, worker: int, rows: int, batch: int, results):
+    instrumentation.enable()
+    tracker = MetricsTracker(db_path)
+    failed = 0
+    for start in range(0, rows, batch):
+        try:
+            tracker.record_metrics(_rows(worker, start, min(batch, rows - start)))
+        except sqlite3.OperationalError:
+            failed += 1
+    retries = sum(value for (name, _), value in instrumentation.REGISTRY.counter_snapshot().items()
+                  if name == "sqlite_lock_retries")
+    results.put((failed, retries))
+
+def _funnel_worker(batches, worker: int, rows: int, batch: int):
+    for start in range(0, rows, batch):
+        batches.put(_rows(worker, start, min(batch, rows - start)))
+
+def _count_rows(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    total = conn.execute('SELECT COUNT(*) FROM metrics').fetchone()[0]
+    conn.close()
+    return total
+
+def run_direct(db_path: str, workers: int, rows: int, batch: int) -> dict:
+    MetricsTracker(db_path)
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_direct_worker,
+                                         args=(db_path, w, rows, batch, results))
+                 for w in range(workers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+    written = _count_rows(db_path)
+    return {
+        "mode": "direct",
+        "rows": written,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_s": round(written / elapsed),
+        "failed_batches": sum(failed for failed, _ in outcomes),
+        "lock_retries": sum(retries for _, retries in outcomes)
+    }
+
+def run_funnel(db_path: str, workers: int, rows: int, batch: int) -> dict:
+    start = time.perf_counter()
+    with MetricsWriterProcess(db_path) as writer:
+        processes = [multiprocessing.Process(target=_funnel_worker,
+                                             args=(writer.queue, w, rows, batch))
+                     for w in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": "funnel",
+        "rows": writer.recorded,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_s": round(writer.recorded / elapsed),
+        "failed_batches": 0,
+        "lock_retries": 0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-writer metrics database throughput")
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent writer processes')
+    parser.add_argument('--rows', type=int, default=20000, help='Rows written per worker')
+    parser.add_argument('--batch', type=int, default=500, help='Rows per write call')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, runner in (("direct", run_direct), ("funnel", run_funnel)):
+            result = runner(str(Path(tmp) / f"{mode}.db"), args.workers, args.rows, args.batch)
+            results.append(result)
+            print(f"  {mode:<8} {result['rows_per_s']:>10,} rows/s "
+                  f"({result['rows']:,} rows in {result['elapsed_s']}s, "
+                  f"{result['lock_retries']} lock retries, "
+                  f"{result['failed_batches']} failed batches)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"workers": args.workers, "rows": args.rows, "batch": args.batch,
+                       "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
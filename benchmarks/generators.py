@@ -0,0 +1,86 @@
+# /benchmarks/generators.py
+# Version: 19-10-2026 11:00:00
+# Pre-Suader AI Agent - Benchmark Data Generators
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Seeded synthetic data generators for the benchmark suite.
+Every generator takes an explicit seed so runs are reproducible; metric
+rows and creatives come from the shared load generator in src/.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from load_generator import generate_creatives, generate_metric_rows
+
+SEGMENTS = ["Tech Founders", "Agency Owners", "Enterprise IT", "SMB Marketers", "Product Leads"]
+PAIN_POINTS = ["scaling challenges", "high costs", "slow onboarding", "team productivity",
+               "competitive pressure", "data silos"]
+VALUES = ["innovation", "transparency", "quality", "growth", "efficiency"]
+
+# Non-Latin filler words and Latin-lookalike substitutions for mixed-script copy
+FOREIGN_WORDS = ["качество", "рост", "διαφάνεια", "ποιότητα", "品質", "成長", "جودة", "नवाचार",
+                 "Qualität", "croissance", "innovación", "투명성"]
+HOMOGLYPHS = {"a": "а", "c": "с", "e": "е", "o": "о", "p": "р", "x": "х", "i": "і"}
+
+def make_audiences(count: int, seed: int = 42) -> List[Dict]:
+    """Generate raw audience data dicts"""
+    rng = random.Random(seed)
+    return [
+        {
+            "segment_name": f"{rng.choice(SEGMENTS)} {i}",
+            "demographics": {"industry": rng.choice(["saas", "retail", "finance"])},
+            "tech_savvy": rng.random() < 0.6,
+            "business_focused": rng.random() < 0.5,
+            "risk_averse": rng.random() < 0.3,
+            "preferences": rng.choice(["transparency", "speed", ""]),
+            "interests": rng.choice(["innovation", "cost", ""]),
+            "priorities": rng.choice(["quality", "price", ""]),
+            "pain_points": rng.sample(PAIN_POINTS, 2),
+            "values": rng.sample(VALUES, 2)
+        }
+        for i in range(count)
+    ]
+
+def make_contents(count: int, words: int = 200, flagged_rate: float = 0.02,
+                  seed: int = 42) -> List[str]:
+    """Generate marketing copy with a tunable share of flagged phrases"""
+    return [creative["content"]
+            for creative in generate_creatives(count, [], words=words,
+                                               flagged_rate=flagged_rate, seed=seed)]
+
+def make_multilingual_contents(count: int, words: int = 200, flagged_rate: float = 0.02,
+                               seed: int = 42) -> List[str]:
+    """
+    Generate mixed-script copy: foreign-language words interleaved with
+    English, and some words disguised with full-width forms, Cyrillic
+    homoglyphs, combining accents or zero-width joiners
+    """
+    rng = random.Random(seed)
+
+    def disguise(word: str) -> str:
+        roll = rng.random()
+        if roll < 0.05:
+            return "".join(chr(ord(ch) + 0xFEE0) if "!" <= ch <= "~" else ch for ch in word)
+        if roll < 0.10:
+            return "".join(HOMOGLYPHS.get(ch, ch) for ch in word)
+        if roll < 0.13:
+            return word[:1] + "\u0301" + word[1:]
+        if roll < 0.15:
+            return word[:1] + "\u200d" + word[1:]
+        if roll < 0.30:
+            return rng.choice(FOREIGN_WORDS)
+        return word
+
+    return [" ".join(disguise(word) for word in content.split(" "))
+            for content in make_contents(count, words, flagged_rate, seed)]
+
+def make_metric_rows(campaigns: int, rows_per_campaign: int, days: int = 30,
+                     seed: int = 42) -> List[Tuple]:
+    """Generate metrics table rows (campaign_id, metric_name, value, timestamp, variant, source)"""
+    campaign_ids = [f"bench_{c:05d}" for c in range(campaigns)]
+    end = datetime.now()
+    return list(generate_metric_rows(campaign_ids, 2, campaigns * rows_per_campaign,
+                                     end - timedelta(days=days), end, seed=seed))
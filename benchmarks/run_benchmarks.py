@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# /benchmarks/run_benchmarks.py
+# Version: 19-10-2026 11:00:00
+# Pre-Suader AI Agent - Benchmark Suite
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Benchmark harness for PreSuaderCore and MetricsTracker hot paths.
+Emits machine-readable JSON results and compares them against a stored
+baseline so regressions surface before deployment.
+
+Usage:
+    python benchmarks/run_benchmarks.py --scale small
+    python benchmarks/run_benchmarks.py --scale medium --output results.json
+    python benchmarks/run_benchmarks.py --scale small --update-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+from presuader_core_functions import PreSuaderCore
+from content_explorer import ContentExplorer
+from content_generator import ContentGenerator, StubBackend
+from metrics_tracker import MetricsTracker
+from text_normalizer import normalize_text
+import generators
+
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+# Operation counts per benchmark at each scale
+SCALES = {
+    "small": {"core_ops": 1000, "content_words": 200, "metric_writes": 100,
+              "campaigns": 20, "rows_per_campaign": 200, "queries": 20},
+    "medium": {"core_ops": 2000, "content_words": 1000, "metric_writes": 500,
+               "campaigns": 100, "rows_per_campaign": 1000, "queries": 50},
+    "large": {"core_ops": 10000, "content_words": 5000, "metric_writes": 2000,
+              "campaigns": 500, "rows_per_campaign": 2000, "queries": 100}
+}
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Register a benchmark; the function returns (callable, operation_count)"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+def _seed_metrics_db(db_path: str, params: dict) -> MetricsTracker:
+    tracker = MetricsTracker(db_path)
+    tracker.record_metrics(generators.make_metric_rows(params["campaigns"],
+                                                       params["rows_per_campaign"]))
+    return tracker
+
+@benchmark("analyze_audience_psychology")
+def bench_analyze(params, workdir):
+    presuader = PreSuaderCore()
+    audiences = generators.make_audiences(params["core_ops"])
+
+    def run():
+        for audience in audiences:
+            presuader.analyze_audience_psychology(audience)
+    return run, len(audiences)
+
+@benchmark("generate_presuasive_strategy")
+def bench_strategy(params, workdir):
+    presuader = PreSuaderCore()
+    profiles = [presuader.analyze_audience_psychology(a)
+                for a in generators.make_audiences(params["core_ops"])]
+
+    def run():
+        for profile in profiles:
+            presuader.generate_presuasive_strategy(profile, "increase demo requests")
+    return run, len(profiles)
+
+@benchmark("optimize_content_for_presuasion")
+def bench_optimize(params, workdir):
+    presuader = PreSuaderCore()
+    profile = presuader.analyze_audience_psychology(generators.make_audiences(1)[0])
+    strategy = presuader.generate_presuasive_strategy(profile, "increase demo requests")
+    contents = generators.make_contents(params["core_ops"] // 10, params["content_words"])
+
+    def run():
+        for content in contents:
+            presuader.optimize_content_for_presuasion(content, strategy)
+    return run, len(contents)
+
+@benchmark("optimize_content_long")
+def bench_optimize_long(params, workdir):
+    presuader = PreSuaderCore()
+    profile = presuader.analyze_audience_psychology({
+        "segment_name": "Long Copy", "tech_savvy": True, "risk_averse": True,
+        "preferences": "transparency", "priorities": "quality"
+    })
+    strategy = presuader.generate_presuasive_strategy(profile, "increase demo requests")
+    # Whitepaper-length copy, where rebuilding the text per edit dominates
+    contents = generators.make_contents(params["core_ops"] // 100, params["content_words"] * 25)
+
+    def run():
+        for content in contents:
+            presuader.optimize_content_for_presuasion(content, strategy)
+    return run, len(contents)
+
+@benchmark("optimize_content_with_compliance")
+def bench_optimize_gated(params, workdir):
+    presuader = PreSuaderCore()
+    profile = presuader.analyze_audience_psychology(generators.make_audiences(1)[0])
+    strategy = presuader.generate_presuasive_strategy(profile, "increase demo requests")
+    # Long-form copy, where re-scanning only around template edits pays off
+    contents = generators.make_contents(params["core_ops"] // 10, params["content_words"] * 5)
+
+    def run():
+        normalize_text.cache_clear()
+        for content in contents:
+            presuader.optimize_content_with_compliance(content, strategy, min_grade="B")
+    return run, len(contents)
+
+@benchmark("generate_variants_batch")
+def bench_generate_batch(params, workdir):
+    presuader = PreSuaderCore()
+    profile = presuader.analyze_audience_psychology(generators.make_audiences(1)[0])
+    strategy = presuader.generate_presuasive_strategy(profile, "increase demo requests")
+    # Half the batch repeats, as when several campaigns share landing-page copy
+    contents = generators.make_contents(params["core_ops"] // 20, params["content_words"]) * 2
+
+    def run():
+        # 1 ms per model call; a fresh cache so every distinct prompt reaches the backend
+        generator = ContentGenerator(StubBackend(latency=0.001), cache_path=None, max_concurrency=8)
+        generator.prefetch((content, strategy) for content in contents)
+        for content in contents:
+            generator.optimize(content, strategy)
+        generator.close()
+    return run, len(contents)
+
+@benchmark("explore_content")
+def bench_explore(params, workdir):
+    presuader = PreSuaderCore()
+    profile = presuader.analyze_audience_psychology({
+        "segment_name": "Explorer", "tech_savvy": True, "risk_averse": True,
+        "preferences": "transparency", "interests": "innovation", "priorities": "quality"
+    })
+    contents = generators.make_contents(params["core_ops"] // 100, params["content_words"])
+    # In-process, so the benchmark times the search rather than pool start-up
+    explorer = ContentExplorer(presuader, workers=0)
+
+    def run():
+        for content in contents:
+            explorer.explore(content, profile, top_k=5)
+    return run, len(contents)
+
+@benchmark("monitor_ethical_compliance")
+def bench_compliance(params, workdir):
+    presuader = PreSuaderCore()
+    contents = generators.make_contents(params["core_ops"] // 10, params["content_words"])
+
+    def run():
+        normalize_text.cache_clear()
+        for content in contents:
+            presuader.monitor_ethical_compliance(content)
+    return run, len(contents)
+
+@benchmark("monitor_ethical_compliance_multilingual")
+def bench_compliance_multilingual(params, workdir):
+    presuader = PreSuaderCore()
+    contents = generators.make_multilingual_contents(params["core_ops"] // 10, params["content_words"])
+
+    def run():
+        # Measure normalization itself, not the per-document cache
+        normalize_text.cache_clear()
+        for content in contents:
+            presuader.monitor_ethical_compliance(content)
+    return run, len(contents)
+
+@benchmark("compliance_session_edit")
+def bench_compliance_session_edit(params, workdir):
+    presuader = PreSuaderCore()
+    # About 100KB of copy at small scale, edited at random points like a debounced editor save
+    document = "\n".join(generators.make_contents(75, params["content_words"]))
+    session = presuader.open_compliance_session(document)
+    rng = random.Random(42)
+    edits = [(rng.random(), rng.randint(0, 8), rng.choice(["act now", "honest", "the", ""]))
+             for _ in range(params["core_ops"] // 10)]
+
+    def run():
+        for position, deleted, inserted in edits:
+            offset = int(position * (len(session.text) - deleted))
+            presuader.update_ethical_compliance(session, offset, deleted, inserted)
+    return run, len(edits)
+
+@benchmark("record_metric")
+def bench_record_metric(params, workdir):
+    tracker = MetricsTracker(str(workdir / "record_metric.db"))
+    count = params["metric_writes"]
+
+    def run():
+        for i in range(count):
+            tracker.record_metric("bench_write", "clicks", float(i), source="benchmark")
+    return run, count
+
+@benchmark("record_metrics_batch")
+def bench_record_metrics_batch(params, workdir):
+    tracker = MetricsTracker(str(workdir / "record_metrics.db"))
+    rows = generators.make_metric_rows(params["campaigns"], params["rows_per_campaign"])
+
+    def run():
+        tracker.record_metrics(rows)
+    return run, len(rows)
+
+@benchmark("get_campaign_performance")
+def bench_campaign_performance(params, workdir):
+    tracker = _seed_metrics_db(str(workdir / "performance.db"), params)
+    campaign_ids = [f"bench_{i % params['campaigns']:05d}" for i in range(params["queries"])]
+
+    def run():
+        for campaign_id in campaign_ids:
+            tracker.get_campaign_performance(campaign_id)
+    return run, len(campaign_ids)
+
+@benchmark("generate_performance_report")
+def bench_performance_report(params, workdir):
+    tracker = _seed_metrics_db(str(workdir / "report.db"), params)
+    campaign_ids = [f"bench_{i % params['campaigns']:05d}" for i in range(params["queries"])]
+    report_file = str(workdir / "report.md")
+
+    def run():
+        for campaign_id in campaign_ids:
+            tracker.generate_performance_report(campaign_id, output_file=report_file)
+    return run, len(campaign_ids)
+
+def run_suite(scale: str = "small", repeat: int = 3, only=None) -> dict:
+    """Run the registered benchmarks and return a results document"""
+    params = SCALES[scale]
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for name, setup in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            with contextlib.redirect_stdout(io.StringIO()):
+                run, operations = setup(params, workdir)
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    run()
+                    timings.append(time.perf_counter() - start)
+
+            median = statistics.median(timings)
+            results[name] = {
+                "operations": operations,
+                "repeat": repeat,
+                "min_s": round(min(timings), 6),
+                "median_s": round(median, 6),
+                "per_op_us": round(median / operations * 1e6, 3) if operations else 0.0
+            }
+            print(f"  {name:<32} {results[name]['per_op_us']:>12.3f} µs/op "
+                  f"({operations} ops, median {median:.4f}s)")
+
+    return {
+        "meta": {
+            "scale": scale,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat()
+        },
+        "results": results
+    }
+
+def compare_to_baseline(current: dict, baseline: dict, tolerance: float) -> list:
+    """Return a list of regressions where per-op time exceeds baseline * tolerance"""
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline.get(name)
+        if not reference or not reference.get("per_op_us"):
+            continue
+        ratio = result["per_op_us"] / reference["per_op_us"]
+        result["baseline_ratio"] = round(ratio, 3)
+        if ratio > tolerance:
+            regressions.append(
+                f"{name}: {result['per_op_us']:.3f} µs/op vs baseline "
+                f"{reference['per_op_us']:.3f} µs/op ({ratio:.2f}x)"
+            )
+    return regressions
+
+def main():
+    """Main benchmark entry point"""
+    parser = argparse.ArgumentParser(description="Pre-Suader performance benchmarks")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repetitions per benchmark')
+    parser.add_argument('--only', nargs='*', help='Run only the named benchmarks')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='Fail when per-op time exceeds baseline by this factor')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Store these results as the baseline for the chosen scale')
+    args = parser.parse_args()
+
+    print(f"⏱️  Running Pre-Suader benchmarks (scale={args.scale}, repeat={args.repeat})")
+    current = run_suite(args.scale, args.repeat, args.only)
+
+    baseline_path = Path(args.baseline)
+    baselines = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+
+    regressions = []
+    if args.update_baseline:
+        baselines.setdefault(args.scale, {}).update(current["results"])
+        baseline_path.write_text(json.dumps(baselines, indent=2) + "\n")
+        print(f"📌 Baseline updated: {baseline_path}")
+    elif args.scale in baselines:
+        regressions = compare_to_baseline(current, baselines[args.scale], args.tolerance)
+    else:
+        print(f"⚠️  No baseline for scale '{args.scale}' in {baseline_path}")
+
+    current["regressions"] = regressions
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2) + "\n")
+        print(f"📊 Results saved to: {args.output}")
+
+    if regressions:
+        print("❌ Performance regressions detected:")
+        for regression in regressions:
+            print(f"   • {regression}")
+        sys.exit(1)
+    print("✅ No performance regressions")
+
+if __name__ == "__main__":
+    main()
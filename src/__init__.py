@@ -6,17 +6,40 @@ Author: Sotiris Spyrou, CEO, VerityAI
 Ethical Pre-Suasion Marketing Optimization
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "Sotiris Spyrou, CEO, VerityAI"
 __description__ = "Ethical AI agent for pre-suasion marketing optimization"
 
-from .presuader_core_functions import PreSuaderCore, AudienceProfile, PreSuasiveStrategy
-from .metrics_tracker import MetricsTracker, CampaignPerformance
+# Public names are resolved lazily (PEP 562) so importing the package does
+# not load sqlite3, the metrics tracker or the serialization backends.
+_LAZY_EXPORTS = {
+    "PreSuaderCore": "presuader_core_functions",
+    "AudienceProfile": "presuader_core_functions",
+    "PreSuasiveStrategy": "presuader_core_functions",
+    "MetricsTracker": "metrics_tracker",
+    "CampaignPerformance": "metrics_tracker",
+    "StrategyStore": "strategy_store",
+    "PreSuaderPipeline": "pipeline",
+    "PipelineResult": "pipeline",
+    "ContentExplorer": "content_explorer",
+    "ContentGenerator": "content_generator",
+    "LiveCampaignAggregator": "live_aggregator",
+    "SQLiteBackend": "storage_backends",
+    "PostgresBackend": "storage_backends",
+    "ShardedMetricsTracker": "sharded_metrics"
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
 
-__all__ = [
-    "PreSuaderCore",
-    "AudienceProfile", 
-    "PreSuasiveStrategy",
-    "MetricsTracker",
-    "CampaignPerformance"
-]
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,262 @@
+# /src/content_explorer.py
+# Version: 19-10-2026 18:00:00
+# Pre-Suader AI Agent - Optimization Grid Search
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Grid search over content optimization parameters.
+Every combination of acted-on triggers, headline, woven-in values and
+social-proof line is rendered and scored for ethical compliance and
+predicted engagement. Branches run on a process pool, each reusing one
+compliance scan of the original, and candidates that cannot reach the
+top-k Pareto front are discarded as soon as they are scored.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import combinations, permutations
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    from .presuader_core_functions import (
+        PreSuaderCore, AudienceProfile, PreSuasiveStrategy, _ContentDraft,
+        HEADLINE_TRIGGERS, SOCIAL_PROOF_TRIGGERS, POSITIVE_TRIGGERS, PRESUASIVE_HEADLINE, SOCIAL_PROOF
+    )
+    from .ethics_rules import CompiledRulePack
+    from .instrumentation import instrumented, count
+except ImportError:
+    from presuader_core_functions import (
+        PreSuaderCore, AudienceProfile, PreSuasiveStrategy, _ContentDraft,
+        HEADLINE_TRIGGERS, SOCIAL_PROOF_TRIGGERS, POSITIVE_TRIGGERS, PRESUASIVE_HEADLINE, SOCIAL_PROOF
+    )
+    from ethics_rules import CompiledRulePack
+    from instrumentation import instrumented, count
+
+# Default headline and social-proof options to try
+HEADLINE_OPTIONS = (PRESUASIVE_HEADLINE, "⭐ Advanced Solution\n\n", "💡 Built for Efficiency\n\n")
+SOCIAL_PROOF_OPTIONS = (SOCIAL_PROOF, "\n\n🔒 Independently audited for security and reliability")
+
+@dataclass(frozen=True)
+class OptimizationParams:
+    """One point of the optimization grid"""
+    triggers: Tuple[str, ...]  # triggers acted on
+    values: Tuple[str, ...]  # values woven into the copy, in order
+    headline: str = ""  # prepended when a headline trigger is acted on
+    social_proof: str = ""  # appended when a social-proof trigger is acted on
+
+@dataclass
+class ExplorationCandidate:
+    """A rendered grid point with its scores"""
+    params: OptimizationParams
+    content: str
+    compliance_score: float
+    grade: str
+    engagement: float
+    front: int = 0  # Pareto front, 0 for non-dominated candidates
+
+    def dominates(self, other: 'ExplorationCandidate') -> bool:
+        """At least as good on both objectives and better on one"""
+        return (self.compliance_score >= other.compliance_score
+                and self.engagement >= other.engagement
+                and (self.compliance_score > other.compliance_score
+                     or self.engagement > other.engagement))
+
+    def to_dict(self) -> Dict:
+        return {
+            "triggers": list(self.params.triggers),
+            "values": list(self.params.values),
+            "headline": self.params.headline,
+            "social_proof": self.params.social_proof,
+            "compliance_score": self.compliance_score,
+            "grade": self.grade,
+            "engagement": self.engagement,
+            "front": self.front,
+            "content": self.content
+        }
+
+# Predicts engagement of rendered content; must be picklable (a module-level
+# function) to run on the process pool
+EngagementFunction = Callable[[str, OptimizationParams], float]
+
+def cue_engagement(content: str, params: OptimizationParams) -> float:
+    """
+    Default engagement predictor: share of positive trigger words the content
+    mentions, plus a point per headline or social-proof line it carries
+    """
+    lowered = content.lower()
+    cues = sum(trigger in lowered for trigger in POSITIVE_TRIGGERS)
+    return round(100.0 * cues / len(POSITIVE_TRIGGERS) + bool(params.headline)
+                 + bool(params.social_proof), 2)
+
+def pareto_top_k(candidates: Iterable[ExplorationCandidate], k: int) -> List[ExplorationCandidate]:
+    """
+    Best k candidates by Pareto front, then compliance and engagement
+
+    Fronts are peeled off in order (non-dominated candidates first, then
+    those dominated only by the first front, ...) until k are collected;
+    each candidate's front index is recorded on it.
+    """
+    remaining = list(candidates)
+    selected: List[ExplorationCandidate] = []
+    front = 0
+    while remaining and len(selected) < k:
+        current = [c for c in remaining if not any(o.dominates(c) for o in remaining)]
+        for candidate in current:
+            candidate.front = front
+        current.sort(key=lambda c: (-c.compliance_score, -c.engagement))
+        selected.extend(current[:k - len(selected)])
+        peeled = {id(c) for c in current}
+        remaining = [c for c in remaining if id(c) not in peeled]
+        front += 1
+    return selected
+
+def _prune(candidates: List[ExplorationCandidate], k: int) -> List[ExplorationCandidate]:
+    """
+    Drop candidates dominated by k or more others
+
+    Each dominator sits on an earlier front, so such a candidate can never
+    make the top k, and anything it dominates is dropped along with it.
+    Rendering duplicates are dropped too, keeping the first.
+    """
+    unique: Dict[str, ExplorationCandidate] = {}
+    for candidate in candidates:
+        unique.setdefault(candidate.content, candidate)
+    kept = list(unique.values())
+    return [c for c in kept if sum(o.dominates(c) for o in kept) < k]
+
+class _BranchEvaluator:
+    """Renders and scores the leaves of grid branches against one original"""
+
+    def __init__(self, rule_pack: CompiledRulePack, content: str, engagement: EngagementFunction,
+                 top_k: int):
+        self.presuader = PreSuaderCore(rule_pack=rule_pack)
+        self.content = content
+        self.engagement = engagement
+        self.top_k = top_k
+        # Every leaf forks this scan instead of scanning its whole variant
+        self.session = self.presuader.open_compliance_session(content)
+
+    def __call__(self, branch: Tuple[OptimizationParams, ...]) -> Tuple[List[ExplorationCandidate], int]:
+        """Candidates of a branch that may reach the top k, and how many were scored"""
+        candidates = []
+        for params in branch:
+            draft = _ContentDraft(self.content, self.session.fork())
+            self.presuader._apply_presuasive_optimization(
+                draft, params.triggers, params.values, params.headline, params.social_proof)
+            report = self.presuader._compliance_report(draft.evaluate(self.presuader.rule_pack))
+            candidates.append(ExplorationCandidate(
+                params=params,
+                content=draft.text,
+                compliance_score=report["compliance_score"],
+                grade=report["grade"],
+                engagement=self.engagement(draft.text, params)
+            ))
+        return _prune(candidates, self.top_k), len(branch)
+
+# Evaluator of the current pool worker
+_WORKER_EVALUATOR: Optional[_BranchEvaluator] = None
+
+def _init_worker(rule_pack: CompiledRulePack, content: str, engagement: EngagementFunction,
+                 top_k: int):
+    global _WORKER_EVALUATOR
+    _WORKER_EVALUATOR = _BranchEvaluator(rule_pack, content, engagement, top_k)
+
+def _evaluate_branch(branch: Tuple[OptimizationParams, ...]) -> Tuple[List[ExplorationCandidate], int]:
+    return _WORKER_EVALUATOR(branch)
+
+class ContentExplorer:
+    """Search headline, trigger, value and social-proof combinations for the best trade-offs"""
+
+    def __init__(self, presuader: Optional[PreSuaderCore] = None,
+                 engagement: EngagementFunction = cue_engagement,
+                 workers: Optional[int] = None):
+        """
+        Args:
+            presuader: Core instance whose rule pack scores compliance
+            engagement: Predicted-engagement function of (content, params)
+            workers: Worker processes (os.cpu_count() when None; 0 or 1
+                evaluates in this process)
+        """
+        self.presuader = presuader or PreSuaderCore()
+        self.engagement = engagement
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+
+    def grid(self, audience: AudienceProfile, headlines: Sequence[str] = HEADLINE_OPTIONS,
+             social_proofs: Sequence[str] = SOCIAL_PROOF_OPTIONS,
+             max_values: int = 2) -> List[Tuple[OptimizationParams, ...]]:
+        """
+        Enumerate the grid, grouped into branches of one trigger set and headline
+
+        Triggers are the audience's headline and social-proof triggers; each
+        subset of them is tried. Headline and social-proof options are only
+        varied when a trigger that uses them is acted on, and values are
+        tried in every order up to max_values at a time.
+        """
+        levers = [t for t in audience.psychological_triggers
+                  if t in HEADLINE_TRIGGERS or t in SOCIAL_PROOF_TRIGGERS]
+        value_options = [combo for size in range(min(max_values, len(audience.values)) + 1)
+                         for combo in permutations(audience.values, size)]
+
+        branches = []
+        for size in range(len(levers) + 1):
+            for triggers in combinations(levers, size):
+                uses_headline = any(t in HEADLINE_TRIGGERS for t in triggers)
+                uses_social_proof = any(t in SOCIAL_PROOF_TRIGGERS for t in triggers)
+                for headline in (headlines if uses_headline else ("",)):
+                    branches.append(tuple(
+                        OptimizationParams(triggers, values, headline, social_proof)
+                        for values in value_options
+                        for social_proof in (social_proofs if uses_social_proof else ("",))
+                    ))
+        return branches
+
+    @instrumented()
+    def explore(self, content: str, target: Union[AudienceProfile, PreSuasiveStrategy],
+                top_k: int = 5, headlines: Sequence[str] = HEADLINE_OPTIONS,
+                social_proofs: Sequence[str] = SOCIAL_PROOF_OPTIONS,
+                max_values: int = 2) -> List[ExplorationCandidate]:
+        """
+        Score every grid point for content and return the top-k Pareto front
+
+        Args:
+            content: Original marketing content
+            target: Audience profile, or a strategy whose audience is used
+            top_k: Number of candidates to return
+            headlines: Headline options to try
+            social_proofs: Social-proof lines to try
+            max_values: Most values woven into one variant
+
+        Returns:
+            List[ExplorationCandidate]: Up to top_k candidates, best front
+                first, each front ordered by compliance then engagement
+        """
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        audience = target.target_audience if isinstance(target, PreSuasiveStrategy) else target
+        branches = self.grid(audience, headlines, social_proofs, max_values)
+        args = (self.presuader.rule_pack, content, self.engagement, top_k)
+
+        if self.workers > 1 and len(branches) > 1:
+            with ProcessPoolExecutor(min(self.workers, len(branches)), initializer=_init_worker,
+                                     initargs=args) as executor:
+                results = executor.map(_evaluate_branch, branches)
+                survivors, scored = self._collect(results, top_k)
+        else:
+            evaluator = _BranchEvaluator(*args)
+            survivors, scored = self._collect(map(evaluator, branches), top_k)
+
+        count("exploration_candidates", scored)
+        count("exploration_pruned", scored - len(survivors))
+        return pareto_top_k(survivors, top_k)
+
+    @staticmethod
+    def _collect(results: Iterable[Tuple[List[ExplorationCandidate], int]],
+                 top_k: int) -> Tuple[List[ExplorationCandidate], int]:
+        """Merge branch results as they arrive, pruning across branches"""
+        survivors: List[ExplorationCandidate] = []
+        scored = 0
+        for candidates, branch_size in results:
+            scored += branch_size
+            survivors = _prune(survivors + candidates, top_k)
+        return survivors, scored
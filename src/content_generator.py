@@ -0,0 +1,419 @@
+# /src/content_generator.py
+# Version: 19-10-2026 19:00:00
+# Pre-Suader AI Agent - Model-Backed Content Generation
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Model-backed generation of optimized content variants.
+A generator backend (the Claude Messages API through the async client, or
+a deterministic offline stub) writes each variant from a prompt built
+from the strategy's audience. Completions are cached in SQLite by prompt
+hash, identical prompts in flight share one call, and concurrency and
+token budgets bound what is sent to the backend.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    from .presuader_core_functions import PreSuasiveStrategy
+    from .instrumentation import count
+except ImportError:
+    from presuader_core_functions import PreSuasiveStrategy
+    from instrumentation import count
+
+DEFAULT_CACHE_PATH = Path(os.environ.get("PRESUADER_COMPLETION_CACHE",
+                                         Path.home() / ".cache" / "presuader" / "completions.db"))
+DEFAULT_MODEL = os.environ.get("PRESUADER_MODEL", "claude-3-5-haiku-latest")
+DEFAULT_MAX_TOKENS = 1024
+
+# Rough characters per token, for reserving budget before the backend reports usage
+CHARS_PER_TOKEN = 4
+
+SYSTEM_PROMPT = (
+    "You are The Pre-Suader, a marketing-focused AI agent applying Robert Cialdini's "
+    "Pre-Suasion principles to AI SaaS copy. You shape the reader's attention before the "
+    "core message, building genuine associations with the audience's values. You never use "
+    "false scarcity, fake urgency, deceptive claims or hidden persuasion; every claim must "
+    "stay true to the original content, and the reader's interests come first."
+)
+
+# What each variant asks of the model
+VARIANT_INSTRUCTIONS = {
+    "optimized": "Rewrite the copy for this audience: open with an attention-directing line "
+                 "tied to their triggers, connect the features to their values and close with "
+                 "a truthful trust indicator.",
+    "variant_a_conservative": "Make minimal wording changes that add credibility, keeping the "
+                              "structure and length of the original.",
+    "variant_b_moderate": "Add a short headline framing the main benefit and tighten the body.",
+    "variant_c_aggressive": "Lead with a bold headline and end with a clear call to action, "
+                            "without false urgency or scarcity."
+}
+
+@dataclass(frozen=True)
+class GenerationRequest:
+    """One prompt for the generator backend"""
+    prompt: str
+    system: str = SYSTEM_PROMPT
+    max_tokens: int = DEFAULT_MAX_TOKENS
+
+    def key(self, model: str) -> str:
+        """Cache key: hash of everything that determines the completion"""
+        payload = json.dumps([model, self.system, self.prompt, self.max_tokens], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def estimated_tokens(self) -> int:
+        """Worst-case tokens of the call: the prompt plus a full-length completion"""
+        return (len(self.system) + len(self.prompt)) // CHARS_PER_TOKEN + 1 + self.max_tokens
+
+@dataclass
+class Completion:
+    """Backend output for a request"""
+    text: str
+    input_tokens: int
+    output_tokens: int
+    cached: bool = False
+
+class TokenBudgetExceeded(RuntimeError):
+    """Raised when a request could take the generator past its token budget"""
+
+class GenerationFailed(RuntimeError):
+    """
+    Raised when some requests of a batch fail. The others still completed
+    and were cached, so retrying the batch only repeats the failed ones.
+    """
+
+    def __init__(self, completions: List[Optional[Completion]], errors: Dict[int, BaseException],
+                 labels: Optional[List[str]] = None):
+        """
+        Args:
+            completions: Completion per request, in input order (None where it failed)
+            errors: Exception per failed request, by position
+            labels: Name of each request for the message (its position when omitted)
+        """
+        self.completions = completions
+        self.errors = errors
+        self.labels = labels if labels is not None else [str(i) for i in range(len(completions))]
+        failed = "; ".join(f"{self.labels[i]} ({type(error).__name__}: {error})"
+                           for i, error in errors.items())
+        super().__init__(f"{len(errors)} of {len(completions)} generation requests failed: {failed}")
+
+    @property
+    def failed(self) -> List[str]:
+        """Labels of the failed requests"""
+        return [self.labels[i] for i in self.errors]
+
+def build_prompt(original_content: str, strategy: Optional[PreSuasiveStrategy], variant: str) -> str:
+    """
+    Prompt asking for one variant of original_content
+
+    Only the audience and content go into the prompt (not campaign IDs or
+    timestamps), so the same content for the same audience hits the cache.
+    """
+    lines = [f"<variant>{variant}</variant>",
+             f"<instruction>{VARIANT_INSTRUCTIONS[variant]}</instruction>"]
+    if strategy is not None:
+        audience = strategy.target_audience
+        lines += [
+            "<audience>",
+            f"Segment: {audience.segment_name}",
+            f"Psychological triggers: {', '.join(audience.psychological_triggers) or 'none'}",
+            f"Values: {', '.join(audience.values) or 'none'}",
+            f"Pain points: {', '.join(audience.pain_points) or 'none'}",
+            "</audience>"
+        ]
+    lines += ["<content>", original_content, "</content>",
+              "Return only the rewritten content."]
+    return "\n".join(lines)
+
+class StubBackend:
+    """
+    Deterministic offline backend for tests and dry runs.
+    Frames the prompt's content with a fixed headline and closing line per
+    variant, optionally after a delay to stand in for network latency.
+    """
+
+    FRAMES = {
+        "optimized": ("🚀 Built for you\n\n", "\n\n✅ Trusted by 1000+ businesses worldwide"),
+        "variant_a_conservative": ("", "\n\nBacked by transparent pricing."),
+        "variant_b_moderate": ("⭐ Advanced Solution\n\n", ""),
+        "variant_c_aggressive": ("⚡ See it in action\n\n", "\n\n👉 Book a demo today")
+    }
+
+    def __init__(self, model: str = "stub", latency: float = 0.0):
+        self.model = model
+        self.latency = latency
+        self.calls = 0
+
+    async def complete(self, request: GenerationRequest) -> Completion:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        variant = re.search(r'<variant>(.*?)</variant>', request.prompt)
+        content = re.search(r'<content>\n(.*)\n</content>', request.prompt, re.DOTALL)
+        prefix, suffix = self.FRAMES.get(variant.group(1) if variant else "", ("", ""))
+        text = prefix + (content.group(1) if content else request.prompt) + suffix
+        return Completion(text, len(request.system + request.prompt) // CHARS_PER_TOKEN + 1,
+                          len(text) // CHARS_PER_TOKEN + 1)
+
+class AnthropicBackend:
+    """
+    Claude Messages API through the async client.
+    Requires the optional 'anthropic' package; the API key is read from
+    ANTHROPIC_API_KEY unless passed in client_options.
+    """
+
+    def __init__(self, model: str = DEFAULT_MODEL, client=None, **client_options):
+        """
+        Args:
+            model: Model name sent with every request
+            client: Async client to use (one is created when omitted)
+            client_options: Keyword arguments for anthropic.AsyncAnthropic
+        """
+        if client is None:
+            try:
+                anthropic = importlib.import_module("anthropic")
+            except ImportError as e:
+                raise ImportError("The anthropic backend requires the 'anthropic' package") from e
+            client = anthropic.AsyncAnthropic(**client_options)
+        self.client = client
+        self.model = model
+
+    async def complete(self, request: GenerationRequest) -> Completion:
+        message = await self.client.messages.create(
+            model=self.model,
+            max_tokens=request.max_tokens,
+            system=request.system,
+            messages=[{"role": "user", "content": request.prompt}]
+        )
+        text = "".join(block.text for block in message.content if block.type == "text")
+        return Completion(text, message.usage.input_tokens, message.usage.output_tokens)
+
+class CompletionCache:
+    """SQLite store of completions keyed by prompt hash"""
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_CACHE_PATH):
+        """
+        Args:
+            db_path: Cache database file, or ":memory:" for a per-process cache
+        """
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS completions (
+                prompt_hash TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                text TEXT NOT NULL,
+                input_tokens INTEGER NOT NULL,
+                output_tokens INTEGER NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        ''')
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Completion]:
+        row = self._conn.execute(
+            'SELECT text, input_tokens, output_tokens FROM completions WHERE prompt_hash = ?',
+            (key,)).fetchone()
+        return Completion(row[0], row[1], row[2], cached=True) if row else None
+
+    def put(self, key: str, model: str, completion: Completion):
+        self._conn.execute(
+            'INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?, ?)',
+            (key, model, completion.text, completion.input_tokens, completion.output_tokens,
+             datetime.now().isoformat()))
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM completions').fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+class ContentGenerator:
+    """Writes content variants through a generator backend, with caching and budgets"""
+
+    def __init__(self, backend, cache_path: Optional[Union[str, Path]] = DEFAULT_CACHE_PATH,
+                 max_concurrency: int = 4, token_budget: Optional[int] = None,
+                 max_tokens: int = DEFAULT_MAX_TOKENS):
+        """
+        Args:
+            backend: StubBackend, AnthropicBackend or any object with a model
+                name and an async complete(request) method
+            cache_path: Completion cache database (in memory when None)
+            max_concurrency: Most backend calls in flight at once
+            token_budget: Most input plus output tokens to spend on backend
+                calls; each call reserves its worst case before it is sent
+            max_tokens: Completion length limit per variant
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.backend = backend
+        self.cache = CompletionCache(cache_path if cache_path is not None else ":memory:")
+        self.max_concurrency = max_concurrency
+        self.token_budget = token_budget
+        self.max_tokens = max_tokens
+        self.tokens_used = 0
+        self._reserved = 0
+        self._loop = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def complete(self, request: GenerationRequest) -> Completion:
+        """
+        Completion for request, from the cache, a call already in flight for
+        the same prompt, or a new backend call
+        """
+        key = request.key(self.backend.model)
+        cached = self.cache.get(key)
+        if cached is not None:
+            count("generator_requests", source="cache")
+            return cached
+
+        self._bind_loop()
+        call = self._inflight.get(key)
+        if call is None:
+            call = asyncio.ensure_future(self._call(key, request))
+            self._inflight[key] = call
+            call.add_done_callback(lambda _: self._inflight.pop(key, None))
+            count("generator_requests", source="backend")
+        else:
+            count("generator_requests", source="coalesced")
+        # Shielded, so one cancelled caller does not cancel the call the others share
+        return await asyncio.shield(call)
+
+    async def complete_all(self, requests: Iterable[GenerationRequest]) -> List[Completion]:
+        """
+        Complete requests concurrently, in input order
+
+        Raises:
+            GenerationFailed: Once every request has finished, if any failed
+        """
+        results = await asyncio.gather(*(self.complete(request) for request in requests),
+                                       return_exceptions=True)
+        errors = {i: result for i, result in enumerate(results) if isinstance(result, BaseException)}
+        if errors:
+            raise GenerationFailed([None if i in errors else result for i, result in enumerate(results)],
+                                   errors)
+        return results
+
+    def generate(self, requests: Iterable[GenerationRequest]) -> List[Completion]:
+        """Synchronous complete_all(); use complete_all() inside a running event loop"""
+        requests = list(requests)
+        completions = [self.cache.get(request.key(self.backend.model)) for request in requests]
+        misses = [request for request, completion in zip(requests, completions) if completion is None]
+        count("generator_requests", len(requests) - len(misses), source="cache")
+        if misses:
+            # Only cache misses pay for starting an event loop
+            try:
+                fetched, errors = asyncio.run(self.complete_all(misses)), {}
+            except GenerationFailed as e:
+                fetched, errors = e.completions, e.errors
+            positions = [i for i, completion in enumerate(completions) if completion is None]
+            for position, completion in zip(positions, fetched):
+                completions[position] = completion
+            if errors:
+                # Failures by position in requests, not among the misses
+                raise GenerationFailed(completions, {positions[i]: error for i, error in errors.items()})
+        return completions
+
+    def variant_requests(self, original_content: str,
+                         strategy: Optional[PreSuasiveStrategy]) -> Dict[str, GenerationRequest]:
+        """One request per generated variant"""
+        return {variant: GenerationRequest(build_prompt(original_content, strategy, variant),
+                                           max_tokens=self.max_tokens)
+                for variant in VARIANT_INSTRUCTIONS}
+
+    def optimize(self, original_content: str,
+                 strategy: Optional[PreSuasiveStrategy]) -> Dict[str, str]:
+        """
+        Generate the optimized and A/B variants of original_content
+
+        Returns:
+            Dict: Variant name to generated text, for every variant in VARIANT_INSTRUCTIONS
+
+        Raises:
+            GenerationFailed: Naming the variants that could not be generated
+        """
+        requests = self.variant_requests(original_content, strategy)
+        try:
+            completions = self.generate(requests.values())
+        except GenerationFailed as e:
+            raise GenerationFailed(e.completions, e.errors, list(requests)) from None
+        return {variant: completion.text for variant, completion in zip(requests, completions)}
+
+    def prefetch(self, jobs: Iterable[Tuple[str, Optional[PreSuasiveStrategy]]]) -> int:
+        """
+        Generate every variant of many (content, strategy) jobs in one
+        concurrent batch, so later optimize() calls are served from the cache
+
+        Returns:
+            int: Distinct requests in the batch
+
+        Raises:
+            GenerationFailed: Naming the job and variant of each failed request,
+                after the rest of the batch has completed
+        """
+        requests = {}
+        labels = {}
+        for job, (original_content, strategy) in enumerate(jobs):
+            for variant, request in self.variant_requests(original_content, strategy).items():
+                key = request.key(self.backend.model)
+                if key not in requests:
+                    requests[key] = request
+                    labels[key] = f"job {job} {variant}"
+        try:
+            self.generate(requests.values())
+        except GenerationFailed as e:
+            raise GenerationFailed(e.completions, e.errors, list(labels.values())) from None
+        return len(requests)
+
+    async def _call(self, key: str, request: GenerationRequest) -> Completion:
+        async with self._semaphore:
+            reserve = request.estimated_tokens()
+            if (self.token_budget is not None
+                    and self.tokens_used + self._reserved + reserve > self.token_budget):
+                raise TokenBudgetExceeded(
+                    f"Request needs up to {reserve} tokens but only "
+                    f"{self.token_budget - self.tokens_used - self._reserved} of the "
+                    f"{self.token_budget} token budget remain")
+            self._reserved += reserve
+            try:
+                completion = await self.backend.complete(request)
+            finally:
+                self._reserved -= reserve
+        spent = completion.input_tokens + completion.output_tokens
+        self.tokens_used += spent
+        count("generator_tokens", spent)
+        self.cache.put(key, self.backend.model, completion)
+        return completion
+
+    def _bind_loop(self):
+        """Give each event loop its own semaphore and in-flight table"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._inflight = {}
+
+    def close(self):
+        self.cache.close()
+
+def create_backend(name: str, model: Optional[str] = None):
+    """Backend by CLI name ('stub' or 'anthropic')"""
+    if name == "stub":
+        return StubBackend(model or "stub")
+    if name == "anthropic":
+        return AnthropicBackend(model or DEFAULT_MODEL)
+    raise ValueError(f"Unknown generator backend '{name}' (use 'stub' or 'anthropic')")
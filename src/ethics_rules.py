@@ -0,0 +1,769 @@
+# /src/ethics_rules.py
+# Version: 19-10-2026 16:30:00
+# Pre-Suader AI Agent - Ethics Rule Packs
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Declarative rule packs for the ethical compliance checker.
+A pack lists keyword, regex and absence rules with a weight, severity,
+message and locale. Text and literal patterns are matched in normalized
+form (see text_normalizer), so lookalike spellings cannot slip past.
+Packs are compiled once (keyword literals and regex prefixes into an
+Aho-Corasick automaton) and the compiled form is pickled to a cache
+directory keyed by the pack's content hash, so large packs load without
+being rebuilt.
+"""
+
+import contextlib
+import copy
+import hashlib
+import json
+import os
+import pickle
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+try:
+    from .text_normalizer import normalize_fragment, normalize_text
+except ImportError:
+    from text_normalizer import normalize_fragment, normalize_text
+
+RULE_TYPES = ('keyword', 'regex', 'absence')
+SEVERITIES = ('issue', 'warning')
+
+# Bump when the compiled layout changes so stale pickles are rebuilt
+ENGINE_VERSION = 5
+
+# Below this many literals plus regexes, one C-level search per pattern beats
+# the combined matcher, whose cost per character does not depend on pack size
+COMBINED_SCAN_MIN_PATTERNS = 200
+
+REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+# Match width assumed for regexes with unbounded repeats (such as \d+) when
+# sizing the window an incremental re-scan must cover
+UNBOUNDED_MATCH_WIDTH = 64
+
+# Fixed cost of one incremental edit (window normalization, two small scans,
+# span bookkeeping), in characters a full scan covers in the same time
+EDIT_OVERHEAD_CHARS = 800
+
+# Hits are ordered by position, then by rule
+_HIT_ORDER = itemgetter(1, 0)
+
+# Opcodes that consume nothing, so they may precede a regex's literal prefix
+_ZERO_WIDTH = (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT)
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("PRESUADER_RULE_CACHE",
+                                        Path.home() / ".cache" / "presuader" / "rules"))
+
+@dataclass
+class Rule:
+    """One compliance rule"""
+    id: str
+    type: str
+    pattern: Union[str, List[str]]  # absence rules list the terms whose absence fires
+    weight: float
+    severity: str = "warning"
+    message: str = ""
+    locale: str = "*"
+    max_hits: Optional[int] = 1  # penalized matches; None penalizes every match
+    counter: Optional[str] = None  # instrumentation counter incremented when the rule fires
+
+@dataclass
+class RulePack:
+    """Named, versioned collection of rules"""
+    name: str
+    rules: List[Rule]
+    version: str = "1"
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RulePack":
+        rules = [Rule(**rule) for rule in data["rules"]]
+        for rule in rules:
+            if rule.type not in RULE_TYPES:
+                raise ValueError(f"Rule '{rule.id}' has unknown type '{rule.type}'")
+            if rule.severity not in SEVERITIES:
+                raise ValueError(f"Rule '{rule.id}' has unknown severity '{rule.severity}'")
+        return cls(name=data["name"], rules=rules, version=str(data.get("version", "1")))
+
+    def to_dict(self) -> Dict:
+        # Rule fields are flat, so a shallow copy is enough (asdict deep-copies)
+        return {"name": self.name, "version": self.version,
+                "rules": [dict(vars(rule)) for rule in self.rules]}
+
+    def fingerprint(self) -> str:
+        """Content hash identifying the compiled form of this pack"""
+        canonical = json.dumps([ENGINE_VERSION, self.to_dict()], sort_keys=True)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+@dataclass
+class RuleFinding:
+    """A rule that fired, with every place it matched"""
+    rule: Rule
+    message: str
+    occurrences: int  # matches found (0 for a fired absence rule)
+    penalized: int  # matches that cost points, capped by max_hits
+    spans: List[Tuple[int, int]] = field(default_factory=list)  # (start, end) offsets
+
+    def to_dict(self) -> Dict:
+        return {
+            "rule": self.rule.id,
+            "severity": self.rule.severity,
+            "message": self.message,
+            "occurrences": self.occurrences,
+            "penalty": self.penalized * self.rule.weight,
+            "spans": [[start, end] for start, end in self.spans]
+        }
+
+@dataclass
+class RuleEvaluation:
+    """Outcome of checking one text against a compiled pack"""
+    penalty: float = 0.0
+    issues: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    findings: List[RuleFinding] = field(default_factory=list)
+
+def _manipulation_rule(keyword: str) -> Dict:
+    return {"id": f"manipulative:{keyword.replace(' ', '_')}", "type": "keyword",
+            "pattern": keyword, "weight": 10.0, "severity": "issue",
+            "message": "Potentially manipulative language detected: '{pattern}'",
+            "counter": "flagged_keywords"}
+
+def _urgency_rule(rule_id: str, pattern: str) -> Dict:
+    return {"id": f"urgency:{rule_id}", "type": "regex", "pattern": pattern,
+            "weight": 5.0, "severity": "warning",
+            "message": "Urgency language detected: review for authenticity",
+            "counter": "urgency_warnings"}
+
+# Built-in rules: the checks monitor_ethical_compliance has always applied
+DEFAULT_RULE_PACK = {
+    "name": "presuader-default",
+    "version": "1",
+    "rules": [_manipulation_rule(keyword) for keyword in (
+        'manipulate', 'deceive', 'trick', 'exploit', 'coerce',
+        'mislead', 'dark pattern', 'false scarcity', 'fake urgency'
+    )] + [_urgency_rule(rule_id, pattern) for rule_id, pattern in (
+        ('limited_time', r'limited time'), ('act_now', r'act now'), ('hurry', r'hurry'),
+        ('expires', r'expires'), ('only_n_left', r'only \d+ left')
+    )] + [{
+        "id": "transparency:missing", "type": "absence",
+        "pattern": ['transparent', 'honest', 'clear'], "weight": 3.0,
+        "severity": "warning", "message": "Consider adding transparency indicators"
+    }]
+}
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a set of literals.
+    Finds every occurrence of every literal in one pass, in time linear in
+    the text length plus the number of matches, however many literals
+    there are. States are plain lists and dicts so the automaton pickles
+    and unpickles quickly.
+    """
+
+    def __init__(self, literals: List[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for literal_id, literal in enumerate(literals):
+            state = 0
+            for ch in literal:
+                following = self.goto[state].get(ch)
+                if following is None:
+                    following = len(self.goto)
+                    self.goto[state][ch] = following
+                    self.goto.append({})
+                    outputs.append([])
+                state = following
+            outputs[state].append(literal_id)
+
+        # Breadth-first failure links; each state also reports the literals
+        # of the states its failure chain passes through
+        self.fail = [0] * len(self.goto)
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, following in self.goto[state].items():
+                queue.append(following)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[following] = target if target != following else 0
+                outputs[following] = outputs[following] + outputs[self.fail[following]]
+        self.outputs = [tuple(found) for found in outputs]
+
+    def iter_matches(self, text: str):
+        """Yield (literal id, end offset) for every occurrence, by end offset"""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+        for position, ch in enumerate(text, 1):
+            following = goto[state].get(ch)
+            while following is None and state:
+                state = fail[state]
+                following = goto[state].get(ch)
+            state = following or 0
+            if outputs[state]:
+                for literal_id in outputs[state]:
+                    yield literal_id, position
+
+class CompiledRulePack:
+    """
+    A rule pack compiled for single-pass matching.
+    Keyword and absence literals, and the literal text each regex rule's
+    matches start with, go into one Aho-Corasick automaton; a regex is
+    only tried where its prefix occurs, so the scan costs the same however
+    many such rules the pack has. Regexes without a literal prefix (or
+    with global inline flags) are searched one at a time. Small packs are
+    scanned pattern by pattern instead, which finds the same matches
+    faster until the pack reaches COMBINED_SCAN_MIN_PATTERNS.
+    """
+
+    def __init__(self, pack: RulePack, fingerprint: Optional[str] = None):
+        """
+        Args:
+            pack: Rule pack to compile
+            fingerprint: Cache key of the pack's source (defaults to pack.fingerprint())
+        """
+        self.pack = pack
+        self.fingerprint = fingerprint or pack.fingerprint()
+        self.rules = list(pack.rules)
+
+        # literal -> rule indices, for keyword rules, absence terms and regex
+        # rules without metacharacters, which match exactly like a literal
+        literal_rules: Dict[str, List[int]] = {}
+        self.regex_list = []
+        for index, rule in enumerate(self.rules):
+            if rule.type == 'regex' and not self._is_literal_regex(rule.pattern):
+                continue
+            terms = rule.pattern if rule.type == 'absence' else [rule.pattern]
+            for term in terms:
+                literal_rules.setdefault(normalize_text(term).text, []).append(index)
+        self.literal_list = [(literal, len(literal), tuple(indices))
+                             for literal, indices in literal_rules.items()]
+
+        for index, rule in enumerate(self.rules):
+            if rule.type == 'regex' and not self._is_literal_regex(rule.pattern):
+                pattern = re.compile(rule.pattern)
+                if pattern.match(''):
+                    raise ValueError(f"Rule '{rule.id}' matches the empty string")
+                self.regex_list.append((pattern, index))
+
+        # prefix -> regex branches (positions in regex_list) whose matches start with it
+        regex_prefixes: Dict[str, List[int]] = {}
+        self.unprefixed_regexes = []
+        for branch, (pattern, _) in enumerate(self.regex_list):
+            prefix = self._literal_prefix(pattern)
+            if prefix:
+                regex_prefixes.setdefault(prefix, []).append(branch)
+            else:
+                self.unprefixed_regexes.append(branch)
+        self.prefix_list = [(prefix, len(prefix), tuple(branches))
+                            for prefix, branches in regex_prefixes.items()]
+
+        self.combined = len(self.literal_list) + len(self.regex_list) > COMBINED_SCAN_MIN_PATTERNS
+        # Automaton ids past the literals are regex prefixes
+        self.automaton = (AhoCorasick([literal for literal, _, _ in self.literal_list] +
+                                      [prefix for prefix, _, _ in self.prefix_list])
+                          if self.combined else None)
+
+        self.absence_rules = [index for index, rule in enumerate(self.rules)
+                              if rule.type == 'absence']
+        pattern_counts: Dict[int, int] = {}
+        for _, _, indices in self.literal_list:
+            for index in indices:
+                pattern_counts[index] = pattern_counts.get(index, 0) + 1
+        self.multi_pattern_rules = [index for index, total in pattern_counts.items() if total > 1]
+        # Patterns whose rules all stop at one hit only need a presence check
+        self.presence_literals = {literal for literal, _, indices in self.literal_list
+                                  if all(self._single_hit(self.rules[i]) for i in indices)}
+        # Longest match any rule can produce, in normalized characters
+        self.max_width = max([length for _, length, _ in self.literal_list] +
+                             [self._regex_width(pattern) for pattern, _ in self.regex_list] + [1])
+        absence_terms = set(self.absence_rules)
+        self.absence_width = max([length for _, length, indices in self.literal_list
+                                  if absence_terms.intersection(indices)] + [1])
+        self.messages = [rule.message.format(
+            pattern=rule.pattern if isinstance(rule.pattern, str) else ', '.join(rule.pattern))
+            for rule in self.rules]
+
+    @staticmethod
+    def _regex_width(pattern: re.Pattern) -> int:
+        width = sre_parse.parse(pattern.pattern).getwidth()[1]
+        return min(width, UNBOUNDED_MATCH_WIDTH)
+
+    @staticmethod
+    def _literal_prefix(pattern: re.Pattern) -> str:
+        """
+        Literal text every match of the regex starts with, after any leading
+        anchors or lookarounds; '' when there is none or global flags (such
+        as (?i)) change how the literal matches
+        """
+        if pattern.flags & ~re.UNICODE:
+            return ''
+        prefix = []
+        for op, av in sre_parse.parse(pattern.pattern):
+            if op == sre_parse.LITERAL:
+                prefix.append(chr(av))
+            elif prefix or op not in _ZERO_WIDTH:
+                break
+        return ''.join(prefix)
+
+    @staticmethod
+    def _is_literal_regex(pattern: str) -> bool:
+        # Text is matched normalized, so only already-normalized literals behave the same
+        return bool(pattern) and pattern == normalize_text(pattern).text and \
+            not any(ch in REGEX_METACHARACTERS for ch in pattern)
+
+    @staticmethod
+    def _single_hit(rule: Rule) -> bool:
+        return rule.type == 'absence' or rule.max_hits == 1
+
+    def scan(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Find every rule match in normalized text
+
+        Occurrences of one literal or regex do not overlap each other (as
+        with str.find and re.finditer); matches of different patterns may.
+
+        Returns:
+            List[Tuple[int, int, int]]: (rule index, start, end) in text order
+        """
+        hits = [(index, start, end) for index, spans in self.locate(text).items()
+                for start, end in spans]
+        hits.sort(key=_HIT_ORDER)
+        return hits
+
+    def locate(self, text: str) -> Dict[int, List[Tuple[int, int]]]:
+        """Spans of every match in normalized text, per matched rule index, in order"""
+        located: Dict[int, List[Tuple[int, int]]] = {}
+        if self.combined:
+            self._locate_combined(text, located)
+        else:
+            self._locate_each(text, located)
+        # Rules fed by several patterns (absence terms) need their spans merged
+        for index in self.multi_pattern_rules:
+            if index in located:
+                located[index].sort()
+        return located
+
+    def _locate_combined(self, text: str, located: Dict[int, List[Tuple[int, int]]]):
+        """One automaton pass for all literals and regex prefixes"""
+        literal_list, prefix_list, regex_list = self.literal_list, self.prefix_list, self.regex_list
+        literals = len(literal_list)
+        last_end = [0] * len(literal_list)
+        # End of each regex's last match; like finditer, matches of one regex do not overlap
+        regex_end = [0] * len(regex_list)
+        for literal_id, end in self.automaton.iter_matches(text):
+            if literal_id < literals:
+                _, length, indices = literal_list[literal_id]
+                start = end - length
+                if start >= last_end[literal_id]:
+                    last_end[literal_id] = end
+                    for index in indices:
+                        located.setdefault(index, []).append((start, end))
+                continue
+            # Prefixes are reported by end offset, so each regex sees its starts in order
+            _, length, branches = prefix_list[literal_id - literals]
+            start = end - length
+            for branch in branches:
+                if start < regex_end[branch]:
+                    continue
+                pattern, index = regex_list[branch]
+                found = pattern.match(text, start)
+                if found is not None:
+                    regex_end[branch] = found.end()
+                    located.setdefault(index, []).append((start, found.end()))
+
+        for branch in self.unprefixed_regexes:
+            pattern, index = regex_list[branch]
+            spans = [match.span() for match in pattern.finditer(text)]
+            if spans:
+                located.setdefault(index, []).extend(spans)
+
+    def _locate_each(self, text: str, located: Dict[int, List[Tuple[int, int]]]):
+        """Same matches as the combined pass, searching for one pattern at a time"""
+        find = text.find
+        for literal, length, indices in self.literal_list:
+            start = find(literal)
+            if start == -1:
+                continue
+            spans = []
+            while start != -1:
+                end = start + length
+                spans.append((start, end))
+                start = find(literal, end)
+            for index in indices:
+                if index in located:
+                    located[index].extend(spans)
+                else:
+                    located[index] = list(spans) if len(indices) > 1 else spans
+        for pattern, index in self.regex_list:
+            spans = [match.span() for match in pattern.finditer(text)]
+            if spans:
+                located.setdefault(index, []).extend(spans)
+
+    def count_matches(self, text: str) -> Dict[int, int]:
+        """
+        Matches per matched rule index as scan() finds them (absence rules
+        count their terms); rules that stop at one hit are counted at most once
+        """
+        counts: Dict[int, int] = {}
+        if self.combined:
+            for index, _, _ in self.scan(text):
+                counts[index] = counts.get(index, 0) + 1
+            return counts
+        presence = self.presence_literals
+        for literal, _, indices in self.literal_list:
+            occurrences = (literal in text) if literal in presence else text.count(literal)
+            if occurrences:
+                for index in indices:
+                    counts[index] = counts.get(index, 0) + occurrences
+        for pattern, index in self.regex_list:
+            if self._single_hit(self.rules[index]):
+                occurrences = pattern.search(text) is not None
+            else:
+                occurrences = len(pattern.findall(text))
+            if occurrences:
+                counts[index] = counts.get(index, 0) + occurrences
+        return counts
+
+    def evaluate(self, text: str, locale: Optional[str] = None,
+                 spans: bool = True) -> RuleEvaluation:
+        """
+        Score text against the pack
+
+        Args:
+            text: Content to check (matched in normalized form)
+            locale: Only apply rules for this locale (and '*' rules); all when None
+            spans: Locate every match (offsets into text) in the same scan; when
+                False only the score is needed, so a rule stops counting at max_hits
+
+        Returns:
+            RuleEvaluation: Penalty, messages in rule order and findings
+        """
+        if spans:
+            located = self.locate_text(text)
+            counts = {index: len(found) for index, found in located.items()}
+        else:
+            located = {}
+            counts = self.count_matches(normalize_text(text).text)
+        return self.score(counts, located, locale)
+
+    def locate_text(self, text: str, cached: bool = True) -> Dict[int, List[Tuple[int, int]]]:
+        """
+        Spans of every match per matched rule index, as offsets into text
+
+        Args:
+            text: Original text; normalized before matching
+            cached: Reuse (and keep) the normalized document; edit windows skip the cache
+        """
+        normalized = normalize_text(text) if cached else normalize_fragment(text)
+        located = self.locate(normalized.text)
+        if normalized.offset_maps:
+            span = normalized.span
+            located = {index: [span(start, end) for start, end in found]
+                       for index, found in located.items()}
+        return located
+
+    def score(self, counts: Dict[int, int], located: Dict[int, List[Tuple[int, int]]],
+              locale: Optional[str] = None) -> RuleEvaluation:
+        """Turn per-rule match counts (and spans) into a scored evaluation"""
+        absent = [index for index in self.absence_rules if index not in counts]
+
+        # Only matched and absence rules are visited, so large packs cost O(hits)
+        evaluation = RuleEvaluation()
+        for index in sorted(set(counts).union(absent)):
+            rule = self.rules[index]
+            if locale is not None and rule.locale not in ('*', locale):
+                continue
+            if rule.type == 'absence':
+                if index in counts:
+                    continue
+                occurrences, penalized = 0, 1
+            else:
+                occurrences = penalized = counts[index]
+                if rule.max_hits is not None:
+                    penalized = min(occurrences, rule.max_hits)
+            message = self.messages[index]
+            target = evaluation.issues if rule.severity == 'issue' else evaluation.warnings
+            for _ in range(penalized):
+                target.append(message)
+                evaluation.penalty += rule.weight
+            evaluation.findings.append(RuleFinding(rule, message, occurrences, penalized,
+                                                   located.get(index, [])))
+        return evaluation
+
+class ComplianceSession:
+    """
+    Compliance state of one document under edit.
+    Keeps the match spans of every reported rule (and the term counts of
+    absence rules) so an edit only re-scans the text near it: the edited
+    range plus, on each side, enough context to hold the widest match any
+    rule can produce. Matches elsewhere are shifted, not searched again,
+    so the cost of an edit does not grow with the document's length.
+    Occurrences of one self-overlapping pattern (such as 'aa' in 'aaaa')
+    right at the window edge may be split differently than a full scan would.
+    """
+
+    def __init__(self, compiled: CompiledRulePack, text: str = "", locale: Optional[str] = None):
+        """
+        Args:
+            compiled: Compiled rule pack to check against
+            text: Initial document, scanned in full once
+            locale: Only apply rules for this locale (and '*' rules); all when None
+        """
+        self.compiled = compiled
+        self.locale = locale
+        self.text = text
+        self.absence_rules = set(compiled.absence_rules)
+        located = compiled.locate_text(text, cached=False)
+        # Absence rules only need to know whether any term is left, not where
+        self.absence_counts = {index: len(located.pop(index)) for index in self.absence_rules
+                               if index in located}
+        self.located = located
+        # Widest original span seen per rule, bounding how far back a touching match can start
+        self.widest = {index: max(end - start for start, end in spans)
+                       for index, spans in located.items()}
+        self._evaluation: Optional[RuleEvaluation] = None
+
+    @property
+    def evaluation(self) -> RuleEvaluation:
+        """Evaluation of the current text, scored on first access after an edit"""
+        if self._evaluation is None:
+            counts = {index: len(spans) for index, spans in self.located.items()}
+            counts.update(self.absence_counts)
+            self._evaluation = self.compiled.score(counts, self.located, self.locale)
+        return self._evaluation
+
+    def apply_edit(self, offset: int, deleted_length: int, inserted: str) -> RuleEvaluation:
+        """
+        Replace text[offset:offset + deleted_length] with inserted and re-score
+
+        Args:
+            offset: Start of the edit in the current text
+            deleted_length: Characters removed at offset
+            inserted: Text inserted at offset
+
+        Returns:
+            RuleEvaluation: Evaluation of the edited document
+        """
+        self.edit(offset, deleted_length, inserted)
+        return self.evaluation
+
+    def edit(self, offset: int, deleted_length: int, inserted: str):
+        """Apply an edit like apply_edit(), leaving scoring until evaluation is read"""
+        text = self.text
+        if offset < 0 or deleted_length < 0 or offset + deleted_length > len(text):
+            raise ValueError(f"Edit ({offset}, {deleted_length}) is outside a "
+                             f"{len(text)}-character document")
+        old_end = offset + deleted_length
+        new_end = offset + len(inserted)
+        delta = new_end - old_end
+
+        # Matches touching the edit (including ones that merely end or start
+        # at its edges) are replaced by a re-scan of the window around it;
+        # the context beyond the edit is the same text before and after it
+        margin = self.compiled.max_width + 1
+        window_start = self._extend(text, offset, -margin)
+        old_window_end = self._extend(text, old_end, margin)
+        self.text = text[:offset] + inserted + text[old_end:]
+        found = self.compiled.locate_text(self.text[window_start:old_window_end + delta], cached=False)
+
+        # Absence terms are only counted, so the terms the edit destroyed are
+        # found by scanning the old text around it, padded by the longest term
+        before = None
+        for index in self.absence_rules:
+            added = self._touching(found.pop(index, ()), window_start, offset, new_end)
+            if self.absence_counts.get(index) or added:
+                if before is None:
+                    term_margin = self.compiled.absence_width + 1
+                    before_start = self._extend(text, offset, -term_margin)
+                    before = self.compiled.locate_text(
+                        text[before_start:self._extend(text, old_end, term_margin)], cached=False)
+                removed = self._touching(before.get(index, ()), before_start, offset, old_end)
+                remaining = self.absence_counts.get(index, 0) - len(removed) + len(added)
+                if remaining:
+                    self.absence_counts[index] = remaining
+                else:
+                    self.absence_counts.pop(index, None)
+
+        for index in set(self.located).union(found):
+            spans = self._splice(self.located.get(index, []), offset, old_end, delta,
+                                 self.widest.get(index, 0))
+            fresh = self._touching(found.get(index, ()), window_start, offset, new_end)
+            if fresh:
+                spans = self._merge(spans, fresh, offset)
+                widest = max(end - start for start, end in fresh)
+                if widest > self.widest.get(index, 0):
+                    self.widest[index] = widest
+            if spans:
+                self.located[index] = spans
+            else:
+                self.located.pop(index, None)
+                self.widest.pop(index, None)
+
+        self._evaluation = None
+
+    @property
+    def edit_cost(self) -> int:
+        """Rough cost of one edit, in characters a full scan covers in the same time"""
+        return EDIT_OVERHEAD_CHARS + 2 * (self.compiled.max_width + 1)
+
+    def fork(self) -> 'ComplianceSession':
+        """Independent copy of this session, for trying edits without re-scanning the document"""
+        forked = copy.copy(self)
+        # Span lists are replaced on edit, never changed in place, so they can be shared
+        forked.located = dict(self.located)
+        forked.absence_counts = dict(self.absence_counts)
+        forked.widest = dict(self.widest)
+        return forked
+
+    @staticmethod
+    def _extend(text: str, position: int, margin: int) -> int:
+        """Move from position until margin normalized characters lie in between"""
+        reach = abs(margin)
+        while True:
+            if margin < 0:
+                bound = max(0, position - reach)
+                between = text[bound:position]
+                at_edge = bound == 0
+            else:
+                bound = min(len(text), position + reach)
+                between = text[position:bound]
+                at_edge = bound == len(text)
+            # Zero-width characters and whitespace runs normalize away, so widen until enough remain
+            if at_edge or len(normalize_fragment(between).text) >= abs(margin):
+                return bound
+            reach *= 2
+
+    @staticmethod
+    def _touching(spans, window_start: int, start: int, end: int) -> List[Tuple[int, int]]:
+        """Window spans, as document offsets, that touch [start, end]"""
+        return [(window_start + s, window_start + e) for s, e in spans
+                if window_start + s <= end and window_start + e >= start]
+
+    @staticmethod
+    def _splice(spans: List[Tuple[int, int]], start: int, end: int, delta: int,
+                widest: int) -> List[Tuple[int, int]]:
+        """Drop spans touching [start, end] and shift the ones after it by delta"""
+        after = bisect_right(spans, (end, float('inf')))
+        before = after
+        while before > 0 and spans[before - 1][0] >= start - widest:
+            before -= 1
+        kept = [(s, e) for s, e in spans[before:after] if e < start]
+        if delta:
+            return spans[:before] + kept + [(s + delta, e + delta) for s, e in spans[after:]]
+        return spans[:before] + kept + spans[after:]
+
+    @staticmethod
+    def _merge(spans: List[Tuple[int, int]], fresh: List[Tuple[int, int]],
+               position: int) -> List[Tuple[int, int]]:
+        """Insert fresh spans (all near position) into spans, keeping them ordered"""
+        cut = bisect_right(spans, (position, float('inf')))
+        merged = spans[:cut] + fresh + spans[cut:]
+        if (cut and spans[cut - 1] > fresh[0]) or (cut < len(spans) and fresh[-1] > spans[cut]):
+            merged.sort()
+        return merged
+
+# Compiled packs already loaded by this process, keyed by fingerprint
+_COMPILED: Dict[str, CompiledRulePack] = {}
+
+def _compile_cached(fingerprint: str, name: str, build: Callable[[], RulePack],
+                    cache_dir: Optional[Union[str, Path]]) -> CompiledRulePack:
+    """Compiled pack from this process, then the pickle cache, else build() and store it"""
+    compiled = _COMPILED.get(fingerprint)
+    if compiled is not None:
+        return compiled
+
+    cache_file = None
+    if cache_dir is not None:
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', name)
+        cache_file = Path(cache_dir) / f"{safe_name}-{fingerprint[:16]}.pickle"
+        if cache_file.exists():
+            try:
+                with open(cache_file, 'rb') as f:
+                    compiled = pickle.load(f)
+            except Exception:
+                compiled = None
+            if compiled is not None and compiled.fingerprint != fingerprint:
+                compiled = None
+
+    if compiled is None:
+        compiled = CompiledRulePack(build(), fingerprint)
+        if cache_file is not None:
+            _store_compiled(compiled, cache_file)
+
+    _COMPILED[fingerprint] = compiled
+    return compiled
+
+def _store_compiled(compiled: CompiledRulePack, cache_file: Path):
+    """
+    Pickle a compiled pack to the cache, atomically
+
+    The cache only saves start-up time, so when it cannot be written (a
+    read-only or missing home directory, a full disk) the pack is used
+    from memory and the partial file is removed.
+    """
+    partial = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(partial, 'wb') as f:
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, cache_file)
+    except OSError:
+        with contextlib.suppress(OSError):
+            partial.unlink()
+
+def compile_rule_pack(pack: RulePack,
+                      cache_dir: Optional[Union[str, Path]] = None) -> CompiledRulePack:
+    """
+    Compile a pack, reusing this process's copy or a pickled one
+
+    Args:
+        pack: Rule pack to compile
+        cache_dir: Directory of pickled compiled packs; memory-only when None.
+            Only point this at a directory you trust: pickles execute on load.
+
+    Returns:
+        CompiledRulePack: Ready-to-use matcher
+    """
+    return _compile_cached(pack.fingerprint(), pack.name, lambda: pack, cache_dir)
+
+def load_rule_pack(source: Union[str, Path, Dict, RulePack, None] = None,
+                   cache_dir: Optional[Union[str, Path]] = DEFAULT_CACHE_DIR) -> CompiledRulePack:
+    """
+    Load and compile a rule pack
+
+    A pack file is identified by a hash of its bytes, so a cached pack is
+    loaded without parsing the JSON again.
+
+    Args:
+        source: JSON pack file, pack dict or RulePack; the built-in pack when None
+        cache_dir: Pickle cache for compiled packs (None disables the disk cache;
+            the built-in pack is never written to disk)
+
+    Returns:
+        CompiledRulePack: Ready-to-use matcher
+    """
+    if source is None:
+        return compile_rule_pack(RulePack.from_dict(DEFAULT_RULE_PACK))
+    if isinstance(source, RulePack):
+        return compile_rule_pack(source, cache_dir)
+    if isinstance(source, dict):
+        return compile_rule_pack(RulePack.from_dict(source), cache_dir)
+
+    path = Path(source)
+    raw = path.read_bytes()
+    fingerprint = hashlib.sha256(f"{ENGINE_VERSION}:".encode('utf-8') + raw).hexdigest()
+    return _compile_cached(fingerprint, path.stem,
+                           lambda: RulePack.from_dict(json.loads(raw.decode('utf-8'))),
+                           cache_dir)
@@ -0,0 +1,286 @@
+# /src/instrumentation.py
+# Version: 19-10-2026 12:00:00
+# Pre-Suader AI Agent - Timing Instrumentation and Profiling
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Lightweight per-method timing instrumentation for Pre-Suader.
+Instrumented calls record counts and latency histograms into an in-process
+registry. When instrumentation is disabled the wrappers only check a flag
+before calling through.
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+class _State:
+    enabled = os.environ.get("PRESUADER_INSTRUMENTATION", "").lower() in ("1", "true", "yes")
+
+_state = _State()
+
+def enable():
+    """Start recording instrumented calls"""
+    _state.enabled = True
+
+def disable():
+    """Stop recording instrumented calls"""
+    _state.enabled = False
+
+def is_enabled() -> bool:
+    return _state.enabled
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear latency histogram over nanosecond values.
+    Each power-of-two range is split into SUB_BUCKETS linear sub-buckets,
+    giving a bounded relative error of 1/SUB_BUCKETS at any magnitude.
+    """
+
+    SUB_BUCKET_BITS = 3
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.buckets = defaultdict(int)
+
+    @classmethod
+    def bucket_index(cls, value_ns: int) -> int:
+        if value_ns < cls.SUB_BUCKETS:
+            return value_ns
+        exponent = value_ns.bit_length() - cls.SUB_BUCKET_BITS - 1
+        return ((exponent + 1) << cls.SUB_BUCKET_BITS) + ((value_ns >> exponent) - cls.SUB_BUCKETS)
+
+    @classmethod
+    def bucket_upper_bound(cls, index: int) -> int:
+        """Largest nanosecond value that maps to a bucket index"""
+        if index < cls.SUB_BUCKETS:
+            return index
+        exponent = (index >> cls.SUB_BUCKET_BITS) - 1
+        mantissa = (index & (cls.SUB_BUCKETS - 1)) + cls.SUB_BUCKETS
+        return ((mantissa + 1) << exponent) - 1
+
+    def record(self, value_ns: int):
+        self.count += 1
+        self.total_ns += value_ns
+        if self.min_ns is None or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+        self.buckets[self.bucket_index(value_ns)] += 1
+
+    def merge(self, other: "LatencyHistogram"):
+        self.count += other.count
+        self.total_ns += other.total_ns
+        if other.min_ns is not None and (self.min_ns is None or other.min_ns < self.min_ns):
+            self.min_ns = other.min_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        for index, count in other.buckets.items():
+            self.buckets[index] += count
+
+    def percentile(self, q: float) -> int:
+        """Upper bound (ns) of the bucket holding the q-th percentile (0-100)"""
+        if not self.count:
+            return 0
+        rank = max(1, int(round(q / 100.0 * self.count)))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.bucket_upper_bound(index), self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> Dict[str, float]:
+        """Count plus latency statistics in milliseconds"""
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "mean_ms": round(self.total_ns / self.count / 1e6, 4) if self.count else 0.0,
+            "min_ms": round((self.min_ns or 0) / 1e6, 4),
+            "p50_ms": round(self.percentile(50) / 1e6, 4),
+            "p95_ms": round(self.percentile(95) / 1e6, 4),
+            "p99_ms": round(self.percentile(99) / 1e6, 4),
+            "max_ms": round(self.max_ns / 1e6, 4)
+        }
+
+class InstrumentationRegistry:
+    """Thread-safe registry of latency histograms and labelled counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+    def observe(self, name: str, value_ns: int):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.record(value_ns)
+
+    def increment(self, name: str, amount: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Summaries for every recorded operation"""
+        with self._lock:
+            return {name: h.summary() for name, h in sorted(self.histograms.items())}
+
+    def counter_snapshot(self) -> Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float]:
+        """Copy of every counter keyed by (name, sorted label pairs)"""
+        with self._lock:
+            return dict(self.counters)
+
+    def histogram_snapshot(self) -> Dict[str, LatencyHistogram]:
+        """Independent copies of every latency histogram"""
+        with self._lock:
+            copies = {}
+            for name, histogram in self.histograms.items():
+                copy = LatencyHistogram()
+                copy.merge(histogram)
+                copies[name] = copy
+            return copies
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def format_table(self) -> str:
+        """Human-readable timing table"""
+        lines = [f"{'operation':<52} {'calls':>8} {'mean ms':>10} {'p95 ms':>10} {'max ms':>10}"]
+        for name, stats in self.snapshot().items():
+            lines.append(f"{name:<52} {stats['count']:>8} {stats['mean_ms']:>10.4f} "
+                         f"{stats['p95_ms']:>10.4f} {stats['max_ms']:>10.4f}")
+        return "\n".join(lines)
+
+REGISTRY = InstrumentationRegistry()
+
+def instrumented(name: Optional[str] = None) -> Callable:
+    """
+    Decorator recording call count and latency of a function
+
+    Args:
+        name: Registry key (defaults to the function's qualified name)
+    """
+    def decorate(func):
+        metric = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                REGISTRY.increment("errors", operation=metric)
+                raise
+            finally:
+                REGISTRY.observe(metric, time.perf_counter_ns() - start)
+        return wrapper
+    return decorate
+
+def count(name: str, amount: float = 1, **labels):
+    """Increment a labelled counter while instrumentation is enabled"""
+    if _state.enabled:
+        REGISTRY.increment(name, amount, **labels)
+
+@contextmanager
+def timed(name: str):
+    """Context manager recording the latency of a block"""
+    if not _state.enabled:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        REGISTRY.observe(name, time.perf_counter_ns() - start)
+
+class CollapsedStackProfiler:
+    """
+    Deterministic profiler producing flamegraph-compatible collapsed stacks.
+    Each output line is 'frame;frame;frame <self-time in microseconds>'.
+    """
+
+    def __init__(self):
+        self.samples = defaultdict(int)
+        self._stack = []
+
+    @staticmethod
+    def _label(frame, event, arg) -> str:
+        if event == 'c_call':
+            module = getattr(arg, '__module__', None) or 'builtins'
+            return f"{module}:{getattr(arg, '__qualname__', repr(arg))}"
+        code = frame.f_code
+        module = frame.f_globals.get('__name__', '?')
+        return f"{module}:{code.co_name}"
+
+    def _callback(self, frame, event, arg):
+        now = time.perf_counter_ns()
+        if event in ('call', 'c_call'):
+            path = self._stack[-1][0] + ";" if self._stack else ""
+            self._stack.append([path + self._label(frame, event, arg), now, 0])
+        elif event in ('return', 'c_return', 'c_exception') and self._stack:
+            path, start, child_ns = self._stack.pop()
+            elapsed = now - start
+            self.samples[path] += elapsed - child_ns
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+    def start(self):
+        sys.setprofile(self._callback)
+
+    def stop(self):
+        sys.setprofile(None)
+        # Close frames still open when profiling stopped (the caller of stop())
+        while self._stack:
+            self._callback(None, 'return', None)
+
+    def write(self, output_path: str) -> str:
+        with open(output_path, 'w') as f:
+            for path, elapsed_ns in sorted(self.samples.items()):
+                weight = elapsed_ns // 1000
+                if weight > 0:
+                    f.write(f"{path} {weight}\n")
+        return output_path
+
+def profile_call(func: Callable, output_path: str, fmt: str = "pstats"):
+    """
+    Run a callable under a profiler and write the profile to disk
+
+    Args:
+        func: Zero-argument callable to profile
+        output_path: Destination file
+        fmt: "pstats" for a cProfile dump or "collapsed" for flamegraph stacks
+
+    Returns:
+        The callable's return value
+    """
+    if fmt == "pstats":
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func)
+        finally:
+            profiler.dump_stats(output_path)
+    if fmt == "collapsed":
+        profiler = CollapsedStackProfiler()
+        profiler.start()
+        try:
+            return func()
+        finally:
+            profiler.stop()
+            profiler.write(output_path)
+    raise ValueError(f"Unknown profile format: {fmt}")
@@ -0,0 +1,263 @@
+# /src/interchange.py
+# Version: 19-10-2026 10:00:00
+# Pre-Suader AI Agent - Binary Interchange Format
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Compact binary interchange for profiles, strategies and reports.
+Binary documents carry a small versioned header so every CLI stage can
+auto-detect whether it was handed JSON, MessagePack or CBOR.
+"""
+
+import importlib.util
+import struct
+from typing import Any, Dict, Tuple
+
+try:
+    from .serialization import dumps, loads
+except ImportError:
+    from serialization import dumps, loads
+
+_optional_modules = {}
+
+def _optional(name: str):
+    """Import an optional codec package on first use, returning None if missing"""
+    if name not in _optional_modules:
+        try:
+            _optional_modules[name] = importlib.import_module(name)
+        except ImportError:
+            _optional_modules[name] = None
+    return _optional_modules[name]
+
+MAGIC = b"PSDR"
+SCHEMA_VERSION = 1
+HEADER_SIZE = len(MAGIC) + 2
+
+FORMAT_EXTENSIONS = {
+    "json": ".json",
+    "msgpack": ".msgpack",
+    "cbor": ".cbor"
+}
+
+_CODEC_IDS = {"msgpack": b"m", "cbor": b"c"}
+_CODEC_NAMES = {v: k for k, v in _CODEC_IDS.items()}
+
+class InterchangeError(ValueError):
+    """Raised for unreadable, unsupported or mismatched interchange documents"""
+
+def available_formats() -> list:
+    """List formats usable in this environment"""
+    formats = ["json", "cbor"]
+    if importlib.util.find_spec("msgpack") is not None:
+        formats.append("msgpack")
+    return formats
+
+# Minimal CBOR (RFC 8949) codec used when cbor2 is not installed.
+# Supports the JSON data model: None, bool, int, float, str, bytes, list, dict.
+
+def _cbor_head(major: int, value: int) -> bytes:
+    if value < 24:
+        return bytes([(major << 5) | value])
+    if value < 0x100:
+        return bytes([(major << 5) | 24, value])
+    if value < 0x10000:
+        return bytes([(major << 5) | 25]) + struct.pack('>H', value)
+    if value < 0x100000000:
+        return bytes([(major << 5) | 26]) + struct.pack('>I', value)
+    if value < 0x10000000000000000:
+        return bytes([(major << 5) | 27]) + struct.pack('>Q', value)
+    raise InterchangeError(f"Integer too large for CBOR: {value}")
+
+def _cbor_encode(obj: Any, out: list) -> None:
+    if obj is None:
+        out.append(b'\xf6')
+    elif obj is True:
+        out.append(b'\xf5')
+    elif obj is False:
+        out.append(b'\xf4')
+    elif isinstance(obj, int):
+        out.append(_cbor_head(0, obj) if obj >= 0 else _cbor_head(1, -1 - obj))
+    elif isinstance(obj, float):
+        out.append(b'\xfb' + struct.pack('>d', obj))
+    elif isinstance(obj, str):
+        encoded = obj.encode('utf-8')
+        out.append(_cbor_head(3, len(encoded)))
+        out.append(encoded)
+    elif isinstance(obj, (bytes, bytearray)):
+        out.append(_cbor_head(2, len(obj)))
+        out.append(bytes(obj))
+    elif isinstance(obj, (list, tuple)):
+        out.append(_cbor_head(4, len(obj)))
+        for item in obj:
+            _cbor_encode(item, out)
+    elif isinstance(obj, dict):
+        out.append(_cbor_head(5, len(obj)))
+        for key, value in obj.items():
+            _cbor_encode(key, out)
+            _cbor_encode(value, out)
+    else:
+        raise InterchangeError(f"Cannot encode {type(obj).__name__} as CBOR")
+
+def _cbor_decode(data: bytes, pos: int) -> Tuple[Any, int]:
+    initial = data[pos]
+    major, info = initial >> 5, initial & 0x1f
+    pos += 1
+
+    if major == 7:
+        if info == 20:
+            return False, pos
+        if info == 21:
+            return True, pos
+        if info == 22:
+            return None, pos
+        if info == 25:
+            return struct.unpack_from('>e', data, pos)[0], pos + 2
+        if info == 26:
+            return struct.unpack_from('>f', data, pos)[0], pos + 4
+        if info == 27:
+            return struct.unpack_from('>d', data, pos)[0], pos + 8
+        raise InterchangeError(f"Unsupported CBOR simple value: {info}")
+
+    if info < 24:
+        value = info
+    elif info == 24:
+        value, pos = data[pos], pos + 1
+    elif info == 25:
+        value, pos = struct.unpack_from('>H', data, pos)[0], pos + 2
+    elif info == 26:
+        value, pos = struct.unpack_from('>I', data, pos)[0], pos + 4
+    elif info == 27:
+        value, pos = struct.unpack_from('>Q', data, pos)[0], pos + 8
+    else:
+        raise InterchangeError("Indefinite-length CBOR items are not supported")
+
+    if major == 0:
+        return value, pos
+    if major == 1:
+        return -1 - value, pos
+    if major == 2:
+        return bytes(data[pos:pos + value]), pos + value
+    if major == 3:
+        return bytes(data[pos:pos + value]).decode('utf-8'), pos + value
+    if major == 4:
+        items = []
+        for _ in range(value):
+            item, pos = _cbor_decode(data, pos)
+            items.append(item)
+        return items, pos
+    if major == 5:
+        mapping = {}
+        for _ in range(value):
+            key, pos = _cbor_decode(data, pos)
+            mapping[key], pos = _cbor_decode(data, pos)
+        return mapping, pos
+    if major == 6:
+        # Tags carry no meaning for our schema; decode the tagged item
+        return _cbor_decode(data, pos)
+    raise InterchangeError(f"Unsupported CBOR major type: {major}")
+
+def cbor_dumps(obj: Any) -> bytes:
+    """Encode an object as CBOR"""
+    cbor2 = _optional("cbor2")
+    if cbor2 is not None:
+        return cbor2.dumps(obj)
+    out = []
+    _cbor_encode(obj, out)
+    return b''.join(out)
+
+def cbor_loads(data: bytes) -> Any:
+    """Decode a CBOR document"""
+    cbor2 = _optional("cbor2")
+    if cbor2 is not None:
+        return cbor2.loads(data)
+    obj, pos = _cbor_decode(data, 0)
+    if pos != len(data):
+        raise InterchangeError("Trailing bytes after CBOR document")
+    return obj
+
+def encode_document(data: Dict, fmt: str = "json", kind: str = "document",
+                    compact: bool = False) -> bytes:
+    """
+    Encode a document in the requested interchange format
+
+    Args:
+        data: JSON-compatible document (profile, strategy report, compliance report)
+        fmt: One of "json", "msgpack" or "cbor"
+        kind: Document kind recorded in binary envelopes (e.g. "audience_profile")
+        compact: Drop JSON indentation (binary formats are always compact)
+
+    Returns:
+        bytes: Encoded document
+    """
+    if fmt == "json":
+        return dumps(data, compact=compact)
+
+    envelope = {"kind": kind, "data": data}
+    if fmt == "msgpack":
+        msgpack = _optional("msgpack")
+        if msgpack is None:
+            raise InterchangeError("msgpack format requires the 'msgpack' package")
+        payload = msgpack.packb(envelope, use_bin_type=True)
+    elif fmt == "cbor":
+        payload = cbor_dumps(envelope)
+    else:
+        raise InterchangeError(f"Unknown interchange format: {fmt}")
+
+    return MAGIC + bytes([SCHEMA_VERSION]) + _CODEC_IDS[fmt] + payload
+
+def detect_format(raw: bytes) -> str:
+    """Detect the interchange format of an encoded document"""
+    if raw[:len(MAGIC)] == MAGIC:
+        codec = raw[len(MAGIC) + 1:HEADER_SIZE]
+        if codec not in _CODEC_NAMES:
+            raise InterchangeError(f"Unknown binary codec id: {codec!r}")
+        return _CODEC_NAMES[codec]
+    return "json"
+
+def decode_document(raw: bytes, expected_kind: str = None) -> Dict:
+    """
+    Decode a document, auto-detecting JSON or binary encodings
+
+    Args:
+        raw: Encoded document bytes
+        expected_kind: Reject binary documents of a different kind
+
+    Returns:
+        Dict: Decoded document data
+    """
+    fmt = detect_format(raw)
+    if fmt == "json":
+        return loads(raw)
+
+    version = raw[len(MAGIC)]
+    if version > SCHEMA_VERSION:
+        raise InterchangeError(
+            f"Document schema version {version} is newer than supported version {SCHEMA_VERSION}"
+        )
+
+    payload = raw[HEADER_SIZE:]
+    if fmt == "msgpack":
+        msgpack = _optional("msgpack")
+        if msgpack is None:
+            raise InterchangeError("Reading msgpack documents requires the 'msgpack' package")
+        envelope = msgpack.unpackb(payload, raw=False)
+    else:
+        envelope = cbor_loads(payload)
+
+    if expected_kind and envelope.get("kind") != expected_kind:
+        raise InterchangeError(
+            f"Expected a '{expected_kind}' document but found '{envelope.get('kind')}'"
+        )
+    return envelope["data"]
+
+def write_document(data: Dict, output_path: str, fmt: str = "json",
+                   kind: str = "document", compact: bool = False) -> str:
+    """Encode a document and write it to disk, returning the path"""
+    with open(output_path, 'wb') as f:
+        f.write(encode_document(data, fmt=fmt, kind=kind, compact=compact))
+    return output_path
+
+def read_document(input_path: str, expected_kind: str = None) -> Dict:
+    """Read a document from disk in any supported format"""
+    with open(input_path, 'rb') as f:
+        return decode_document(f.read(), expected_kind=expected_kind)
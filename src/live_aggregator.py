@@ -0,0 +1,264 @@
+# /src/live_aggregator.py
+# Version: 19-10-2026 14:00:00
+# Pre-Suader AI Agent - Live Campaign Aggregator
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+In-memory streaming aggregation of campaign metrics.
+Keeps running totals per campaign and variant plus event-time windows so
+live KPIs never query SQLite; raw events are checkpointed to the
+MetricsTracker database in batches.
+"""
+
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    from .metrics_tracker import MetricEntry, MetricsTracker, CampaignPerformance
+    from .instrumentation import count, timed
+except ImportError:
+    from metrics_tracker import MetricEntry, MetricsTracker, CampaignPerformance
+    from instrumentation import count, timed
+
+# Per-metric running state: [count, total]
+_Totals = Dict[str, List[float]]
+
+def _add(totals: _Totals, metric_name: str, value: float, n: int = 1):
+    state = totals.get(metric_name)
+    if state is None:
+        totals[metric_name] = [n, value]
+    else:
+        state[0] += n
+        state[1] += value
+
+def _merge(target: _Totals, source: _Totals):
+    for metric_name, (n, total) in source.items():
+        _add(target, metric_name, total, n)
+
+class TimestampRing:
+    """
+    Fixed ring of event-time slots, each holding per-key metric totals.
+    A slot is recycled when an event for a newer slot lands on it, so
+    memory stays bounded by the window length.
+    """
+
+    def __init__(self, slot_seconds: float, slots: int):
+        self.slot_seconds = slot_seconds
+        self.slots = slots
+        self._slot_ids = [None] * slots
+        self._data: List[Dict[Tuple[str, str], _Totals]] = [{} for _ in range(slots)]
+        self.latest_slot = None
+
+    def add(self, epoch: float, key: Tuple[str, str], metric_name: str, value: float) -> bool:
+        """Add an event; returns False when it is too old for the ring"""
+        slot_id = int(epoch // self.slot_seconds)
+        if self.latest_slot is not None and slot_id <= self.latest_slot - self.slots:
+            return False
+        position = slot_id % self.slots
+        if self._slot_ids[position] != slot_id:
+            self._slot_ids[position] = slot_id
+            self._data[position] = {}
+        if self.latest_slot is None or slot_id > self.latest_slot:
+            self.latest_slot = slot_id
+        _add(self._data[position].setdefault(key, {}), metric_name, value)
+        return True
+
+    def totals(self, key_filter: Callable[[Tuple[str, str]], bool],
+               span: int) -> Tuple[_Totals, Optional[float], Optional[float]]:
+        """
+        Merge the newest `span` slots for matching keys
+
+        Returns:
+            Tuple: (totals, window start epoch, window end epoch)
+        """
+        if self.latest_slot is None:
+            return {}, None, None
+        first_slot = self.latest_slot - span + 1
+        merged: _Totals = {}
+        for slot_id, data in zip(self._slot_ids, self._data):
+            if slot_id is None or slot_id < first_slot:
+                continue
+            for key, totals in data.items():
+                if key_filter(key):
+                    _merge(merged, totals)
+        return (merged, first_slot * self.slot_seconds,
+                (self.latest_slot + 1) * self.slot_seconds)
+
+class LiveCampaignAggregator:
+    """Streaming KPIs per campaign and variant with event-time windows"""
+
+    def __init__(self, tracker: Optional[MetricsTracker] = None,
+                 window_seconds: float = 300, slide_seconds: Optional[float] = None,
+                 checkpoint_interval: float = 60.0, checkpoint_batch: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            tracker: MetricsTracker receiving checkpointed events (None keeps everything in memory)
+            window_seconds: Length of the KPI window in event time
+            slide_seconds: Slide of a sliding window; None gives tumbling windows
+            checkpoint_interval: Seconds between checkpoints to the tracker database
+            checkpoint_batch: Pending events that force a checkpoint regardless of time
+            clock: Monotonic clock used for checkpoint scheduling
+        """
+        slide = slide_seconds or window_seconds
+        if window_seconds % slide:
+            raise ValueError("window_seconds must be a multiple of slide_seconds")
+        self.tracker = tracker
+        self.window_seconds = window_seconds
+        self.tumbling = slide_seconds is None
+        self.window_slots = int(window_seconds // slide)
+        # Tumbling windows use a single-slot span; the ring keeps one spare slot
+        # so the previous window can be reported after the next one opens
+        self.ring = TimestampRing(slide, self.window_slots + 1)
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_batch = checkpoint_batch
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._running: Dict[Tuple[str, str], _Totals] = {}
+        self._first_seen: Dict[str, str] = {}
+        self._last_seen: Dict[str, str] = {}
+        self._pending: List[Tuple] = []
+        self._last_checkpoint = clock()
+        self.events = 0
+        self.late_events = 0
+
+    def ingest(self, entry: Union[MetricEntry, Tuple]):
+        """
+        Fold one metric event into the running counters and window
+
+        Args:
+            entry: MetricEntry or (campaign_id, metric_name, value, timestamp,
+                variant, source) tuple
+        """
+        row = ((entry.campaign_id, entry.metric_name, entry.value, entry.timestamp,
+                entry.variant, entry.source)
+               if isinstance(entry, MetricEntry) else tuple(entry))
+        campaign_id, metric_name, value, timestamp, variant = row[:5]
+        epoch = datetime.fromisoformat(timestamp).timestamp()
+
+        with self._lock:
+            key = (campaign_id, variant)
+            _add(self._running.setdefault(key, {}), metric_name, value)
+            if campaign_id not in self._first_seen or timestamp < self._first_seen[campaign_id]:
+                self._first_seen[campaign_id] = timestamp
+            if campaign_id not in self._last_seen or timestamp > self._last_seen[campaign_id]:
+                self._last_seen[campaign_id] = timestamp
+            if not self.ring.add(epoch, key, metric_name, value):
+                self.late_events += 1
+                count("live_late_events")
+            self.events += 1
+            if self.tracker is not None:
+                self._pending.append(row)
+
+        if self.tracker is not None and (
+                len(self._pending) >= self.checkpoint_batch
+                or self.clock() - self._last_checkpoint >= self.checkpoint_interval):
+            self.checkpoint()
+
+    def consume(self, source: Union[Iterable, "queue.Queue"], sentinel=None) -> int:
+        """
+        Ingest events from an iterator or a queue until it is exhausted
+
+        Args:
+            source: Iterable of events, or a queue.Queue / multiprocessing queue
+            sentinel: Queue item that ends consumption
+
+        Returns:
+            int: Number of events ingested
+        """
+        ingested = 0
+        if hasattr(source, 'get'):
+            while True:
+                entry = source.get()
+                if entry is sentinel:
+                    break
+                self.ingest(entry)
+                ingested += 1
+        else:
+            for entry in source:
+                self.ingest(entry)
+                ingested += 1
+        return ingested
+
+    def checkpoint(self) -> int:
+        """
+        Write pending events to the tracker database
+
+        Returns:
+            int: Number of events written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._last_checkpoint = self.clock()
+        if not pending or self.tracker is None:
+            return 0
+        with timed("LiveCampaignAggregator.checkpoint"):
+            return self.tracker.record_metrics(pending)
+
+    def close(self) -> int:
+        """Flush the final checkpoint"""
+        return self.checkpoint()
+
+    def _performance(self, campaign_id: str, totals: _Totals,
+                     start_date: str, end_date: str) -> CampaignPerformance:
+        return MetricsTracker.build_performance(
+            campaign_id, start_date, end_date,
+            {name: total for name, (_, total) in totals.items()},
+            {name: total / n for name, (n, total) in totals.items() if n}
+        )
+
+    def snapshot(self, campaign_id: str, variant: Optional[str] = None) -> Optional[CampaignPerformance]:
+        """
+        Performance over every event seen for a campaign
+
+        Args:
+            campaign_id: Campaign to summarize
+            variant: Restrict to one variant (all variants when None)
+
+        Returns:
+            Optional[CampaignPerformance]: None when no events have been seen
+        """
+        with self._lock:
+            merged: _Totals = {}
+            for (key_campaign, key_variant), totals in self._running.items():
+                if key_campaign == campaign_id and variant in (None, key_variant):
+                    _merge(merged, totals)
+            if not merged:
+                return None
+            return self._performance(campaign_id, merged, self._first_seen[campaign_id],
+                                     self._last_seen[campaign_id])
+
+    def window_snapshot(self, campaign_id: str,
+                        variant: Optional[str] = None) -> Optional[CampaignPerformance]:
+        """
+        Performance over the current event-time window
+
+        Sliding windows cover the newest window_seconds of event time; tumbling
+        windows cover the aligned window holding the newest event.
+
+        Args:
+            campaign_id: Campaign to summarize
+            variant: Restrict to one variant (all variants when None)
+
+        Returns:
+            Optional[CampaignPerformance]: None when the window holds no events
+        """
+        span = 1 if self.tumbling else self.window_slots
+        with self._lock:
+            merged, start, end = self.ring.totals(
+                lambda key: key[0] == campaign_id and variant in (None, key[1]), span
+            )
+        if not merged:
+            return None
+        return self._performance(campaign_id, merged,
+                                 datetime.fromtimestamp(start).isoformat(),
+                                 datetime.fromtimestamp(end).isoformat())
+
+    def campaigns(self) -> List[str]:
+        """Campaigns with at least one event"""
+        with self._lock:
+            return sorted(self._first_seen)
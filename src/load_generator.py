@@ -0,0 +1,220 @@
+# /src/load_generator.py
+# Version: 19-10-2026 11:30:00
+# Pre-Suader AI Agent - Synthetic Load Generator
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Seeded, reproducible synthetic datasets for capacity testing.
+Campaigns, metric events and creatives are produced lazily so very large
+datasets stream straight to CSV, JSONL or the metrics database.
+"""
+
+import csv
+import random
+from bisect import bisect
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .serialization import dumps
+except ImportError:
+    from serialization import dumps
+
+METRIC_COLUMNS = ['campaign_id', 'metric_name', 'value', 'timestamp', 'variant', 'source']
+CAMPAIGN_COLUMNS = ['campaign_id', 'name', 'objective']
+CREATIVE_COLUMNS = ['creative_id', 'campaign_id', 'content', 'flagged_phrases']
+
+# Share of events per metric and the value range each one draws from
+METRIC_MIX = [
+    ('impressions', 0.55, 50, 500),
+    ('clicks', 0.20, 0, 25),
+    ('conversions', 0.05, 0, 3),
+    ('engagement_score', 0.08, 4.0, 10.0),
+    ('revenue', 0.04, 0.0, 500.0),
+    ('cost', 0.04, 10.0, 200.0),
+    ('ethical_compliance_score', 0.04, 70.0, 100.0)
+]
+
+OBJECTIVES = [
+    "increase demo requests", "grow trial signups", "improve lead quality",
+    "boost webinar attendance", "raise upgrade conversions"
+]
+COPY_WORDS = [
+    "our", "new", "platform", "helps", "teams", "automate", "workflows", "features",
+    "transparent", "pricing", "reliable", "support", "results", "insight", "secure",
+    "analytics", "growth", "save", "time", "book", "a", "demo", "today", "clear"
+]
+FLAGGED_PHRASES = [
+    "act now", "limited time", "hurry", "expires", "only 3 left", "manipulate",
+    "fake urgency", "false scarcity", "trick", "dark pattern"
+]
+
+def variant_names(count: int) -> List[str]:
+    """Variant labels: 'control' followed by treatment_a, treatment_b, ..."""
+    names = ["control"]
+    for i in range(1, count):
+        suffix = ""
+        n = i
+        while n > 0:
+            n, remainder = divmod(n - 1, 26)
+            suffix = chr(ord('a') + remainder) + suffix
+        names.append(f"treatment_{suffix}")
+    return names
+
+def generate_campaigns(count: int, seed: int = 42) -> List[Tuple[str, str, str]]:
+    """Generate (campaign_id, name, objective) tuples"""
+    rng = random.Random(seed)
+    return [
+        (f"load_{i:06d}", f"Synthetic Campaign {i}", rng.choice(OBJECTIVES))
+        for i in range(count)
+    ]
+
+def generate_metric_rows(campaign_ids: List[str], variants: int, events: int,
+                         start: datetime, end: datetime,
+                         seed: int = 42) -> Iterator[Tuple]:
+    """
+    Stream metric rows spread evenly over a time range
+
+    Args:
+        campaign_ids: Campaigns to distribute events across
+        variants: Number of variants per campaign (including control)
+        events: Total number of metric rows to generate
+        start: Timestamp of the first event
+        end: Timestamp of the last event
+        seed: Random seed for reproducibility
+
+    Yields:
+        Tuple: (campaign_id, metric_name, value, timestamp, variant, source) rows
+            in chronological order
+    """
+    rng = random.Random(seed)
+    names = variant_names(variants)
+    cumulative = list(accumulate(weight for _, weight, _, _ in METRIC_MIX))
+    total_weight = cumulative[-1]
+    # Per-campaign performance multipliers keep campaigns distinguishable
+    lift = {campaign_id: rng.uniform(0.6, 1.4) for campaign_id in campaign_ids}
+    step = (end - start).total_seconds() / max(events, 1)
+    start_ts = start.timestamp()
+
+    for i in range(events):
+        campaign_id = campaign_ids[rng.randrange(len(campaign_ids))]
+        metric_name, _, low, high = METRIC_MIX[bisect(cumulative, rng.random() * total_weight)]
+        if isinstance(low, int):
+            value = float(int(rng.randint(low, high) * lift[campaign_id]))
+        else:
+            value = round(min(high, rng.uniform(low, high) * lift[campaign_id]), 2)
+        timestamp = datetime.fromtimestamp(start_ts + (i + rng.random()) * step).isoformat()
+        yield (campaign_id, metric_name, value, timestamp,
+               names[rng.randrange(variants)], "load_generator")
+
+def generate_creatives(count: int, campaign_ids: List[str], words: int = 120,
+                       flagged_rate: float = 0.01, seed: int = 42) -> Iterator[Dict]:
+    """
+    Stream synthetic creatives with a tunable share of flagged phrases
+
+    Args:
+        count: Number of creatives
+        campaign_ids: Campaigns the creatives are assigned to
+        words: Tokens per creative
+        flagged_rate: Probability that each token is a flagged phrase
+        seed: Random seed for reproducibility
+
+    Yields:
+        Dict: creative_id, campaign_id, content and flagged_phrases count
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        tokens = []
+        flagged = 0
+        for _ in range(words):
+            if rng.random() < flagged_rate:
+                tokens.append(rng.choice(FLAGGED_PHRASES))
+                flagged += 1
+            else:
+                tokens.append(rng.choice(COPY_WORDS))
+        yield {
+            "creative_id": f"creative_{i:06d}",
+            "campaign_id": campaign_ids[rng.randrange(len(campaign_ids))] if campaign_ids else "",
+            "content": " ".join(tokens),
+            "flagged_phrases": flagged
+        }
+
+def write_csv(rows: Iterable, output_path: str, columns: List[str]) -> int:
+    """Stream tuples or dicts to a CSV file, returning the row count"""
+    count = 0
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([row[c] for c in columns] if isinstance(row, dict) else row)
+            count += 1
+    return count
+
+def write_jsonl(rows: Iterable, output_path: str, columns: List[str]) -> int:
+    """Stream tuples or dicts to a JSON Lines file, returning the row count"""
+    count = 0
+    with open(output_path, 'wb') as f:
+        for row in rows:
+            record = row if isinstance(row, dict) else dict(zip(columns, row))
+            f.write(dumps(record, compact=True))
+            f.write(b'\n')
+            count += 1
+    return count
+
+def generate_load(output_dir: str, campaigns: int = 10, variants: int = 2,
+                  events: int = 10000, creatives: int = 100,
+                  flagged_rate: float = 0.01, days: int = 30,
+                  end: Optional[datetime] = None, sink: str = "csv",
+                  tracker=None, seed: int = 42) -> Dict[str, int]:
+    """
+    Generate a complete synthetic dataset and stream it to a sink
+
+    Args:
+        output_dir: Directory for CSV/JSONL files (creatives always land here)
+        campaigns: Number of campaigns
+        variants: Variants per campaign, including control
+        events: Number of metric events
+        creatives: Number of creatives
+        flagged_rate: Per-token probability of a flagged phrase in creatives
+        days: Time span the metric events cover
+        end: Timestamp of the last event (defaults to today at midnight)
+        sink: "csv", "jsonl" or "db"
+        tracker: MetricsTracker receiving campaigns and metrics when sink is "db"
+        seed: Random seed for reproducibility
+
+    Returns:
+        Dict: Row counts written per dataset
+    """
+    if sink not in ("csv", "jsonl", "db"):
+        raise ValueError(f"Unknown sink: {sink}")
+    if sink == "db" and tracker is None:
+        raise ValueError("The 'db' sink requires a MetricsTracker")
+
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    end = end or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=days)
+
+    campaign_rows = generate_campaigns(campaigns, seed=seed)
+    campaign_ids = [row[0] for row in campaign_rows]
+    metric_rows = generate_metric_rows(campaign_ids, variants, events, start, end, seed=seed + 1)
+    creative_rows = generate_creatives(creatives, campaign_ids, flagged_rate=flagged_rate,
+                                       seed=seed + 2)
+
+    if sink == "db":
+        counts = {
+            "campaigns": tracker.register_campaigns(campaign_rows),
+            "metrics": tracker.record_metrics(metric_rows),
+            "creatives": write_jsonl(creative_rows, str(out / "creatives.jsonl"), CREATIVE_COLUMNS)
+        }
+    else:
+        writer = write_csv if sink == "csv" else write_jsonl
+        counts = {
+            "campaigns": writer(campaign_rows, str(out / f"campaigns.{sink}"), CAMPAIGN_COLUMNS),
+            "metrics": writer(metric_rows, str(out / f"metrics.{sink}"), METRIC_COLUMNS),
+            "creatives": writer(creative_rows, str(out / f"creatives.{sink}"), CREATIVE_COLUMNS)
+        }
+
+    return counts
@@ -0,0 +1,172 @@
+# /src/metrics_exposition.py
+# Version: 19-10-2026 12:30:00
+# Pre-Suader AI Agent - Prometheus/OpenMetrics Exposition
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Prometheus and OpenMetrics exposition of Pre-Suader instrumentation.
+Serves the in-process registry from a local HTTP endpoint or writes it to
+a node_exporter textfile-collector file.
+"""
+
+import os
+import threading
+from typing import Dict, List, Tuple
+
+try:
+    from .instrumentation import REGISTRY, InstrumentationRegistry, LatencyHistogram
+except ImportError:
+    from instrumentation import REGISTRY, InstrumentationRegistry, LatencyHistogram
+
+NAMESPACE = "presuader"
+
+# Fixed latency bucket boundaries (seconds) so series stay stable across scrapes
+LATENCY_BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+COUNTER_HELP = {
+    "compliance_checks": "Ethical compliance checks performed",
+    "compliance_grades": "Ethical compliance results by grade",
+    "flagged_keywords": "Manipulative keywords flagged by compliance checks",
+    "urgency_warnings": "Urgency-language warnings raised by compliance checks",
+    "tracker_errors": "MetricsTracker operations that failed",
+    "sqlite_lock_retries": "Metrics database writes retried after finding the database locked",
+    "live_late_events": "Live events too old for the aggregation window",
+    "errors": "Instrumented operations that raised an exception"
+}
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _cumulative_buckets(histogram: LatencyHistogram) -> List[Tuple[float, int]]:
+    """Map HDR buckets onto the fixed boundaries as cumulative counts"""
+    bounds_ns = [b * 1e9 for b in LATENCY_BUCKETS]
+    counts = [0] * len(bounds_ns)
+    for index, bucket_count in histogram.buckets.items():
+        upper = histogram.bucket_upper_bound(index)
+        for i, bound in enumerate(bounds_ns):
+            if upper <= bound:
+                counts[i] += bucket_count
+                break
+    cumulative, running = [], 0
+    for bound, bucket_count in zip(LATENCY_BUCKETS, counts):
+        running += bucket_count
+        cumulative.append((bound, running))
+    cumulative.append((float('inf'), histogram.count))
+    return cumulative
+
+def render_metrics(registry: InstrumentationRegistry = REGISTRY,
+                   openmetrics: bool = True) -> str:
+    """
+    Render the registry in exposition format
+
+    Args:
+        registry: Instrumentation registry to expose
+        openmetrics: OpenMetrics 1.0 text when True, Prometheus text 0.0.4 otherwise
+
+    Returns:
+        str: Exposition document
+    """
+    lines = []
+
+    counters: Dict[str, List] = {}
+    for (name, labels), value in sorted(registry.counter_snapshot().items()):
+        counters.setdefault(name, []).append((labels, value))
+
+    for name, samples in counters.items():
+        family = f"{NAMESPACE}_{name}"
+        type_name = family if openmetrics else f"{family}_total"
+        lines.append(f"# HELP {type_name} {COUNTER_HELP.get(name, name.replace('_', ' '))}")
+        lines.append(f"# TYPE {type_name} counter")
+        for labels, value in samples:
+            lines.append(f"{family}_total{_labels(labels)} {_format_value(value)}")
+
+    histograms = registry.histogram_snapshot()
+    if histograms:
+        family = f"{NAMESPACE}_operation_latency_seconds"
+        lines.append(f"# HELP {family} Latency of instrumented Pre-Suader operations")
+        lines.append(f"# TYPE {family} histogram")
+        for operation, histogram in sorted(histograms.items()):
+            base = [("operation", operation)]
+            for bound, cumulative in _cumulative_buckets(histogram):
+                lines.append(f"{family}_bucket{_labels(base + [('le', _format_value(bound))])} "
+                             f"{cumulative}")
+            lines.append(f"{family}_count{_labels(base)} {histogram.count}")
+            lines.append(f"{family}_sum{_labels(base)} {_format_value(histogram.total_ns / 1e9)}")
+
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+def write_textfile(output_path: str, registry: InstrumentationRegistry = REGISTRY) -> str:
+    """
+    Atomically write Prometheus text format for node_exporter's textfile collector
+
+    Args:
+        output_path: Target .prom file inside the collector directory
+        registry: Instrumentation registry to expose
+
+    Returns:
+        str: The path written
+    """
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(render_metrics(registry, openmetrics=False))
+    os.replace(temp_path, output_path)
+    return output_path
+
+def serve_metrics(port: int = 9464, host: str = "127.0.0.1",
+                  registry: InstrumentationRegistry = REGISTRY) -> "ThreadingHTTPServer":
+    """
+    Serve /metrics from a background thread
+
+    Clients sending 'Accept: application/openmetrics-text' receive OpenMetrics;
+    everyone else receives Prometheus text format.
+
+    Args:
+        port: Port to listen on (0 picks a free port)
+        host: Interface to bind
+        registry: Instrumentation registry to expose
+
+    Returns:
+        ThreadingHTTPServer: Running server; call shutdown() to stop it
+    """
+    # Imported here so batch jobs that only write textfiles skip http.server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+            body = render_metrics(registry, openmetrics=openmetrics).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type',
+                             OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="presuader-metrics", daemon=True)
+    thread.start()
+    return server
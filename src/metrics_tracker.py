@@ -10,13 +10,38 @@ Provides comprehensive reporting and optimization insights.
 
 import json
 import csv
-import sqlite3
+import random
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
-import statistics
 from pathlib import Path
 
+try:
+    from .instrumentation import instrumented, timed, count
+    from .sketches import HyperLogLog, KLLSketch, sketch_from_bytes
+    from .storage_backends import StorageBackend, SQLiteBackend
+except ImportError:
+    from instrumentation import instrumented, timed, count
+    from sketches import HyperLogLog, KLLSketch, sketch_from_bytes
+    from storage_backends import StorageBackend, SQLiteBackend
+
+# Metrics summarised by KLL quantile sketches when sketches are enabled
+SKETCH_METRICS = ('engagement_score', 'revenue', 'cost', 'ethical_compliance_score')
+# Pseudo-metric holding HyperLogLog sketches of distinct users
+REACH_METRIC = 'unique_users'
+
+# Concurrency: how long SQLite waits on a lock, then how often and how
+# long (base delay, doubled per attempt with full jitter) writes are retried
+BUSY_TIMEOUT_SECONDS = 5.0
+WRITE_RETRIES = 5
+RETRY_BASE_DELAY = 0.05
+
+# Campaign ids bound per IN (...) list; SQLite before 3.32 allows 999 parameters
+CAMPAIGN_ID_CHUNK = 500
+
 @dataclass
 class MetricEntry:
     """Individual metric measurement"""
@@ -45,81 +70,123 @@ class CampaignPerformance:
 class MetricsTracker:
     """Track and analyze Pre-Suader campaign performance"""
     
-    def __init__(self, db_path: str = "presuader_metrics.db"):
+    def __init__(self, db_path: str = "presuader_metrics.db", sketches: bool = False,
+                 busy_timeout: float = BUSY_TIMEOUT_SECONDS,
+                 write_retries: int = WRITE_RETRIES,
+                 backend: Optional[StorageBackend] = None):
+        """
+        Args:
+            db_path: SQLite database file
+            sketches: Maintain hourly KLL quantile sketches for SKETCH_METRICS
+                alongside the rollups (covers rows rolled up after enabling)
+            busy_timeout: Seconds a connection waits for a lock held by another writer
+            write_retries: Retries of a write transaction that still finds the database locked
+            backend: Storage backend (defaults to a SQLiteBackend on db_path)
+        """
+        self.backend = backend or SQLiteBackend(db_path, busy_timeout)
         self.db_path = db_path
+        self.sketches = sketches
+        self.busy_timeout = busy_timeout
+        self.write_retries = write_retries
+        # Rendered incremental report bodies keyed by campaign
+        self._report_cache = {}
         self.init_database()
     
     def init_database(self):
-        """Initialize SQLite database for metrics storage"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create metrics table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS metrics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                campaign_id TEXT NOT NULL,
-                metric_name TEXT NOT NULL,
-                value REAL NOT NULL,
-                timestamp TEXT NOT NULL,
-                variant TEXT DEFAULT 'control',
-                source TEXT DEFAULT 'manual'
-            )
-        ''')
-        
-        # Create campaigns table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS campaigns (
-                campaign_id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                objective TEXT NOT NULL,
-                start_date TEXT NOT NULL,
-                end_date TEXT,
-                status TEXT DEFAULT 'active',
-                created_at TEXT NOT NULL
-            )
-        ''')
+        """Initialize the metrics schema in the storage backend"""
+        conn = self._connect()
+        try:
+            self.backend.initialize(conn)
+        finally:
+            self._release(conn)
+    
+    def _connect(self):
+        """Open (or borrow from the backend's pool) a database connection"""
+        return self.backend.connect()
+    
+    def _release(self, conn):
+        self.backend.release(conn)
+    
+    def _execute_write(self, write: Callable, exclusive: bool = False,
+                       appends_metrics: bool = False):
+        """
+        Run write(cursor) in its own transaction, retrying transient lock errors
+        
+        The backend opens the transaction: SQLite takes the write lock up front
+        (BEGIN IMMEDIATE) so read-then-write operations wait instead of failing
+        on upgrade, and exclusive writes are serialized across processes and
+        nodes. Retries back off exponentially with full jitter so competing
+        writers do not wake in lockstep.
         
-        conn.commit()
-        conn.close()
+        Args:
+            write: Callable issuing the statements of one transaction
+            exclusive: Serialize against other exclusive writers (watermark updates)
+            appends_metrics: The transaction inserts metric rows, which
+                watermark updates must wait for
+            
+        Returns:
+            Whatever write returns
+        """
+        for attempt in range(self.write_retries + 1):
+            conn = None
+            try:
+                # Opening a WAL database can itself briefly hit a lock
+                conn = self._connect()
+                with timed("MetricsTracker.sqlite_write"):
+                    self.backend.begin_write(conn, exclusive, appends_metrics)
+                    result = write(conn.cursor())
+                with timed("MetricsTracker.sqlite_commit"):
+                    conn.commit()
+                return result
+            except Exception as e:
+                if conn is not None:
+                    conn.rollback()
+                if not self.backend.is_retryable(e) or attempt == self.write_retries:
+                    raise
+                count("sqlite_lock_retries")
+                time.sleep(random.uniform(0, RETRY_BASE_DELAY * 2 ** attempt))
+            finally:
+                if conn is not None:
+                    self._release(conn)
     
+    @instrumented()
     def register_campaign(self, campaign_id: str, name: str, objective: str) -> bool:
         """Register a new campaign for tracking"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO campaigns 
+            self._execute_write(lambda cursor: cursor.execute('''
+                INSERT INTO campaigns
                 (campaign_id, name, objective, start_date, created_at)
                 VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (campaign_id) DO UPDATE SET
+                    name = excluded.name,
+                    objective = excluded.objective,
+                    start_date = excluded.start_date,
+                    end_date = NULL,
+                    status = 'active',
+                    created_at = excluded.created_at
             ''', (
-                campaign_id, 
-                name, 
-                objective, 
+                campaign_id,
+                name,
+                objective,
                 datetime.now().isoformat(),
                 datetime.now().isoformat()
-            ))
-            
-            conn.commit()
-            conn.close()
+            )))
             
             print(f"✅ Campaign '{name}' registered with ID: {campaign_id}")
             return True
             
         except Exception as e:
+            count("tracker_errors", operation="register_campaign")
             print(f"❌ Error registering campaign: {str(e)}")
             return False
     
+    @instrumented()
     def record_metric(self, campaign_id: str, metric_name: str, value: float, 
                      variant: str = "control", source: str = "manual") -> bool:
         """Record a single metric measurement"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO metrics 
+            self._execute_write(lambda cursor: cursor.execute('''
+                INSERT INTO metrics
                 (campaign_id, metric_name, value, timestamp, variant, source)
                 VALUES (?, ?, ?, ?, ?, ?)
             ''', (
@@ -129,104 +196,798 @@ class MetricsTracker:
                 datetime.now().isoformat(),
                 variant,
                 source
-            ))
-            
-            conn.commit()
-            conn.close()
+            )), appends_metrics=True)
             
             return True
             
         except Exception as e:
+            count("tracker_errors", operation="record_metric")
             print(f"❌ Error recording metric: {str(e)}")
             return False
     
+    @instrumented()
+    def record_metrics(self, entries: Iterable[Union[MetricEntry, Tuple]],
+                       batch_size: int = 10000) -> int:
+        """
+        Record many metric measurements with batched inserts
+        
+        Args:
+            entries: MetricEntry objects or (campaign_id, metric_name, value,
+                timestamp, variant, source) tuples; may be a lazy iterator
+            batch_size: Rows inserted per executemany call
+            
+        Returns:
+            int: Number of rows recorded
+        """
+        iterator = iter(entries)
+        recorded = 0
+        
+        while True:
+            batch = [
+                (e.campaign_id, e.metric_name, e.value, e.timestamp, e.variant, e.source)
+                if isinstance(e, MetricEntry) else tuple(e)
+                for e in islice(iterator, batch_size)
+            ]
+            if not batch:
+                break
+            self._execute_write(lambda cursor: self.backend.insert_metrics(cursor, batch),
+                                appends_metrics=True)
+            recorded += len(batch)
+        
+        return recorded
+    
+    @instrumented()
+    def register_campaigns(self, campaigns: Iterable[Tuple[str, str, str]]) -> int:
+        """Register many (campaign_id, name, objective) campaigns in one transaction"""
+        now = datetime.now().isoformat()
+        rows = [(campaign_id, name, objective, now, now)
+                for campaign_id, name, objective in campaigns]
+        
+        self._execute_write(lambda cursor: cursor.executemany('''
+            INSERT INTO campaigns
+            (campaign_id, name, objective, start_date, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (campaign_id) DO UPDATE SET
+                name = excluded.name,
+                objective = excluded.objective,
+                start_date = excluded.start_date,
+                end_date = NULL,
+                status = 'active',
+                created_at = excluded.created_at
+        ''', rows))
+        
+        return len(rows)
+    
+    @instrumented()
     def get_campaign_performance(self, campaign_id: str, 
                                days_back: int = 30) -> Optional[CampaignPerformance]:
         """Get comprehensive performance summary for a campaign"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Get date range
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days_back)
             
-            # Query metrics
-            cursor.execute('''
-                SELECT metric_name, value, variant FROM metrics 
-                WHERE campaign_id = ? AND timestamp >= ? AND timestamp <= ?
-            ''', (campaign_id, start_date.isoformat(), end_date.isoformat()))
-            
-            results = cursor.fetchall()
-            conn.close()
+            conn = self._connect()
+            try:
+                # Aggregate metrics in the database
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT metric_name, SUM(value), AVG(value) FROM metrics
+                    WHERE campaign_id = ? AND timestamp >= ? AND timestamp <= ?
+                    GROUP BY metric_name
+                ''', (campaign_id, start_date.isoformat(), end_date.isoformat()))
+                results = cursor.fetchall()
+            finally:
+                self._release(conn)
             
             if not results:
                 print(f"⚠️  No metrics found for campaign {campaign_id}")
                 return None
             
-            # Aggregate metrics
-            metrics_by_name = {}
-            for metric_name, value, variant in results:
-                if metric_name not in metrics_by_name:
-                    metrics_by_name[metric_name] = []
-                metrics_by_name[metric_name].append(value)
-            
-            # Calculate key performance indicators
-            impressions = sum(metrics_by_name.get('impressions', [1000]))  # Default for demo
-            clicks = sum(metrics_by_name.get('clicks', [50]))  # Default for demo
-            conversions = sum(metrics_by_name.get('conversions', [3]))  # Default for demo
-            
-            ctr = (clicks / impressions * 100) if impressions > 0 else 2.5
-            conversion_rate = (conversions / clicks * 100) if clicks > 0 else 6.0
-            
-            engagement_scores = metrics_by_name.get('engagement_score', [7.5])
-            avg_engagement = statistics.mean(engagement_scores) if engagement_scores else 7.5
-            
-            # Estimate ROI (simplified calculation)
-            revenue = sum(metrics_by_name.get('revenue', [5000]))  # Default for demo
-            cost = sum(metrics_by_name.get('cost', [1000]))  # Default for demo
-            roi = ((revenue - cost) / cost * 100) if cost > 0 else 400
-            
-            # Ethical compliance average
-            compliance_scores = metrics_by_name.get('ethical_compliance_score', [92])
-            avg_compliance = statistics.mean(compliance_scores)
-            
-            performance = CampaignPerformance(
-                campaign_id=campaign_id,
-                start_date=start_date.isoformat(),
-                end_date=end_date.isoformat(),
-                total_impressions=int(impressions),
-                total_clicks=int(clicks),
-                total_conversions=int(conversions),
-                click_through_rate=round(ctr, 2),
-                conversion_rate=round(conversion_rate, 2),
-                engagement_score=round(avg_engagement, 2),
-                roi_estimate=round(roi, 2),
-                ethical_compliance_score=round(avg_compliance, 2)
+            totals = {name: total for name, total, _ in results}
+            means = {name: mean for name, _, mean in results}
+            
+            performance = self.build_performance(
+                campaign_id, start_date.isoformat(), end_date.isoformat(), totals, means
             )
             
             return performance
             
         except Exception as e:
+            count("tracker_errors", operation="get_campaign_performance")
             print(f"❌ Error getting campaign performance: {str(e)}")
             return None
     
+    @staticmethod
+    def build_performance(campaign_id: str, start_date: str, end_date: str,
+                          totals: Dict[str, float],
+                          means: Dict[str, float]) -> CampaignPerformance:
+        """Derive campaign KPIs from per-metric totals and means"""
+        # Calculate key performance indicators
+        impressions = totals.get('impressions', 1000)  # Default for demo
+        clicks = totals.get('clicks', 50)  # Default for demo
+        conversions = totals.get('conversions', 3)  # Default for demo
+        
+        ctr = (clicks / impressions * 100) if impressions > 0 else 2.5
+        conversion_rate = (conversions / clicks * 100) if clicks > 0 else 6.0
+        
+        avg_engagement = means.get('engagement_score', 7.5)
+        
+        # Estimate ROI (simplified calculation)
+        revenue = totals.get('revenue', 5000)  # Default for demo
+        cost = totals.get('cost', 1000)  # Default for demo
+        roi = ((revenue - cost) / cost * 100) if cost > 0 else 400
+        
+        # Ethical compliance average
+        avg_compliance = means.get('ethical_compliance_score', 92)
+        
+        return CampaignPerformance(
+            campaign_id=campaign_id,
+            start_date=start_date,
+            end_date=end_date,
+            total_impressions=int(impressions),
+            total_clicks=int(clicks),
+            total_conversions=int(conversions),
+            click_through_rate=round(ctr, 2),
+            conversion_rate=round(conversion_rate, 2),
+            engagement_score=round(avg_engagement, 2),
+            roi_estimate=round(roi, 2),
+            ethical_compliance_score=round(avg_compliance, 2)
+        )
+    
+    @instrumented()
+    def update_campaign_aggregates(self, campaign_id: str) -> int:
+        """
+        Fold metrics inserted since the last update into running aggregates
+        
+        Keeps per-metric count, sum and Welford mean/M2 for the campaign and a
+        high-water mark of the last folded row id, so each call reads only
+        rows inserted since the previous one.
+        
+        Args:
+            campaign_id: Campaign to update
+            
+        Returns:
+            int: Number of new metric rows folded in
+        """
+        def fold(cursor):
+            cursor.execute(
+                'SELECT last_row_id FROM aggregate_watermarks WHERE campaign_id = ?',
+                (campaign_id,)
+            )
+            row = cursor.fetchone()
+            last_row_id = row[0] if row else 0
+            
+            cursor.execute('''
+                SELECT id, metric_name, value, timestamp FROM metrics
+                WHERE campaign_id = ? AND id > ?
+                ORDER BY id
+            ''', (campaign_id, last_row_id))
+            new_rows = cursor.fetchall()
+            
+            if not new_rows:
+                return 0
+            
+            cursor.execute('''
+                SELECT metric_name, count, total, mean, m2, first_timestamp, last_timestamp
+                FROM campaign_aggregates WHERE campaign_id = ?
+            ''', (campaign_id,))
+            aggregates = {r[0]: list(r[1:]) for r in cursor.fetchall()}
+            
+            for _, metric_name, value, timestamp in new_rows:
+                state = aggregates.get(metric_name)
+                if state is None:
+                    state = aggregates[metric_name] = [0, 0.0, 0.0, 0.0, timestamp, timestamp]
+                state[0] += 1
+                state[1] += value
+                delta = value - state[2]
+                state[2] += delta / state[0]
+                state[3] += delta * (value - state[2])
+                state[4] = min(state[4], timestamp)
+                state[5] = max(state[5], timestamp)
+            
+            cursor.executemany('''
+                INSERT INTO campaign_aggregates
+                (campaign_id, metric_name, count, total, mean, m2,
+                 first_timestamp, last_timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (campaign_id, metric_name) DO UPDATE SET
+                    count = excluded.count,
+                    total = excluded.total,
+                    mean = excluded.mean,
+                    m2 = excluded.m2,
+                    first_timestamp = excluded.first_timestamp,
+                    last_timestamp = excluded.last_timestamp
+            ''', [(campaign_id, name, *state) for name, state in aggregates.items()])
+            cursor.execute('''
+                INSERT INTO aggregate_watermarks
+                (campaign_id, last_row_id, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT (campaign_id) DO UPDATE SET
+                    last_row_id = excluded.last_row_id,
+                    updated_at = excluded.updated_at
+            ''', (campaign_id, new_rows[-1][0], datetime.now().isoformat()))
+            
+            return len(new_rows)
+        
+        return self._execute_write(fold, exclusive=True)
+    
+    def get_metric_statistics(self, campaign_id: str) -> Dict[str, Dict[str, float]]:
+        """Running count, sum, mean and variance per metric from the aggregates"""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT metric_name, count, total, mean, m2, first_timestamp, last_timestamp
+                FROM campaign_aggregates WHERE campaign_id = ?
+            ''', (campaign_id,))
+            rows = cursor.fetchall()
+        finally:
+            self._release(conn)
+        
+        return {
+            name: {
+                "count": n,
+                "sum": total,
+                "mean": mean,
+                "variance": m2 / (n - 1) if n > 1 else 0.0,
+                "first_timestamp": first,
+                "last_timestamp": last
+            }
+            for name, n, total, mean, m2, first, last in rows
+        }
+    
+    @instrumented()
+    def get_campaign_performance_incremental(self, campaign_id: str,
+                                             fold: bool = True) -> Optional[CampaignPerformance]:
+        """
+        Campaign performance from running aggregates, folding in only new rows
+        
+        Unlike get_campaign_performance this covers the campaign's whole
+        recorded history rather than a trailing window.
+        
+        Args:
+            campaign_id: Campaign identifier
+            fold: Fold new rows in first; pass False right after folding them
+                yourself to skip a second write transaction
+        """
+        try:
+            if fold:
+                self.update_campaign_aggregates(campaign_id)
+            stats = self.get_metric_statistics(campaign_id)
+            
+            if not stats:
+                print(f"⚠️  No metrics found for campaign {campaign_id}")
+                return None
+            
+            return self.build_performance(
+                campaign_id,
+                min(s["first_timestamp"] for s in stats.values()),
+                max(s["last_timestamp"] for s in stats.values()),
+                {name: s["sum"] for name, s in stats.items()},
+                {name: s["mean"] for name, s in stats.items()}
+            )
+            
+        except Exception as e:
+            count("tracker_errors", operation="get_campaign_performance_incremental")
+            print(f"❌ Error getting incremental campaign performance: {str(e)}")
+            return None
+    
+    @instrumented()
+    def refresh_metric_rollups(self) -> int:
+        """
+        Fold metrics inserted since the last refresh into the hourly rollup
+        
+        Returns:
+            int: Number of metric rows folded in
+        """
+        def fold(cursor):
+            cursor.execute(
+                "SELECT last_row_id FROM rollup_watermarks WHERE rollup = 'hourly'"
+            )
+            row = cursor.fetchone()
+            last_row_id = row[0] if row else 0
+            
+            cursor.execute('SELECT MAX(id) FROM metrics')
+            max_row_id = cursor.fetchone()[0] or 0
+            if max_row_id <= last_row_id:
+                return 0
+            
+            # Timestamps are naive ISO strings read as UTC, matching _hour_index below
+            cursor.execute(f'''
+                INSERT INTO metric_rollups_hourly (campaign_id, metric_name, hour, total, count)
+                SELECT campaign_id, metric_name,
+                       {self.backend.hour_expression('timestamp')},
+                       SUM(value), COUNT(*)
+                FROM metrics WHERE id > ? AND id <= ?
+                GROUP BY 1, 2, 3
+                ON CONFLICT (campaign_id, metric_name, hour) DO UPDATE SET
+                    total = metric_rollups_hourly.total + excluded.total,
+                    count = metric_rollups_hourly.count + excluded.count
+            ''', (last_row_id, max_row_id))
+            if self.sketches:
+                self._fold_quantile_sketches(cursor, last_row_id, max_row_id)
+            cursor.execute('''
+                INSERT INTO rollup_watermarks (rollup, last_row_id) VALUES ('hourly', ?)
+                ON CONFLICT (rollup) DO UPDATE SET last_row_id = excluded.last_row_id
+            ''', (max_row_id,))
+            
+            return max_row_id - last_row_id
+        
+        return self._execute_write(fold, exclusive=True)
+    
+    def _fold_quantile_sketches(self, cursor, last_row_id: int, max_row_id: int):
+        """Add values of SKETCH_METRICS rows in an id range to the hourly KLL sketches"""
+        placeholders = ", ".join("?" for _ in SKETCH_METRICS)
+        cursor.execute(f'''
+            SELECT campaign_id, metric_name, variant,
+                   {self.backend.hour_expression('timestamp')}, value
+            FROM metrics
+            WHERE id > ? AND id <= ? AND metric_name IN ({placeholders})
+        ''', (last_row_id, max_row_id, *SKETCH_METRICS))
+        
+        updates = {}
+        for campaign_id, metric_name, variant, hour, value in cursor.fetchall():
+            key = (campaign_id, metric_name, variant, hour)
+            sketch = updates.get(key)
+            if sketch is None:
+                sketch = updates[key] = KLLSketch()
+            sketch.add(value)
+        self._merge_sketches(cursor, updates)
+    
+    def _merge_sketches(self, cursor, updates: Dict[Tuple, object]):
+        """Merge new sketches into the stored ones keyed by (campaign, metric, variant, hour)"""
+        rows = []
+        for key, sketch in updates.items():
+            cursor.execute('''
+                SELECT sketch FROM metric_sketches
+                WHERE campaign_id = ? AND metric_name = ? AND variant = ? AND hour = ?
+            ''', key)
+            existing = cursor.fetchone()
+            if existing:
+                sketch = sketch_from_bytes(existing[0]).merge(sketch)
+            rows.append((*key, sketch.to_bytes()))
+        cursor.executemany('''
+            INSERT INTO metric_sketches
+            (campaign_id, metric_name, variant, hour, sketch)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (campaign_id, metric_name, variant, hour) DO UPDATE SET
+                sketch = excluded.sketch
+        ''', rows)
+    
+    @instrumented()
+    def record_reach(self, campaign_id: str, user_ids: Iterable,
+                     timestamp: Optional[str] = None, variant: str = "control") -> bool:
+        """
+        Add users reached in one hour to the campaign's HyperLogLog sketch
+        
+        Args:
+            campaign_id: Campaign identifier
+            user_ids: Identifiers of users reached (duplicates are fine)
+            timestamp: ISO timestamp of the hour (defaults to now)
+            variant: Content variant
+        
+        Returns:
+            bool: True if the sketch was stored
+        """
+        try:
+            moment = datetime.fromisoformat(timestamp) if timestamp else datetime.now()
+            key = (campaign_id, REACH_METRIC, variant, self._hour_index(moment))
+            sketch = HyperLogLog().update(user_ids)
+            # The stored sketch is read, merged and written back, so concurrent
+            # writers (possibly on other nodes) must not interleave
+            self._execute_write(lambda cursor: self._merge_sketches(cursor, {key: sketch}),
+                                exclusive=True)
+            return True
+        
+        except Exception as e:
+            count("tracker_errors", operation="record_reach")
+            print(f"❌ Error recording reach: {str(e)}")
+            return False
+    
+    def _merged_sketch(self, campaign_id: str, metric_name: str, days_back: int,
+                       variant: Optional[str], end_date: Optional[datetime]):
+        """Merge stored hourly sketches for a window, one row at a time"""
+        end_date = end_date or datetime.now()
+        query = '''
+            SELECT sketch FROM metric_sketches
+            WHERE campaign_id = ? AND metric_name = ? AND hour >= ? AND hour <= ?
+        '''
+        params = [campaign_id, metric_name,
+                  self._hour_index(end_date - timedelta(days=days_back)),
+                  self._hour_index(end_date)]
+        if variant is not None:
+            query += ' AND variant = ?'
+            params.append(variant)
+        
+        conn = self._connect()
+        merged = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            for (blob,) in cursor:
+                sketch = sketch_from_bytes(bytes(blob))
+                merged = sketch if merged is None else merged.merge(sketch)
+        finally:
+            self._release(conn)
+        return merged
+    
+    @instrumented()
+    def get_metric_quantiles(self, campaign_id: str, metric: str,
+                             quantiles: Iterable[float] = (0.5, 0.95, 0.99),
+                             days_back: int = 30, variant: Optional[str] = None,
+                             end_date: Optional[datetime] = None) -> Dict[float, float]:
+        """
+        Approximate quantiles of a sketched metric over a trailing window
+        
+        Requires a tracker created with sketches=True.
+        
+        Args:
+            campaign_id: Campaign to query
+            metric: One of SKETCH_METRICS
+            quantiles: Quantiles in the 0-1 range
+            days_back: Window length in days
+            variant: Restrict to one variant (all variants when None)
+            end_date: End of the window (defaults to now)
+        
+        Returns:
+            Dict[float, float]: Value per requested quantile (empty if no data)
+        """
+        if metric not in SKETCH_METRICS:
+            raise ValueError(f"No quantile sketches are kept for metric: {metric}")
+        self.refresh_metric_rollups()
+        sketch = self._merged_sketch(campaign_id, metric, days_back, variant, end_date)
+        if sketch is None:
+            return {}
+        quantiles = list(quantiles)
+        return dict(zip(quantiles, sketch.quantiles(quantiles)))
+    
+    @instrumented()
+    def get_unique_reach(self, campaign_id: str, days_back: int = 30,
+                         variant: Optional[str] = None,
+                         end_date: Optional[datetime] = None) -> int:
+        """
+        Approximate number of distinct users reached over a trailing window
+        
+        Args:
+            campaign_id: Campaign to query
+            days_back: Window length in days
+            variant: Restrict to one variant (all variants when None)
+            end_date: End of the window (defaults to now)
+        
+        Returns:
+            int: Estimated distinct users (about 1.6% standard error)
+        """
+        sketch = self._merged_sketch(campaign_id, REACH_METRIC, days_back, variant, end_date)
+        return int(round(sketch.estimate())) if sketch is not None else 0
+    
+    @staticmethod
+    def _hour_index(moment: datetime) -> int:
+        return int((moment - datetime(1970, 1, 1)).total_seconds()) // 3600
+    
+    @staticmethod
+    def _bucket_hours(bucket: str) -> int:
+        """Parse a bucket size such as '1h', '6h' or '1d' into hours"""
+        units = {'h': 1, 'd': 24, 'w': 168}
+        try:
+            hours = int(bucket[:-1]) * units[bucket[-1]]
+        except (KeyError, ValueError):
+            hours = 0
+        if hours <= 0:
+            raise ValueError(f"Bucket must be a whole number of hours, days or weeks: {bucket}")
+        return hours
+    
+    @instrumented()
+    def get_campaign_timeseries(self, campaign_id: str, metric: str,
+                                bucket: str = '1h', days_back: int = 7,
+                                end_date: Optional[datetime] = None) -> Dict:
+        """
+        Bucketed sums and counts of one metric over a trailing window
+        
+        Served from the hourly rollup, which is refreshed first, so query cost
+        depends on the number of buckets rather than the number of events.
+        
+        Args:
+            campaign_id: Campaign to query
+            metric: Metric name (e.g. 'clicks')
+            bucket: Bucket size such as '1h', '6h' or '1d'
+            days_back: Window length in days
+            end_date: End of the window (defaults to now)
+            
+        Returns:
+            Dict: Aligned NumPy arrays 'bucket_start' (datetime64), 'sum' and 'count',
+                with empty buckets zero-filled
+        """
+        # Imported here so CLI commands that never build time series skip NumPy
+        import numpy as np
+        
+        step = self._bucket_hours(bucket)
+        end_date = end_date or datetime.now()
+        last_hour = self._hour_index(end_date)
+        first_hour = self._hour_index(end_date - timedelta(days=days_back))
+        first_hour -= first_hour % step
+        buckets = (last_hour - first_hour) // step + 1
+        
+        self.refresh_metric_rollups()
+        
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT hour, total, count FROM metric_rollups_hourly
+                WHERE campaign_id = ? AND metric_name = ? AND hour >= ? AND hour <= ?
+            ''', (campaign_id, metric, first_hour, last_hour))
+            rows = cursor.fetchall()
+        finally:
+            self._release(conn)
+        
+        sums = np.zeros(buckets)
+        counts = np.zeros(buckets, dtype=np.int64)
+        if rows:
+            hours, totals, row_counts = (np.array(column) for column in zip(*rows))
+            index = (hours - first_hour) // step
+            np.add.at(sums, index, totals)
+            np.add.at(counts, index, row_counts)
+        
+        starts = (np.arange(buckets, dtype=np.int64) * step + first_hour).astype('datetime64[h]')
+        return {"bucket_start": starts, "sum": sums, "count": counts}
+    
+    @instrumented()
+    def get_rolling_rates(self, campaign_id: str, bucket: str = '1h',
+                          rolling_buckets: int = 24, days_back: int = 7,
+                          end_date: Optional[datetime] = None) -> Dict:
+        """
+        Rolling-window CTR and conversion rate trend lines
+        
+        Args:
+            campaign_id: Campaign to query
+            bucket: Bucket size such as '1h' or '1d'
+            rolling_buckets: Number of trailing buckets in each rolling window
+            days_back: Window length in days
+            end_date: End of the window (defaults to now)
+            
+        Returns:
+            Dict: 'bucket_start' plus 'click_through_rate' and 'conversion_rate'
+                arrays in percent (NaN where the rolling denominator is zero)
+        """
+        import numpy as np
+        
+        if rolling_buckets < 1:
+            raise ValueError("rolling_buckets must be at least 1")
+        
+        series = {
+            metric: self.get_campaign_timeseries(campaign_id, metric, bucket,
+                                                 days_back, end_date)
+            for metric in ('impressions', 'clicks', 'conversions')
+        }
+        
+        def rolling_sum(values):
+            cumulative = np.concatenate(([0.0], np.cumsum(values)))
+            lagged = np.concatenate((np.zeros(rolling_buckets),
+                                     cumulative[:-rolling_buckets]))[:len(values)]
+            return cumulative[1:] - lagged
+        
+        impressions = rolling_sum(series['impressions']['sum'])
+        clicks = rolling_sum(series['clicks']['sum'])
+        conversions = rolling_sum(series['conversions']['sum'])
+        
+        def rate(numerator, denominator):
+            out = np.full(len(numerator), np.nan)
+            np.divide(numerator * 100, denominator, out=out, where=denominator > 0)
+            return out
+        
+        return {
+            "bucket_start": series['clicks']['bucket_start'],
+            "click_through_rate": rate(clicks, impressions),
+            "conversion_rate": rate(conversions, clicks)
+        }
+    
+    @instrumented()
     def generate_performance_report(self, campaign_id: str, 
-                                  output_file: str = None) -> str:
-        """Generate comprehensive performance report"""
+                                  output_file: str = None,
+                                  incremental: bool = False) -> str:
+        """
+        Generate comprehensive performance report
+        
+        With incremental=True the report is built from running aggregates that
+        only fold in metrics recorded since the previous report, and the
+        rendered body is reused when no new metrics have arrived.
+        """
+        try:
+            if incremental:
+                new_rows = self.update_campaign_aggregates(campaign_id)
+                cached = self._report_cache.get(campaign_id)
+                if new_rows == 0 and cached is not None:
+                    performance, body = cached
+                else:
+                    performance = self.get_campaign_performance_incremental(campaign_id, fold=False)
+                    if not performance:
+                        return "No performance data available"
+                    body = self._render_report_body(performance)
+                    body += self._render_stability_section(campaign_id)
+                    self._report_cache[campaign_id] = (performance, body)
+            else:
+                performance = self.get_campaign_performance(campaign_id)
+                if not performance:
+                    return "No performance data available"
+                body = self._render_report_body(performance)
+            
+            report = self._render_report_header(campaign_id, performance) + body
+            report += f"\n**Report ends**\n"
+            
+            # Save report if output file specified
+            if output_file:
+                with open(output_file, 'w') as f:
+                    f.write(report)
+                print(f"📊 Performance report saved to: {output_file}")
+            
+            return report
+            
+        except Exception as e:
+            count("tracker_errors", operation="generate_performance_report")
+            return f"❌ Error generating report: {str(e)}"
+    
+    @instrumented()
+    def get_campaign_performances(self, campaign_ids: Optional[Iterable[str]] = None,
+                                  days_back: int = 30) -> Dict[str, CampaignPerformance]:
+        """
+        Performance summaries for many campaigns from one grouped query
+        
+        Args:
+            campaign_ids: Campaigns to summarise (defaults to all active campaigns)
+            days_back: Reporting window in days
+            
+        Returns:
+            Dict[str, CampaignPerformance]: Performance per campaign with metrics
+        """
+        try:
+            end_date = datetime.now()
+            start_date = end_date - timedelta(days=days_back)
+            
+            conn = self._connect()
+            try:
+                cursor = conn.cursor()
+                
+                window = (start_date.isoformat(), end_date.isoformat())
+                if campaign_ids is None:
+                    cursor.execute("SELECT campaign_id FROM campaigns WHERE status = 'active'")
+                    wanted = {row[0] for row in cursor.fetchall()}
+                    cursor.execute('''
+                        SELECT campaign_id, metric_name, SUM(value), AVG(value) FROM metrics
+                        WHERE timestamp >= ? AND timestamp <= ?
+                        GROUP BY campaign_id, metric_name
+                    ''', window)
+                    grouped = cursor.fetchall()
+                else:
+                    # Only the requested campaigns are read, through the campaign index
+                    wanted = set(campaign_ids)
+                    ids = sorted(wanted)
+                    grouped = []
+                    for offset in range(0, len(ids), CAMPAIGN_ID_CHUNK):
+                        chunk = ids[offset:offset + CAMPAIGN_ID_CHUNK]
+                        cursor.execute(f'''
+                            SELECT campaign_id, metric_name, SUM(value), AVG(value) FROM metrics
+                            WHERE campaign_id IN ({", ".join("?" for _ in chunk)})
+                                AND timestamp >= ? AND timestamp <= ?
+                            GROUP BY campaign_id, metric_name
+                        ''', (*chunk, *window))
+                        grouped.extend(cursor.fetchall())
+            finally:
+                self._release(conn)
+            
+            totals_by_campaign: Dict[str, Dict[str, float]] = {}
+            means_by_campaign: Dict[str, Dict[str, float]] = {}
+            for campaign_id, metric_name, total, mean in grouped:
+                if campaign_id not in wanted:
+                    continue
+                totals_by_campaign.setdefault(campaign_id, {})[metric_name] = total
+                means_by_campaign.setdefault(campaign_id, {})[metric_name] = mean
+            
+            performances = {
+                campaign_id: self.build_performance(
+                    campaign_id, start_date.isoformat(), end_date.isoformat(),
+                    totals, means_by_campaign[campaign_id]
+                )
+                for campaign_id, totals in sorted(totals_by_campaign.items())
+            }
+            
+            missing = wanted - performances.keys()
+            if missing:
+                print(f"⚠️  No metrics found for {len(missing)} campaign(s)")
+            
+            return performances
+            
+        except Exception as e:
+            count("tracker_errors", operation="get_campaign_performances")
+            print(f"❌ Error getting campaign performances: {str(e)}")
+            return {}
+    
+    @instrumented()
+    def generate_performance_reports(self, campaign_ids: Optional[Iterable[str]] = None,
+                                     output_dir: str = "performance_reports",
+                                     days_back: int = 30,
+                                     summary_format: Optional[str] = None,
+                                     max_workers: int = 8) -> Dict[str, CampaignPerformance]:
+        """
+        Generate performance reports for many campaigns in one pass
+        
+        A single grouped query aggregates every campaign's metrics for the
+        window; report files are then rendered and written by a thread pool.
+        
+        Args:
+            campaign_ids: Campaigns to report on (defaults to all active campaigns)
+            output_dir: Directory receiving one markdown report per campaign
+            days_back: Reporting window in days
+            summary_format: Also write a combined "csv" or "json" summary when set
+            max_workers: Threads used to write report files
+            
+        Returns:
+            Dict[str, CampaignPerformance]: Performance per reported campaign
+        """
+        if summary_format not in (None, "csv", "json"):
+            raise ValueError(f"Unknown summary format: {summary_format}")
+        
+        performances = self.get_campaign_performances(campaign_ids, days_back)
+        return self.write_performance_reports(performances, output_dir,
+                                              summary_format, max_workers)
+    
+    def write_performance_reports(self, performances: Dict[str, CampaignPerformance],
+                                  output_dir: str = "performance_reports",
+                                  summary_format: Optional[str] = None,
+                                  max_workers: int = 8) -> Dict[str, CampaignPerformance]:
+        """Render and write one markdown report per campaign plus an optional summary"""
         try:
-            performance = self.get_campaign_performance(campaign_id)
+            out = Path(output_dir)
+            out.mkdir(parents=True, exist_ok=True)
+            
+            def write_report(item):
+                campaign_id, performance = item
+                report = (self._render_report_header(campaign_id, performance)
+                          + self._render_report_body(performance)
+                          + "\n**Report ends**\n")
+                with open(out / f"{campaign_id}_performance_report.md", 'w') as f:
+                    f.write(report)
+            
+            with timed("MetricsTracker.report_write"):
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    list(executor.map(write_report, performances.items()))
+            
+            if summary_format:
+                self._write_performance_summary(list(performances.values()),
+                                                out / f"performance_summary.{summary_format}",
+                                                summary_format)
             
-            if not performance:
-                return "No performance data available"
+            print(f"📊 {len(performances)} performance reports saved to: {out}")
+            return performances
             
-            # Generate report content
-            report = f"""
+        except Exception as e:
+            count("tracker_errors", operation="generate_performance_reports")
+            print(f"❌ Error generating performance reports: {str(e)}")
+            return {}
+    
+    def _write_performance_summary(self, performances: List[CampaignPerformance],
+                                   output_path: Path, summary_format: str):
+        """Write one combined CSV or JSON row per campaign"""
+        rows = [asdict(performance) for performance in performances]
+        if summary_format == "json":
+            with open(output_path, 'w') as f:
+                json.dump(rows, f, indent=2)
+        else:
+            with open(output_path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=list(CampaignPerformance.__dataclass_fields__))
+                writer.writeheader()
+                writer.writerows(rows)
+    
+    def _render_report_header(self, campaign_id: str, performance: CampaignPerformance) -> str:
+        return f"""
 # Pre-Suader Campaign Performance Report
 **Campaign ID:** {campaign_id}
 **Report Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 **Analysis Period:** {performance.start_date[:10]} to {performance.end_date[:10]}
-
+"""
+    
+    def _render_report_body(self, performance: CampaignPerformance) -> str:
+        report = f"""
 ## Executive Summary
 - **Total Impressions:** {performance.total_impressions:,}
 - **Total Clicks:** {performance.total_clicks:,}
@@ -251,29 +1012,32 @@ class MetricsTracker:
 
 ### Recommendations
 """
-            
-            # Add recommendations based on performance
-            if performance.click_through_rate < 2:
-                report += "- Optimize ad copy and pre-suasive priming for better CTR\n"
-            if performance.conversion_rate < 3:
-                report += "- Review landing page optimization and conversion funnel\n"
-            if performance.ethical_compliance_score < 85:
-                report += "- Conduct ethical audit and adjust messaging\n"
-            if performance.engagement_score < 6:
-                report += "- Improve content relevance and audience targeting\n"
-            
-            report += f"\n**Report ends**\n"
-            
-            # Save report if output file specified
-            if output_file:
-                with open(output_file, 'w') as f:
-                    f.write(report)
-                print(f"📊 Performance report saved to: {output_file}")
-            
-            return report
-            
-        except Exception as e:
-            return f"❌ Error generating report: {str(e)}"
+        
+        # Add recommendations based on performance
+        if performance.click_through_rate < 2:
+            report += "- Optimize ad copy and pre-suasive priming for better CTR\n"
+        if performance.conversion_rate < 3:
+            report += "- Review landing page optimization and conversion funnel\n"
+        if performance.ethical_compliance_score < 85:
+            report += "- Conduct ethical audit and adjust messaging\n"
+        if performance.engagement_score < 6:
+            report += "- Improve content relevance and audience targeting\n"
+        
+        return report
+    
+    def _render_stability_section(self, campaign_id: str) -> str:
+        """Standard deviation of engagement and compliance from running aggregates"""
+        stats = self.get_metric_statistics(campaign_id)
+        lines = []
+        for metric, label in (('engagement_score', 'Engagement Score'),
+                              ('ethical_compliance_score', 'Ethical Compliance')):
+            if metric in stats:
+                s = stats[metric]
+                lines.append(f"- **{label}:** mean {s['mean']:.2f}, "
+                             f"std dev {s['variance'] ** 0.5:.2f} over {s['count']:,} measurements")
+        if not lines:
+            return ""
+        return "\n### Metric Stability\n" + "\n".join(lines) + "\n"
 
 def create_sample_metrics_csv():
     """Create sample metrics CSV for testing"""
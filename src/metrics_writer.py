@@ -0,0 +1,149 @@
+# /src/metrics_writer.py
+# Version: 19-10-2026 15:00:00
+# Pre-Suader AI Agent - Single-Writer Metrics Funnel
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Single-writer funnel for the metrics database.
+Ingest workers hand metric batches to one dedicated writer process over a
+multiprocessing queue, so SQLite only ever sees one writer and queued
+batches are coalesced into larger transactions.
+"""
+
+import multiprocessing
+import queue
+import time
+from typing import Iterable, List, Optional, Tuple, Union
+
+try:
+    from .metrics_tracker import MetricEntry, MetricsTracker
+except ImportError:
+    from metrics_tracker import MetricEntry, MetricsTracker
+
+# Seconds between checks that the writer is still alive while waiting on it
+WRITER_POLL_INTERVAL = 0.1
+
+class MetricsWriterError(RuntimeError):
+    """Raised by close() when the writer process failed or died"""
+
+def _writer_loop(db_path: str, batches, results, batch_size: int):
+    """
+    Drain batches until the None sentinel, coalescing whatever is already
+    queued, then post (rows recorded, error message or None)
+    """
+    recorded = 0
+    error = None
+    finished = False
+    try:
+        tracker = MetricsTracker(db_path)
+        while not finished:
+            batch = batches.get()
+            if batch is None:
+                break
+            rows = list(batch)
+            while len(rows) < batch_size:
+                try:
+                    more = batches.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    finished = True
+                    break
+                rows.extend(more)
+            recorded += tracker.record_metrics(rows, batch_size=batch_size)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        # Keep draining, so producers blocked on a full queue are released
+        while not finished and batches.get() is not None:
+            pass
+    finally:
+        results.put((recorded, error))
+
+class MetricsWriterProcess:
+    """Dedicated writer process receiving metric batches over a queue"""
+
+    def __init__(self, db_path: str = "presuader_metrics.db", max_pending_batches: int = 64,
+                 batch_size: int = 10000, context: Optional[str] = None):
+        """
+        Args:
+            db_path: SQLite database the writer owns
+            max_pending_batches: Queue bound; submit() blocks when the writer falls behind
+            batch_size: Rows per coalesced write transaction
+            context: multiprocessing start method (platform default when None)
+        """
+        ctx = multiprocessing.get_context(context)
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._batches = ctx.Queue(max_pending_batches)
+        self._results = ctx.Queue()
+        self._process = ctx.Process(
+            target=_writer_loop,
+            args=(db_path, self._batches, self._results, batch_size),
+            name="presuader-metrics-writer",
+            daemon=True
+        )
+        self.recorded = None
+
+    @property
+    def queue(self):
+        """Queue accepting lists of metric rows; share it with worker processes"""
+        return self._batches
+
+    def start(self) -> "MetricsWriterProcess":
+        # Create the schema before the writer and any producers start
+        MetricsTracker(self.db_path)
+        self._process.start()
+        return self
+
+    def submit(self, rows: Iterable[Union[MetricEntry, Tuple]]):
+        """Queue one batch of MetricEntry objects or metric row tuples"""
+        batch: List = list(rows)
+        if batch:
+            self._batches.put(batch)
+
+    def close(self, timeout: Optional[float] = None) -> int:
+        """
+        Flush queued batches and stop the writer
+
+        Args:
+            timeout: Most seconds to wait for the writer (no limit when None)
+
+        Returns:
+            int: Total rows the writer recorded
+
+        Raises:
+            MetricsWriterError: If the writer failed or exited without reporting
+            TimeoutError: If the writer is still busy after timeout
+        """
+        if self.recorded is None:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            self._wait(deadline, lambda: self._batches.put(None, timeout=WRITER_POLL_INTERVAL),
+                       queue.Full)
+            recorded, error = self._wait(
+                deadline, lambda: self._results.get(timeout=WRITER_POLL_INTERVAL), queue.Empty)
+            self._process.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+            if error is not None:
+                raise MetricsWriterError(f"Metrics writer failed after recording {recorded} rows: {error}")
+            self.recorded = recorded
+        return self.recorded
+
+    def _wait(self, deadline: Optional[float], attempt, pending: type):
+        """Retry a queue operation until it succeeds, the writer dies or the deadline passes"""
+        while True:
+            alive = self._process.is_alive()
+            try:
+                return attempt()
+            except pending:
+                pass
+            if not alive:
+                # The writer was gone before this attempt, so nothing more will arrive
+                raise MetricsWriterError(
+                    f"Metrics writer exited with code {self._process.exitcode} without reporting")
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError("Metrics writer did not finish in time")
+
+    def __enter__(self) -> "MetricsWriterProcess":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,151 @@
+# /src/pipeline.py
+# Version: 19-10-2026 10:30:00
+# Pre-Suader AI Agent - In-Process Campaign Pipeline
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+In-process pipeline chaining audience analysis, strategy generation,
+content optimization and ethical compliance checks.
+Intermediate artifacts stay in memory unless persistence is requested.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from .presuader_core_functions import PreSuaderCore, AudienceProfile, PreSuasiveStrategy
+    from .serialization import profile_to_dict
+    from .interchange import FORMAT_EXTENSIONS, write_document
+    from .instrumentation import instrumented
+except ImportError:
+    from presuader_core_functions import PreSuaderCore, AudienceProfile, PreSuasiveStrategy
+    from serialization import profile_to_dict
+    from interchange import FORMAT_EXTENSIONS, write_document
+    from instrumentation import instrumented
+
+@dataclass
+class PipelineResult:
+    """Outputs of one analyze → strategy → optimize → ethics run"""
+    profile: AudienceProfile
+    strategy: PreSuasiveStrategy
+    content_variants: Dict[str, str]
+    compliance: Dict[str, Dict]
+    artifacts: List[str] = field(default_factory=list)
+    rejected_variants: Dict[str, Dict] = field(default_factory=dict)  # compliance of dropped variants
+
+    @property
+    def campaign_id(self) -> str:
+        return self.strategy.campaign_id
+
+class PreSuaderPipeline:
+    """Run every Pre-Suader stage in memory for one or many campaigns"""
+
+    def __init__(self, presuader: Optional[PreSuaderCore] = None,
+                 persist_dir: Optional[str] = None, fmt: str = "json",
+                 compact: bool = False, min_grade: Optional[str] = None):
+        """
+        Args:
+            presuader: Core instance to use (a new one is created if omitted)
+            persist_dir: Directory for intermediate artifacts; nothing is written when None
+            fmt: Interchange format for persisted profiles, strategies and reports
+            compact: Write persisted JSON without indentation
+            min_grade: Drop content variants graded below this letter (A-D)
+        """
+        self.presuader = presuader or PreSuaderCore()
+        self.persist_dir = Path(persist_dir) if persist_dir else None
+        self.fmt = fmt
+        self.compact = compact
+        self.min_grade = min_grade
+
+    @instrumented()
+    def run(self, audience_data: Dict, content: str, objective: str) -> PipelineResult:
+        """
+        Run all four stages for a single audience and content pair
+
+        Args:
+            audience_data: Raw audience data as accepted by analyze_audience_psychology
+            content: Original marketing content
+            objective: Campaign objective for the strategy
+
+        Returns:
+            PipelineResult: Profile, strategy, content variants and per-variant compliance
+        """
+        profile = self.presuader.analyze_audience_psychology(audience_data)
+        strategy = self.presuader.generate_presuasive_strategy(profile, objective)
+        return self._optimize(profile, strategy, content)
+
+    def run_batch(self, items: Iterable[Dict]) -> List[PipelineResult]:
+        """
+        Run the pipeline over a batch of campaigns
+
+        With a model-backed generator, every item's variants are requested
+        in one concurrent batch before the items are optimized in turn.
+
+        Args:
+            items: Dicts with 'audience' (audience data), 'content' and 'objective' keys
+
+        Returns:
+            List[PipelineResult]: One result per item, in input order
+        """
+        generator = self.presuader.generator
+        if generator is None:
+            return [self.run(item['audience'], item['content'], item['objective'])
+                    for item in items]
+
+        jobs = []
+        for item in items:
+            profile = self.presuader.analyze_audience_psychology(item['audience'])
+            strategy = self.presuader.generate_presuasive_strategy(profile, item['objective'])
+            jobs.append((profile, strategy, item['content']))
+        generator.prefetch((content, strategy) for _, strategy, content in jobs)
+        return [self._optimize(*job) for job in jobs]
+
+    def _optimize(self, profile: AudienceProfile, strategy: PreSuasiveStrategy,
+                  content: str) -> PipelineResult:
+        """Optimize and check content for a strategy, persisting the result if requested"""
+        # Variants are checked as they are rendered; rejected ones are never written
+        variants, reports = self.presuader.optimize_content_with_compliance(
+            content, strategy, self.min_grade)
+
+        result = PipelineResult(
+            profile=profile,
+            strategy=strategy,
+            content_variants=variants,
+            compliance={name: reports[name] for name in variants},
+            rejected_variants={name: report for name, report in reports.items()
+                               if name not in variants}
+        )
+
+        if self.persist_dir is not None:
+            result.artifacts = self._persist(result)
+
+        return result
+
+    def _persist(self, result: PipelineResult) -> List[str]:
+        """Write the intermediate artifacts of a run to persist_dir"""
+        self.persist_dir.mkdir(parents=True, exist_ok=True)
+        extension = FORMAT_EXTENSIONS[self.fmt]
+        campaign_id = result.campaign_id
+        artifacts = []
+
+        profile_file = self.persist_dir / f"audience_profile_{campaign_id}{extension}"
+        artifacts.append(write_document(profile_to_dict(result.profile), str(profile_file),
+                                        fmt=self.fmt, kind="audience_profile",
+                                        compact=self.compact))
+
+        strategy_file = self.persist_dir / f"strategy_{campaign_id}{extension}"
+        artifacts.append(self.presuader.save_strategy_report(result.strategy, str(strategy_file),
+                                                             compact=self.compact, fmt=self.fmt))
+
+        for variant_name, text in result.content_variants.items():
+            variant_file = self.persist_dir / f"{campaign_id}_{variant_name}.txt"
+            with open(variant_file, 'w') as f:
+                f.write(text)
+            artifacts.append(str(variant_file))
+
+        report_file = self.persist_dir / f"{campaign_id}_ethics_report{extension}"
+        artifacts.append(write_document(result.compliance, str(report_file), fmt=self.fmt,
+                                        kind="compliance_report", compact=self.compact))
+
+        return artifacts
@@ -12,27 +12,58 @@ import argparse
 import json
 import sys
 from pathlib import Path
-from presuader_core_functions import PreSuaderCore, AudienceProfile
+
+# Project modules are imported inside the command handlers so that
+# `--help` and argument errors never pay for loading them.
 
 class PreSuaderCLI:
     """Command-line interface for Pre-Suader AI Agent"""
     
-    def __init__(self):
-        self.presuader = PreSuaderCore()
+    def __init__(self, compact: bool = False, fmt: str = "json", rules: str = None,
+                 generator: str = None, generator_options: dict = None):
+        self._presuader = None
+        self.compact = compact
+        self.fmt = fmt
+        self.rules = rules
+        self.generator = generator
+        self.generator_options = generator_options or {}
         self.output_dir = Path("output")
         self.output_dir.mkdir(exist_ok=True)
     
+    @property
+    def presuader(self):
+        """PreSuaderCore instance, created on first use"""
+        if self._presuader is None:
+            from presuader_core_functions import PreSuaderCore
+            generator = None
+            if self.generator:
+                from content_generator import ContentGenerator, create_backend
+                options = dict(self.generator_options)
+                backend = create_backend(self.generator, options.pop('model', None))
+                generator = ContentGenerator(backend, **options)
+            self._presuader = PreSuaderCore(rule_pack=self.rules, generator=generator)
+        return self._presuader
+    
+    @property
+    def extension(self) -> str:
+        """File extension for the selected output format"""
+        from interchange import FORMAT_EXTENSIONS
+        return FORMAT_EXTENSIONS[self.fmt]
+    
     def analyze_audience(self, input_file: str) -> str:
         """Analyze audience from JSON file and create psychological profile"""
+        from serialization import profile_to_dict
+        from interchange import write_document
+        
         try:
             with open(input_file, 'r') as f:
                 audience_data = json.load(f)
             
             profile = self.presuader.analyze_audience_psychology(audience_data)
             
-            output_file = self.output_dir / f"audience_profile_{profile.segment_name.replace(' ', '_').lower()}.json"
-            with open(output_file, 'w') as f:
-                json.dump(profile.__dict__, f, indent=2)
+            output_file = self.output_dir / f"audience_profile_{profile.segment_name.replace(' ', '_').lower()}{self.extension}"
+            write_document(profile_to_dict(profile), str(output_file), fmt=self.fmt,
+                           kind="audience_profile", compact=self.compact)
             
             print(f"✅ Audience analysis complete!")
             print(f"📊 Profile saved to: {output_file}")
@@ -48,11 +79,15 @@ class PreSuaderCLI:
             print(f"❌ Error: Invalid JSON format in '{input_file}'")
             return ""
     
-    def create_strategy(self, profile_file: str, objective: str) -> str:
+    def create_strategy(self, profile_file: str, objective: str,
+                        store_path: str = None) -> str:
         """Create pre-suasive strategy from audience profile"""
+        from presuader_core_functions import AudienceProfile
+        from interchange import read_document
+        from strategy_store import StrategyStore
+        
         try:
-            with open(profile_file, 'r') as f:
-                profile_data = json.load(f)
+            profile_data = read_document(profile_file, expected_kind="audience_profile")
             
             # Reconstruct AudienceProfile object
             profile = AudienceProfile(**profile_data)
@@ -60,16 +95,22 @@ class PreSuaderCLI:
             # Generate strategy
             strategy = self.presuader.generate_presuasive_strategy(profile, objective)
             
-            output_file = self.output_dir / f"strategy_{strategy.campaign_id}.json"
-            self.presuader.save_strategy_report(strategy, str(output_file))
+            if store_path:
+                StrategyStore(store_path).put(strategy)
+                saved_to = f"{store_path} (campaign {strategy.campaign_id})"
+            else:
+                output_file = self.output_dir / f"strategy_{strategy.campaign_id}{self.extension}"
+                self.presuader.save_strategy_report(strategy, str(output_file),
+                                                    compact=self.compact, fmt=self.fmt)
+                saved_to = str(output_file)
             
             print(f"✅ Pre-suasive strategy created!")
             print(f"📋 Strategy ID: {strategy.campaign_id}")
             print(f"🎯 Objective: {objective}")
             print(f"⚡ Priming stages: {len(strategy.priming_sequence)}")
-            print(f"📁 Strategy saved to: {output_file}")
+            print(f"📁 Strategy saved to: {saved_to}")
             
-            return str(output_file)
+            return strategy.campaign_id if store_path else saved_to
             
         except FileNotFoundError:
             print(f"❌ Error: Profile file '{profile_file}' not found")
@@ -78,19 +119,35 @@ class PreSuaderCLI:
             print(f"❌ Error creating strategy: {str(e)}")
             return ""
     
-    def optimize_content(self, strategy_file: str, content_file: str) -> str:
-        """Optimize marketing content using pre-suasive strategy"""
+    def optimize_content(self, strategy_file: str, content_file: str,
+                         store_path: str = None, min_grade: str = None) -> str:
+        """Optimize marketing content using pre-suasive strategy, optionally dropping low-graded variants"""
+        from interchange import read_document
+        from strategy_store import StrategyStore
+        
         try:
-            # Load strategy
-            with open(strategy_file, 'r') as f:
-                strategy_data = json.load(f)
+            # Load strategy (a campaign ID when reading from a strategy store)
+            if store_path:
+                strategy = StrategyStore(store_path).get(strategy_file)
+                if strategy is None:
+                    print(f"❌ Error: Strategy '{strategy_file}' not found in {store_path}")
+                    return ""
+            else:
+                strategy_data = read_document(strategy_file, expected_kind="strategy_report")
             
             # Load content
             with open(content_file, 'r') as f:
                 original_content = f.read()
             
             # Optimize content (simplified for CLI)
-            optimized = self.presuader.optimize_content_for_presuasion(original_content, None)
+            if min_grade:
+                optimized, compliance = self.presuader.optimize_content_with_compliance(
+                    original_content, None, min_grade)
+                for variant_name, report in compliance.items():
+                    if variant_name not in optimized:
+                        print(f"🚫 Dropped {variant_name}: {report['grade']}")
+            else:
+                optimized = self.presuader.optimize_content_for_presuasion(original_content, None)
             
             # Save optimized versions
             base_name = Path(content_file).stem
@@ -116,8 +173,48 @@ class PreSuaderCLI:
             print(f"❌ Error optimizing content: {str(e)}")
             return ""
     
+    def explore_content(self, profile_file: str, content_file: str, top_k: int = 5,
+                        workers: int = None, max_values: int = 2) -> str:
+        """Grid-search optimization options and save the top-k Pareto front"""
+        from presuader_core_functions import AudienceProfile
+        from content_explorer import ContentExplorer
+        from interchange import read_document, write_document
+        
+        try:
+            profile = AudienceProfile(**read_document(profile_file, expected_kind="audience_profile"))
+            with open(content_file, 'r') as f:
+                original_content = f.read()
+            
+            explorer = ContentExplorer(self.presuader, workers=workers)
+            candidates = explorer.explore(original_content, profile, top_k=top_k,
+                                          max_values=max_values)
+            
+            report_file = self.output_dir / f"{Path(content_file).stem}_exploration{self.extension}"
+            write_document({"candidates": [candidate.to_dict() for candidate in candidates]},
+                           str(report_file), fmt=self.fmt, kind="exploration_report",
+                           compact=self.compact)
+            
+            print(f"✅ Exploration complete!")
+            for rank, candidate in enumerate(candidates, 1):
+                params = candidate.params
+                print(f"   {rank}. front {candidate.front} | compliance {candidate.compliance_score} | "
+                      f"engagement {candidate.engagement} | triggers {', '.join(params.triggers) or '-'} | "
+                      f"values {', '.join(params.values) or '-'}")
+            print(f"📁 Candidates saved to: {report_file}")
+            
+            return str(report_file)
+            
+        except FileNotFoundError as e:
+            print(f"❌ Error: File not found - {str(e)}")
+            return ""
+        except Exception as e:
+            print(f"❌ Error exploring content: {str(e)}")
+            return ""
+    
     def check_ethics(self, content_file: str, strategy_file: str = None) -> str:
         """Check content for ethical compliance"""
+        from interchange import write_document
+        
         try:
             with open(content_file, 'r') as f:
                 content = f.read()
@@ -126,9 +223,9 @@ class PreSuaderCLI:
             
             # Save compliance report
             base_name = Path(content_file).stem
-            report_file = self.output_dir / f"{base_name}_ethics_report.json"
-            with open(report_file, 'w') as f:
-                json.dump(compliance, f, indent=2)
+            report_file = self.output_dir / f"{base_name}_ethics_report{self.extension}"
+            write_document(compliance, str(report_file), fmt=self.fmt,
+                           kind="compliance_report", compact=self.compact)
             
             print(f"✅ Ethical compliance check complete!")
             print(f"🏆 Grade: {compliance['grade']}")
@@ -155,6 +252,121 @@ class PreSuaderCLI:
             print(f"❌ Error checking ethics: {str(e)}")
             return ""
     
+    def run_pipeline(self, audience_file: str = None, content_file: str = None,
+                     objective: str = None, batch_file: str = None,
+                     persist: bool = False, min_grade: str = None) -> list:
+        """Run analyze → strategy → optimize → ethics in-process"""
+        from pipeline import PreSuaderPipeline
+        
+        try:
+            if batch_file:
+                with open(batch_file, 'r') as f:
+                    manifest = json.load(f)
+                items = [self._load_pipeline_item(entry) for entry in manifest]
+            else:
+                items = [self._load_pipeline_item({
+                    "audience_file": audience_file,
+                    "content_file": content_file,
+                    "objective": objective
+                })]
+            
+            pipeline = PreSuaderPipeline(
+                presuader=self.presuader,
+                persist_dir=str(self.output_dir) if persist else None,
+                fmt=self.fmt,
+                compact=self.compact,
+                min_grade=min_grade
+            )
+            results = pipeline.run_batch(items)
+            
+            print(f"✅ Pipeline complete for {len(results)} campaign(s)!")
+            for result in results:
+                optimized_report = result.compliance.get("optimized") or result.rejected_variants["optimized"]
+                optimized_grade = optimized_report["grade"]
+                print(f"📋 {result.campaign_id} ({result.profile.segment_name}): "
+                      f"{len(result.content_variants)} variants, optimized grade {optimized_grade}")
+                for variant_name, report in result.rejected_variants.items():
+                    print(f"   🚫 Dropped {variant_name}: {report['grade']}")
+            if persist:
+                print(f"📁 Artifacts saved to: {self.output_dir}")
+            
+            return results
+            
+        except FileNotFoundError as e:
+            print(f"❌ Error: File not found - {str(e)}")
+            return []
+        except Exception as e:
+            print(f"❌ Error running pipeline: {str(e)}")
+            return []
+    
+    def _load_pipeline_item(self, entry: dict) -> dict:
+        """Resolve a pipeline manifest entry into in-memory audience data and content"""
+        if "audience" in entry:
+            audience_data = entry["audience"]
+        else:
+            with open(entry["audience_file"], 'r') as f:
+                audience_data = json.load(f)
+        
+        if "content" in entry:
+            content = entry["content"]
+        else:
+            with open(entry["content_file"], 'r') as f:
+                content = f.read()
+        
+        return {"audience": audience_data, "content": content, "objective": entry["objective"]}
+    
+    def generate_load(self, output_dir: str, campaigns: int, variants: int, events: int,
+                      creatives: int, flagged_rate: float, days: int, sink: str,
+                      db_path: str, seed: int, shards: int = 0) -> dict:
+        """Generate a seeded synthetic dataset for capacity testing"""
+        from load_generator import generate_load
+        from metrics_tracker import MetricsTracker
+        from sharded_metrics import ShardedMetricsTracker
+        from storage_backends import backend_from_url
+        
+        try:
+            if sink != "db":
+                tracker = None
+            elif shards:
+                tracker = ShardedMetricsTracker(db_path, num_shards=shards)
+            else:
+                tracker = MetricsTracker(db_path, backend=backend_from_url(db_path))
+            counts = generate_load(
+                output_dir, campaigns=campaigns, variants=variants, events=events,
+                creatives=creatives, flagged_rate=flagged_rate, days=days,
+                sink=sink, tracker=tracker, seed=seed
+            )
+            if shards and tracker is not None:
+                tracker.close()
+            
+            print(f"✅ Synthetic load generated (seed {seed})!")
+            print(f"📋 Campaigns: {counts['campaigns']:,}")
+            print(f"📈 Metric events: {counts['metrics']:,}")
+            print(f"📝 Creatives: {counts['creatives']:,}")
+            print(f"📁 Written to: {db_path if sink == 'db' else output_dir}")
+            
+            return counts
+            
+        except Exception as e:
+            print(f"❌ Error generating load: {str(e)}")
+            return {}
+    
+    def rebalance_shards(self, shard_dir: str, num_shards: int) -> dict:
+        """Move campaigns between shard files for a new shard count"""
+        from sharded_metrics import ShardedMetricsTracker
+        
+        try:
+            with ShardedMetricsTracker(shard_dir) as tracker:
+                previous = tracker.num_shards
+                moved = tracker.rebalance(num_shards)
+            
+            print(f"📁 Shards: {previous} → {num_shards} in {shard_dir}")
+            return moved
+            
+        except Exception as e:
+            print(f"❌ Error rebalancing shards: {str(e)}")
+            return {}
+    
     def create_sample_files(self) -> None:
         """Create sample input files for testing"""
         sample_audience = {
@@ -231,11 +443,60 @@ Examples:
   # Optimize marketing content
   python src/presuader_cli.py optimize-content output/strategy_*.json sample_content.txt
   
-  # Check ethical compliance
+  # Keep strategies in a consolidated store instead of per-campaign files
+  python src/presuader_cli.py strategy output/audience_profile_*.json "increase demo requests" --store strategies.db
+  python src/presuader_cli.py optimize-content <campaign_id> sample_content.txt --store strategies.db
+  
+  # Search headline, trigger, value and social-proof options for the top-5 Pareto front
+  python src/presuader_cli.py explore output/audience_profile_*.json sample_content.txt --top-k 5
+  
+  # Write variants with Claude (ANTHROPIC_API_KEY), caching completions across runs
+  python src/presuader_cli.py --generator anthropic --token-budget 200000 pipeline --batch campaigns.json
+  
+  # Check ethical compliance (optionally against a custom rule pack)
   python src/presuader_cli.py check-ethics sample_content.txt
+  python src/presuader_cli.py --rules legal_rules.json check-ethics sample_content.txt
+  
+  # Run all four stages in-process (add --persist to keep intermediate files)
+  python src/presuader_cli.py pipeline sample_audience.json sample_content.txt "increase demo requests"
+  python src/presuader_cli.py pipeline --batch campaigns.json --persist
+  
+  # Generate a reproducible synthetic dataset for capacity testing
+  python src/presuader_cli.py generate-load --campaigns 100 --events 1000000 --sink db
+  
+  # Spread metrics over 8 shard files, later grow to 16
+  python src/presuader_cli.py generate-load --events 1000000 --sink db --db shards/ --shards 8
+  python src/presuader_cli.py rebalance-shards shards/ 16
+  
+  # Profile a run (cProfile stats or flamegraph collapsed stacks) and print per-method timings
+  python src/presuader_cli.py --profile run.collapsed --profile-format collapsed --timings pipeline sample_audience.json sample_content.txt "demo"
         """
     )
     
+    parser.add_argument('--compact', action='store_true',
+                        help='Write JSON outputs without indentation for machine consumers')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='Profile the command and write the profile to PATH')
+    parser.add_argument('--profile-format', choices=['pstats', 'collapsed'], default='pstats',
+                        help='cProfile stats dump or flamegraph-compatible collapsed stacks')
+    parser.add_argument('--timings', action='store_true',
+                        help='Print per-method call counts and latencies after the command')
+    parser.add_argument('--metrics-textfile', metavar='PATH',
+                        help='Write Prometheus metrics for the run to PATH (node_exporter textfile collector)')
+    parser.add_argument('--format', dest='fmt', default='json', choices=['json', 'msgpack', 'cbor'],
+                        help='Output format for profiles, strategies and reports (inputs are auto-detected)')
+    parser.add_argument('--rules', metavar='PATH',
+                        help='Ethics rule pack (JSON) replacing the built-in compliance rules')
+    parser.add_argument('--generator', choices=['templates', 'stub', 'anthropic'], default='templates',
+                        help='Content variant writer: built-in templates, offline stub or the Claude API')
+    parser.add_argument('--model', help='Model for the anthropic generator (default: $PRESUADER_MODEL or claude-3-5-haiku-latest)')
+    parser.add_argument('--max-concurrency', type=int, default=4,
+                        help='Most generator requests in flight at once')
+    parser.add_argument('--token-budget', type=int,
+                        help='Stop once generator requests could exceed this many tokens')
+    parser.add_argument('--completion-cache', metavar='PATH',
+                        help='Completion cache database (default: $PRESUADER_COMPLETION_CACHE or ~/.cache/presuader/completions.db)')
+    
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Analyze audience command
@@ -246,17 +507,58 @@ Examples:
     strategy_parser = subparsers.add_parser('strategy', help='Create pre-suasive strategy')
     strategy_parser.add_argument('profile_file', help='Audience profile JSON file')
     strategy_parser.add_argument('objective', help='Campaign objective')
+    strategy_parser.add_argument('--store', help='Save into a strategy store database instead of a JSON file')
     
     # Optimize content command
     optimize_parser = subparsers.add_parser('optimize-content', help='Optimize marketing content')
-    optimize_parser.add_argument('strategy_file', help='Strategy JSON file')
+    optimize_parser.add_argument('strategy_file', help='Strategy JSON file (or campaign ID with --store)')
     optimize_parser.add_argument('content_file', help='Text file with original content')
+    optimize_parser.add_argument('--store', help='Read the strategy from a strategy store database')
+    optimize_parser.add_argument('--min-grade', choices=['A', 'B', 'C', 'D'],
+                                 help='Drop variants whose compliance grade is below this')
+    
+    # Explore command
+    explore_parser = subparsers.add_parser('explore', help='Grid-search optimization options for the best compliance/engagement trade-offs')
+    explore_parser.add_argument('profile_file', help='Audience profile file')
+    explore_parser.add_argument('content_file', help='Text file with original content')
+    explore_parser.add_argument('--top-k', type=int, default=5, help='Number of Pareto-ranked candidates to keep')
+    explore_parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count; 0 runs in-process)')
+    explore_parser.add_argument('--max-values', type=int, default=2, help='Most audience values woven into one variant')
     
     # Ethics check command
     ethics_parser = subparsers.add_parser('check-ethics', help='Check ethical compliance')
     ethics_parser.add_argument('content_file', help='Text file to analyze')
     ethics_parser.add_argument('--strategy', help='Optional strategy file for context')
     
+    # Pipeline command
+    pipeline_parser = subparsers.add_parser('pipeline', help='Run analyze, strategy, optimize and ethics in-process')
+    pipeline_parser.add_argument('audience_file', nargs='?', help='JSON file with audience data')
+    pipeline_parser.add_argument('content_file', nargs='?', help='Text file with original content')
+    pipeline_parser.add_argument('objective', nargs='?', help='Campaign objective')
+    pipeline_parser.add_argument('--batch', help='JSON list of {audience_file|audience, content_file|content, objective} entries')
+    pipeline_parser.add_argument('--persist', action='store_true', help='Save intermediate artifacts to output/')
+    pipeline_parser.add_argument('--min-grade', choices=['A', 'B', 'C', 'D'],
+                                 help='Drop content variants whose compliance grade is below this')
+    
+    # Synthetic load command
+    load_parser = subparsers.add_parser('generate-load', help='Generate seeded synthetic campaigns, metrics and creatives')
+    load_parser.add_argument('--campaigns', type=int, default=10, help='Number of campaigns')
+    load_parser.add_argument('--variants', type=int, default=2, help='Variants per campaign, including control')
+    load_parser.add_argument('--events', type=int, default=10000, help='Number of metric events')
+    load_parser.add_argument('--creatives', type=int, default=100, help='Number of creatives')
+    load_parser.add_argument('--flagged-rate', type=float, default=0.01, help='Per-token rate of flagged phrases in creatives')
+    load_parser.add_argument('--days', type=int, default=30, help='Days of history the metric events cover')
+    load_parser.add_argument('--sink', choices=['csv', 'jsonl', 'db'], default='csv', help='Where to stream the data')
+    load_parser.add_argument('--db', default='presuader_metrics.db', help='Metrics database for the db sink (file path or postgresql:// URL)')
+    load_parser.add_argument('--shards', type=int, default=0, help='Spread the db sink over this many shard files in the --db directory')
+    load_parser.add_argument('--output-dir', default='output/load', help='Directory for CSV/JSONL output')
+    load_parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    
+    # Rebalance shards command
+    rebalance_parser = subparsers.add_parser('rebalance-shards', help='Change the shard count of a sharded metrics directory')
+    rebalance_parser.add_argument('shard_dir', help='Directory holding the shard files')
+    rebalance_parser.add_argument('num_shards', type=int, help='New number of shards')
+    
     # Create samples command
     subparsers.add_parser('create-samples', help='Create sample files for testing')
     
@@ -266,17 +568,66 @@ Examples:
         parser.print_help()
         return
     
-    cli = PreSuaderCLI()
+    if args.fmt != 'json':
+        from interchange import available_formats
+        if args.fmt not in available_formats():
+            print(f"❌ Error: Format '{args.fmt}' is not available (install the '{args.fmt}' package)")
+            return
+    
+    generator_options = {'model': args.model, 'max_concurrency': args.max_concurrency,
+                         'token_budget': args.token_budget}
+    if args.completion_cache:
+        generator_options['cache_path'] = args.completion_cache
+    cli = PreSuaderCLI(compact=args.compact, fmt=args.fmt, rules=args.rules,
+                       generator=None if args.generator == 'templates' else args.generator,
+                       generator_options=generator_options)
+    
+    if args.command == 'pipeline' and not args.batch and not (
+            args.audience_file and args.content_file and args.objective):
+        pipeline_parser.error("provide audience_file, content_file and objective, or --batch")
+    
+    if args.timings or args.profile or args.metrics_textfile:
+        import instrumentation
+        instrumentation.enable()
     
-    # Route commands
+    if args.profile:
+        instrumentation.profile_call(lambda: run_command(cli, args, parser),
+                                     args.profile, args.profile_format)
+        print(f"🔬 Profile ({args.profile_format}) saved to: {args.profile}")
+    else:
+        run_command(cli, args, parser)
+    
+    if args.timings:
+        print("\n⏱️  Timings:")
+        print(instrumentation.REGISTRY.format_table())
+    
+    if args.metrics_textfile:
+        from metrics_exposition import write_textfile
+        write_textfile(args.metrics_textfile)
+        print(f"📈 Metrics written to: {args.metrics_textfile}")
+
+def run_command(cli: PreSuaderCLI, args, parser) -> None:
+    """Route a parsed command to the matching CLI handler"""
     if args.command == 'analyze':
         cli.analyze_audience(args.input_file)
     elif args.command == 'strategy':
-        cli.create_strategy(args.profile_file, args.objective)
+        cli.create_strategy(args.profile_file, args.objective, args.store)
     elif args.command == 'optimize-content':
-        cli.optimize_content(args.strategy_file, args.content_file)
+        cli.optimize_content(args.strategy_file, args.content_file, args.store, args.min_grade)
+    elif args.command == 'explore':
+        cli.explore_content(args.profile_file, args.content_file, args.top_k, args.workers,
+                            args.max_values)
     elif args.command == 'check-ethics':
         cli.check_ethics(args.content_file, args.strategy)
+    elif args.command == 'pipeline':
+        cli.run_pipeline(args.audience_file, args.content_file, args.objective,
+                         args.batch, args.persist, args.min_grade)
+    elif args.command == 'generate-load':
+        cli.generate_load(args.output_dir, args.campaigns, args.variants, args.events,
+                          args.creatives, args.flagged_rate, args.days, args.sink,
+                          args.db, args.seed, args.shards)
+    elif args.command == 'rebalance-shards':
+        cli.rebalance_shards(args.shard_dir, args.num_shards)
     elif args.command == 'create-samples':
         cli.create_sample_files()
     else:
@@ -10,12 +10,22 @@ Implements Robert Cialdini's Pre-Suasion principles for AI SaaS campaigns.
 
 import json
 import csv
-import re
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Tuple, Optional, Union
+from dataclasses import dataclass
 import hashlib
 
+try:
+    from .serialization import strategy_to_dict
+    from .interchange import write_document
+    from .instrumentation import instrumented, count
+    from .ethics_rules import CompiledRulePack, ComplianceSession, RuleEvaluation, RulePack, load_rule_pack
+except ImportError:
+    from serialization import strategy_to_dict
+    from interchange import write_document
+    from instrumentation import instrumented, count
+    from ethics_rules import CompiledRulePack, ComplianceSession, RuleEvaluation, RulePack, load_rule_pack
+
 @dataclass
 class AudienceProfile:
     """Data structure for target audience psychological profile"""
@@ -39,19 +49,237 @@ class PreSuasiveStrategy:
     ethical_guidelines: List[str]
     implementation_timeline: List[Dict[str, str]]
 
+# Compliance grade letters, best first
+COMPLIANCE_GRADES = ('A', 'B', 'C', 'D')
+
+# Trigger words with positive associations for the audience
+POSITIVE_TRIGGERS = (
+    'trust', 'innovation', 'efficiency', 'growth', 'success',
+    'reliability', 'expertise', 'transparency', 'value', 'results'
+)
+
+# Triggers the content optimizer responds to
+HEADLINE_TRIGGERS = frozenset({'innovation'})
+SOCIAL_PROOF_TRIGGERS = frozenset({'trust', 'reliability'})
+
+# Default attention-directing headline and social-proof line
+PRESUASIVE_HEADLINE = "🚀 Revolutionary AI Technology\n\n"
+SOCIAL_PROOF = "\n\n✅ Trusted by 1000+ businesses worldwide"
+
+# Below this many characters, editing a draft in place beats planning the
+# edits and rebuilding it once
+EDIT_PLAN_MIN_LENGTH = 2048
+
+class _EditPlan:
+    """
+    Insertions planned against an original text without rebuilding it.
+    The planned text is a list of pieces, each a (start, end) slice of the
+    original or an inserted string. Searches run over the pieces in place,
+    the original is lowercased at most once, and the result is built in a
+    single join by _ContentDraft.apply().
+    """
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.pieces: List[Union[Tuple[int, int], str]] = [(0, len(text))] if text else []
+        self.length = len(text)
+        self._lowered: Optional[str] = None
+    
+    def insert(self, position: int, inserted: str):
+        """Insert text before the character at position of the planned text"""
+        if position == 0:
+            index, start = 0, 0
+        elif position == self.length:
+            index, start = len(self.pieces), position
+        else:
+            index, start = self._locate(position)
+        if index < len(self.pieces) and start < position:
+            piece = self.pieces[index]
+            split = position - start
+            if isinstance(piece, str):
+                self.pieces[index:index + 1] = [piece[:split], piece[split:]]
+            else:
+                self.pieces[index:index + 1] = [(piece[0], piece[0] + split), (piece[0] + split, piece[1])]
+            index += 1
+        self.pieces.insert(index, inserted)
+        self.length += len(inserted)
+    
+    def find(self, needle: str, lowered: bool = False) -> int:
+        """
+        First position of needle in the planned text (or in its lowercase
+        form), as str.find would return on the joined text
+        """
+        if not needle:
+            return 0
+        source = self.text
+        if lowered:
+            if self._lowered is None:
+                self._lowered = self.text.lower()
+            # Lowercasing piece by piece matches lowercasing the joined text,
+            # with positions unchanged, unless a character lowercases to several
+            # characters ('İ') or depends on its neighbours (final sigma)
+            if (len(self._lowered) != len(self.text) or 'Σ' in self.text or not all(
+                    self._lowers_piecewise(piece) for piece in self.pieces if isinstance(piece, str))):
+                return self.render().lower().find(needle)
+            source = self._lowered
+        
+        keep = len(needle) - 1
+        tail = ''  # last keep characters before the current piece
+        position = 0
+        for piece in self.pieces:
+            if isinstance(piece, str):
+                segment, start, end = (piece.lower() if lowered else piece), 0, len(piece)
+            else:
+                segment, (start, end) = source, piece
+            # An occurrence straddling the boundary starts after any inside
+            # earlier pieces and before any inside this one
+            if tail:
+                found = (tail + segment[start:min(end, start + keep)]).find(needle)
+                if found != -1:
+                    return position - len(tail) + found
+            found = segment.find(needle, start, end)
+            if found != -1:
+                return position + found - start
+            position += end - start
+            if keep:
+                tail = (tail + segment[max(start, end - keep):end])[-keep:]
+        return -1
+    
+    def render(self) -> str:
+        return ''.join(self._piece_text(piece) for piece in self.pieces)
+    
+    def insertions(self) -> List[Tuple[int, str]]:
+        """Planned insertions as (original offset, text), in ascending offset order"""
+        insertions: List[Tuple[int, str]] = []
+        offset = 0
+        for piece in self.pieces:
+            if not isinstance(piece, str):
+                offset = piece[1]
+            elif insertions and insertions[-1][0] == offset:
+                insertions[-1] = (offset, insertions[-1][1] + piece)
+            else:
+                insertions.append((offset, piece))
+        return insertions
+    
+    def _locate(self, position: int) -> Tuple[int, int]:
+        """Index and start of the piece position falls in (len(pieces) at the very end)"""
+        start = 0
+        for index, piece in enumerate(self.pieces):
+            length = len(piece) if isinstance(piece, str) else piece[1] - piece[0]
+            if position < start + length:
+                return index, start
+            start += length
+        return len(self.pieces), start
+    
+    def _piece_text(self, piece: Union[Tuple[int, int], str]) -> str:
+        return piece if isinstance(piece, str) else self.text[piece[0]:piece[1]]
+    
+    @staticmethod
+    def _lowers_piecewise(text: str) -> bool:
+        return 'Σ' not in text and len(text.lower()) == len(text)
+
+class _ContentDraft:
+    """
+    Content being rendered into a variant.
+    When given a compliance session, every edit is mirrored into it so the
+    variant is scored from the original's match state. Once the edits would
+    cost more than scanning the whole text, the session is dropped and the
+    finished text is scored from scratch instead.
+    """
+    
+    def __init__(self, text: str, session: Optional[ComplianceSession] = None):
+        self.text = text
+        self.session = session
+        # Incremental work allowed, in characters of full scanning; edits
+        # must save at least half of a full scan to be worth the bookkeeping
+        self.budget = len(text) // 2
+    
+    @property
+    def length(self) -> int:
+        return len(self.text)
+    
+    def prepend(self, prefix: str):
+        self._edit(0, 0, prefix)
+    
+    def insert(self, position: int, inserted: str):
+        self._edit(position, 0, inserted)
+    
+    def find(self, needle: str, lowered: bool = False) -> int:
+        return (self.text.lower() if lowered else self.text).find(needle)
+    
+    def append(self, suffix: str):
+        self._edit(len(self.text), 0, suffix)
+    
+    def replace(self, old: str, new: str, count: int = -1):
+        """Same result as str.replace"""
+        if self.session is not None:
+            positions = []
+            position = self.text.find(old)
+            while position != -1 and len(positions) != count:
+                positions.append(position)
+                position = self.text.find(old, position + len(old))
+            if self._affordable(len(positions), len(positions) * len(new)):
+                # Right to left, so earlier offsets stay valid
+                for position in reversed(positions):
+                    self.session.edit(position, len(old), new)
+        self.text = self.text.replace(old, new, count)
+    
+    def apply(self, plan: _EditPlan):
+        """Make the insertions of a plan made against the current text, in one join"""
+        insertions = plan.insertions()
+        if not insertions:
+            return
+        if self._affordable(len(insertions), sum(len(inserted) for _, inserted in insertions)):
+            # Right to left, so earlier offsets stay valid
+            for offset, inserted in reversed(insertions):
+                self.session.edit(offset, 0, inserted)
+        pieces = []
+        position = 0
+        for offset, inserted in insertions:
+            pieces.append(self.text[position:offset])
+            pieces.append(inserted)
+            position = offset
+        pieces.append(self.text[position:])
+        self.text = ''.join(pieces)
+    
+    def evaluate(self, rule_pack: CompiledRulePack) -> RuleEvaluation:
+        if self.session is not None:
+            return self.session.evaluation
+        return rule_pack.evaluate(self.text)
+    
+    def _affordable(self, edits: int, inserted_length: int) -> bool:
+        """Charge edits to the budget, dropping the session once it runs out"""
+        if self.session is not None:
+            cost = edits * self.session.edit_cost + inserted_length
+            if cost > self.budget:
+                self.session = None
+            else:
+                self.budget -= cost
+        return self.session is not None
+    
+    def _edit(self, offset: int, deleted_length: int, inserted: str):
+        if self._affordable(1, len(inserted)):
+            self.session.edit(offset, deleted_length, inserted)
+        self.text = self.text[:offset] + inserted + self.text[offset + deleted_length:]
+
 class PreSuaderCore:
     """Core Pre-Suader AI Agent Functions"""
     
-    def __init__(self):
-        self.ethical_keywords = [
-            'manipulate', 'deceive', 'trick', 'exploit', 'coerce', 
-            'mislead', 'dark pattern', 'false scarcity', 'fake urgency'
-        ]
-        self.positive_triggers = [
-            'trust', 'innovation', 'efficiency', 'growth', 'success',
-            'reliability', 'expertise', 'transparency', 'value', 'results'
-        ]
+    def __init__(self, rule_pack: Union[str, Dict, RulePack, CompiledRulePack, None] = None,
+                 generator=None):
+        """
+        Args:
+            rule_pack: Ethics rule pack (JSON file, dict or RulePack); the
+                built-in pack when None
+            generator: ContentGenerator that writes the optimized and A/B
+                variants; the built-in templates when None
+        """
+        self.rule_pack = (rule_pack if isinstance(rule_pack, CompiledRulePack)
+                          else load_rule_pack(rule_pack))
+        self.generator = generator
+        self.positive_triggers = list(POSITIVE_TRIGGERS)
     
+    @instrumented()
     def analyze_audience_psychology(self, audience_data: Dict) -> AudienceProfile:
         """
         Analyze target audience psychological triggers and create profile
@@ -94,6 +322,7 @@ class PreSuaderCore:
         
         return profile
     
+    @instrumented()
     def generate_presuasive_strategy(self, audience_profile: AudienceProfile, 
                                    campaign_objective: str) -> PreSuasiveStrategy:
         """
@@ -170,6 +399,7 @@ class PreSuaderCore:
         
         return strategy
     
+    @instrumented()
     def optimize_content_for_presuasion(self, original_content: str, 
                                        strategy: PreSuasiveStrategy) -> Dict[str, str]:
         """
@@ -182,15 +412,25 @@ class PreSuaderCore:
         Returns:
             Dict: Original and optimized content versions with A/B variants
         """
+        if self.generator is not None:
+            optimized = {name: draft.text
+                         for name, draft in self._render_variants(original_content, strategy).items()}
+            optimized["optimization_notes"] = f"Pre-suasive variants generated by {self.generator.backend.model}"
+            return optimized
+        
+        # No compliance session to mirror edits into, so the variants are built
+        # as plain strings (the same text _render_variants produces)
         if not strategy:
             # Fallback optimization without strategy
             optimized_content = f"🚀 Revolutionary Technology\n\n{original_content}\n\n✅ Trusted by 1000+ businesses worldwide"
         else:
             audience = strategy.target_audience
             # Apply pre-suasive optimization
-            optimized_content = self._apply_presuasive_optimization(
-                original_content, audience.psychological_triggers, audience.values
+            optimized = _ContentDraft(original_content)
+            self._apply_presuasive_optimization(
+                optimized, audience.psychological_triggers, audience.values
             )
+            optimized_content = optimized.text
         
         # Create A/B testing variants
         variant_a = original_content.replace("our", "proven").replace("new", "trusted")
@@ -206,28 +446,111 @@ class PreSuaderCore:
             "optimization_notes": "Pre-suasive optimization applied with attention direction and trust indicators"
         }
     
-    def _apply_presuasive_optimization(self, content: str, triggers: List[str], 
-                                     values: List[str]) -> str:
-        """Apply pre-suasive optimization techniques to content"""
-        optimized = content
+    @instrumented()
+    def optimize_content_with_compliance(self, original_content: str, strategy: PreSuasiveStrategy,
+                                         min_grade: Optional[str] = None) -> Tuple[Dict[str, str], Dict[str, Dict]]:
+        """
+        Optimize content, checking each variant's compliance as it is rendered
+        
+        The original is scanned once; every variant applies its template
+        edits to a copy of that scan, so only the text around the edits is
+        scanned again.
+        
+        Args:
+            original_content: Original marketing copy or content
+            strategy: Pre-suasive strategy to apply
+            min_grade: Drop variants graded below this letter (A-D); the
+                original is always kept
+            
+        Returns:
+            Tuple: Kept variants by name, and compliance reports for every
+                rendered variant (dropped ones included)
+        """
+        if min_grade is not None and min_grade.upper() not in COMPLIANCE_GRADES:
+            raise ValueError(f"Unknown compliance grade '{min_grade}' (use one of {', '.join(COMPLIANCE_GRADES)})")
+        
+        session = self.open_compliance_session(original_content)
+        variants = {}
+        compliance = {}
+        for name, draft in self._render_variants(original_content, strategy, session).items():
+            report = self._compliance_report(draft.evaluate(self.rule_pack))
+            compliance[name] = report
+            if name == "original" or min_grade is None or report["grade"][0] <= min_grade.upper():
+                variants[name] = draft.text
+            else:
+                count("variants_rejected", grade=report["grade"][0])
+        return variants, compliance
+    
+    def _render_variants(self, original_content: str, strategy: Optional[PreSuasiveStrategy],
+                         session: Optional[ComplianceSession] = None) -> Dict[str, _ContentDraft]:
+        """Render the optimized and A/B variants, mirroring edits into forks of session"""
+        if self.generator is not None:
+            # Generated variants share no edits with the original, so they are scanned whole
+            generated = self.generator.optimize(original_content, strategy)
+            drafts = {"original": _ContentDraft(original_content, session)}
+            drafts.update((name, _ContentDraft(text)) for name, text in generated.items())
+            return drafts
+        
+        def draft() -> _ContentDraft:
+            return _ContentDraft(original_content, session.fork() if session is not None else None)
+        
+        optimized = draft()
+        if not strategy:
+            # Fallback optimization without strategy
+            optimized.prepend("🚀 Revolutionary Technology\n\n")
+            optimized.append("\n\n✅ Trusted by 1000+ businesses worldwide")
+        else:
+            audience = strategy.target_audience
+            # Apply pre-suasive optimization
+            self._apply_presuasive_optimization(
+                optimized, audience.psychological_triggers, audience.values
+            )
+        
+        # Create A/B testing variants
+        variant_a = draft()
+        variant_a.replace("our", "proven")
+        variant_a.replace("new", "trusted")
+        variant_b = draft()
+        variant_b.prepend("⭐ Advanced Solution\n\n")
+        variant_c = draft()
+        variant_c.prepend("⚡ BREAKTHROUGH: ")
+        variant_c.append("\n\n🎯 Limited Early Access Available")
+        
+        return {
+            "original": _ContentDraft(original_content, session),
+            "optimized": optimized,
+            "variant_a_conservative": variant_a,
+            "variant_b_moderate": variant_b,
+            "variant_c_aggressive": variant_c
+        }
+    
+    def _apply_presuasive_optimization(self, draft: _ContentDraft, triggers: List[str], 
+                                     values: List[str], headline: str = PRESUASIVE_HEADLINE,
+                                     social_proof: str = SOCIAL_PROOF) -> None:
+        """Apply pre-suasive optimization techniques to a content draft"""
+        # Long copy is planned against the draft and rebuilt once; short copy
+        # is edited in place through the same calls
+        plan = _EditPlan(draft.text) if draft.length >= EDIT_PLAN_MIN_LENGTH else draft
         
         # Add attention-directing elements
-        if 'innovation' in triggers:
-            optimized = f"🚀 Revolutionary AI Technology\n\n{optimized}"
+        if not HEADLINE_TRIGGERS.isdisjoint(triggers):
+            plan.insert(0, headline)
         
         # Incorporate value alignment
         for value in values[:2]:
-            if value.lower() not in optimized.lower():
-                optimized = optimized.replace(
-                    "features", f"{value}-focused features", 1
-                )
+            if plan.find(value.lower(), lowered=True) == -1:
+                features = plan.find("features")
+                if features != -1:
+                    plan.insert(features, f"{value}-focused ")
         
         # Add social proof elements
-        if 'trust' in triggers or 'reliability' in triggers:
-            optimized += "\n\n✅ Trusted by 1000+ businesses worldwide"
+        if not SOCIAL_PROOF_TRIGGERS.isdisjoint(triggers):
+            plan.insert(plan.length, social_proof)
         
-        return optimized
+        if plan is not draft:
+            draft.apply(plan)
     
+    @instrumented()
     def monitor_ethical_compliance(self, content: str, strategy: PreSuasiveStrategy = None) -> Dict[str, any]:
         """
         Monitor content for ethical compliance and potential manipulation
@@ -237,32 +560,53 @@ class PreSuaderCore:
             strategy: Strategy context for evaluation (optional)
             
         Returns:
-            Dict: Compliance report with scores and recommendations
+            Dict: Compliance report with scores and recommendations; "findings"
+                lists each fired rule with its occurrence count and the
+                [start, end) character offsets of every match in content
         """
-        issues = []
-        warnings = []
-        score = 100.0
-        
-        # Check for manipulative language
-        content_lower = content.lower()
-        for keyword in self.ethical_keywords:
-            if keyword in content_lower:
-                issues.append(f"Potentially manipulative language detected: '{keyword}'")
-                score -= 10.0
-        
-        # Check for false urgency
-        urgency_patterns = [
-            r'limited time', r'act now', r'hurry', r'expires', r'only \d+ left'
-        ]
-        for pattern in urgency_patterns:
-            if re.search(pattern, content_lower):
-                warnings.append(f"Urgency language detected: review for authenticity")
-                score -= 5.0
+        # Manipulative language, urgency and missing transparency rules in one scan
+        return self._compliance_report(self.rule_pack.evaluate(content))
+    
+    def open_compliance_session(self, content: str) -> ComplianceSession:
+        """
+        Start tracking compliance of content that will be edited
         
-        # Check transparency
-        if not any(word in content_lower for word in ['transparent', 'honest', 'clear']):
-            warnings.append("Consider adding transparency indicators")
-            score -= 3.0
+        Args:
+            content: Current document, scanned in full once
+            
+        Returns:
+            ComplianceSession: Match state to pass to update_ethical_compliance()
+        """
+        return ComplianceSession(self.rule_pack, content)
+    
+    @instrumented()
+    def update_ethical_compliance(self, session: ComplianceSession, offset: int,
+                                  deleted_length: int, inserted: str) -> Dict[str, any]:
+        """
+        Apply an edit to a session's document and re-check only the text around it
+        
+        Args:
+            session: Session from open_compliance_session()
+            offset: Start of the edit in the session's current text
+            deleted_length: Characters removed at offset
+            inserted: Text inserted at offset
+            
+        Returns:
+            Dict: Compliance report for the edited document, as from monitor_ethical_compliance()
+        """
+        return self._compliance_report(session.apply_edit(offset, deleted_length, inserted))
+    
+    def _compliance_report(self, evaluation: RuleEvaluation) -> Dict[str, any]:
+        """Compliance report, grade and counters for an evaluated document"""
+        issues = evaluation.issues
+        warnings = evaluation.warnings
+        score = 100.0 - evaluation.penalty
+        
+        for finding in evaluation.findings:
+            rule = finding.rule
+            if rule.counter and finding.penalized:
+                labels = {"keyword": rule.pattern} if rule.type == 'keyword' else {}
+                count(rule.counter, finding.penalized, **labels)
         
         # Generate compliance grade
         if score >= 90:
@@ -274,11 +618,15 @@ class PreSuaderCore:
         else:
             grade = "D - Significant ethical concerns require addressing"
         
+        count("compliance_checks")
+        count("compliance_grades", grade=grade[0])
+        
         return {
             "compliance_score": max(0, score),
             "grade": grade,
             "issues": issues,
             "warnings": warnings,
+            "findings": [finding.to_dict() for finding in evaluation.findings],
             "recommendations": self._generate_ethical_recommendations(issues, warnings),
             "audit_timestamp": datetime.now().isoformat()
         }
@@ -301,20 +649,26 @@ class PreSuaderCore:
         
         return recommendations
     
+    @instrumented()
     def save_strategy_report(self, strategy: PreSuasiveStrategy, 
-                           output_path: str = "presuasive_strategy_report.json") -> str:
-        """Save complete strategy report to file"""
+                           output_path: str = "presuasive_strategy_report.json",
+                           compact: bool = False, fmt: str = "json") -> str:
+        """Save complete strategy report to file (JSON, msgpack or CBOR)"""
         report = {
-            "strategy": asdict(strategy),
+            "strategy": strategy_to_dict(strategy),
             "generated_at": datetime.now().isoformat(),
             "version": "1.0",
             "author": "Pre-Suader AI Agent"
         }
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
-        
-        return output_path
+        return write_document(report, output_path, fmt=fmt,
+                              kind="strategy_report", compact=compact)
+
+def strategy_from_dict(data: Dict) -> PreSuasiveStrategy:
+    """Rebuild a PreSuasiveStrategy (and nested AudienceProfile) from its dict form"""
+    fields = dict(data)
+    fields['target_audience'] = AudienceProfile(**fields['target_audience'])
+    return PreSuasiveStrategy(**fields)
 
 # Example usage function
 def example_usage():
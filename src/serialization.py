@@ -0,0 +1,89 @@
+# /src/serialization.py
+# Version: 19-10-2026 09:30:00
+# Pre-Suader AI Agent - Report Serialization
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Fast serialization for audience profiles, strategies and reports.
+Uses orjson or msgspec when installed and falls back to the standard
+library json module otherwise.
+"""
+
+import json
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif msgspec is not None:
+    BACKEND = "msgspec"
+else:
+    BACKEND = "json"
+
+def profile_to_dict(profile) -> Dict[str, Any]:
+    """Convert an AudienceProfile to a dict without deep-copying its lists"""
+    return {
+        "segment_name": profile.segment_name,
+        "demographics": profile.demographics,
+        "psychological_triggers": profile.psychological_triggers,
+        "values": profile.values,
+        "pain_points": profile.pain_points,
+        "preferred_channels": profile.preferred_channels,
+        "decision_factors": profile.decision_factors,
+        "trust_indicators": profile.trust_indicators
+    }
+
+def strategy_to_dict(strategy) -> Dict[str, Any]:
+    """Convert a PreSuasiveStrategy to a dict without deep-copying its contents"""
+    return {
+        "campaign_id": strategy.campaign_id,
+        "objective": strategy.objective,
+        "target_audience": profile_to_dict(strategy.target_audience),
+        "priming_sequence": strategy.priming_sequence,
+        "success_metrics": strategy.success_metrics,
+        "ethical_guidelines": strategy.ethical_guidelines,
+        "implementation_timeline": strategy.implementation_timeline
+    }
+
+def dumps(obj: Any, compact: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON
+
+    Args:
+        obj: JSON-compatible object (dicts, lists, strings, numbers)
+        compact: Emit without indentation or spacing for machine consumers
+
+    Returns:
+        bytes: UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=0 if compact else orjson.OPT_INDENT_2)
+    if msgspec is not None:
+        encoded = msgspec.json.encode(obj)
+        return encoded if compact else msgspec.json.format(encoded, indent=2)
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+def loads(data) -> Any:
+    """Parse a JSON document from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        return msgspec.json.decode(data)
+    return json.loads(data)
+
+def dump_to_file(obj: Any, output_path: str, compact: bool = False) -> str:
+    """Serialize an object straight to a file, returning the path"""
+    with open(output_path, 'wb') as f:
+        f.write(dumps(obj, compact=compact))
+    return output_path
@@ -0,0 +1,361 @@
+# /src/sharded_metrics.py
+# Version: 19-10-2026 16:00:00
+# Pre-Suader AI Agent - Sharded Metrics Storage
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Campaign-sharded metrics storage.
+Each campaign lives in one of N SQLite files chosen by an md5 hash of its
+ID, so writes for different campaigns no longer queue behind one database
+lock. Per-campaign calls are routed to their shard; cross-campaign queries
+fan out over a thread pool and merge the shard results.
+"""
+
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    from .metrics_tracker import (BUSY_TIMEOUT_SECONDS, REACH_METRIC, CampaignPerformance,
+                                  MetricEntry, MetricsTracker)
+except ImportError:
+    from metrics_tracker import (BUSY_TIMEOUT_SECONDS, REACH_METRIC, CampaignPerformance,
+                                 MetricEntry, MetricsTracker)
+
+DEFAULT_SHARDS = 4
+MANIFEST_FILE = "shards.json"
+
+# Tables holding rows keyed by campaign; a rebalance moves all of them
+CAMPAIGN_TABLES = ('metrics', 'campaigns', 'campaign_aggregates', 'aggregate_watermarks',
+                   'metric_rollups_hourly', 'metric_sketches')
+
+# Per-campaign tracker methods (campaign_id first) routed straight to the owning shard
+ROUTED_METHODS = frozenset({
+    'update_campaign_aggregates', 'get_metric_statistics',
+    'get_campaign_performance_incremental', 'record_reach', 'get_metric_quantiles',
+    'get_unique_reach', 'get_campaign_timeseries', 'get_rolling_rates'
+})
+
+class ShardedMetricsTracker:
+    """MetricsTracker facade spreading campaigns over N database files"""
+
+    def __init__(self, shard_dir: str = "presuader_shards", num_shards: Optional[int] = None,
+                 sketches: bool = False, busy_timeout: float = BUSY_TIMEOUT_SECONDS,
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            shard_dir: Directory holding the shard files and their manifest
+            num_shards: Number of shards; defaults to the manifest's count (or
+                DEFAULT_SHARDS for a new directory). Changing it requires rebalance()
+            sketches: Maintain quantile sketches in every shard
+            busy_timeout: Seconds a connection waits for a lock held by another writer
+            max_workers: Threads used for fan-out (defaults to one per shard)
+        """
+        self.shard_dir = Path(shard_dir)
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        self.sketches = sketches
+        self.busy_timeout = busy_timeout
+
+        stored = self._read_manifest()
+        if num_shards is None:
+            num_shards = stored or DEFAULT_SHARDS
+        elif stored and stored != num_shards:
+            raise ValueError(f"{self.shard_dir} holds {stored} shards; "
+                             f"call rebalance({num_shards}) to change the shard count")
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+
+        self.num_shards = num_shards
+        self.shards = [self._open_shard(i) for i in range(num_shards)]
+        self._write_manifest(num_shards)
+        # Long-lived workers keep one connection per shard and thread
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or num_shards,
+                                            thread_name_prefix="presuader-shard")
+
+    def _shard_path(self, index: int) -> Path:
+        return self.shard_dir / f"shard_{index:03d}.db"
+
+    def _open_shard(self, index: int) -> MetricsTracker:
+        return MetricsTracker(str(self._shard_path(index)), sketches=self.sketches,
+                              busy_timeout=self.busy_timeout)
+
+    def _read_manifest(self) -> Optional[int]:
+        manifest = self.shard_dir / MANIFEST_FILE
+        if not manifest.exists():
+            return None
+        with open(manifest, 'r') as f:
+            return json.load(f)["num_shards"]
+
+    def _write_manifest(self, num_shards: int):
+        with open(self.shard_dir / MANIFEST_FILE, 'w') as f:
+            json.dump({"num_shards": num_shards}, f)
+
+    @staticmethod
+    def shard_index(campaign_id: str, num_shards: int) -> int:
+        """Stable shard number for a campaign (independent of process and hash seed)"""
+        digest = hashlib.md5(campaign_id.encode('utf-8')).digest()
+        return int.from_bytes(digest[:8], 'big') % num_shards
+
+    def shard_for(self, campaign_id: str) -> MetricsTracker:
+        """Tracker for the shard owning campaign_id"""
+        return self.shards[self.shard_index(campaign_id, self.num_shards)]
+
+    def _fan_out(self, calls: Dict[int, Callable[[MetricsTracker], object]]) -> Dict[int, object]:
+        """Run call(shard) for every shard index in calls in parallel"""
+        futures = {index: self._executor.submit(call, self.shards[index])
+                   for index, call in calls.items()}
+        return {index: future.result() for index, future in futures.items()}
+
+    def _partition(self, items: Iterable, key: Callable) -> Dict[int, List]:
+        """Group items by the shard owning key(item)"""
+        groups: Dict[int, List] = {}
+        for item in items:
+            groups.setdefault(self.shard_index(key(item), self.num_shards), []).append(item)
+        return groups
+
+    def register_campaign(self, campaign_id: str, name: str, objective: str) -> bool:
+        """Register a new campaign in its shard"""
+        return self.shard_for(campaign_id).register_campaign(campaign_id, name, objective)
+
+    def record_metric(self, campaign_id: str, metric_name: str, value: float,
+                      variant: str = "control", source: str = "manual") -> bool:
+        """Record a single metric measurement in the campaign's shard"""
+        return self.shard_for(campaign_id).record_metric(campaign_id, metric_name, value,
+                                                         variant, source)
+
+    def get_campaign_performance(self, campaign_id: str,
+                                 days_back: int = 30) -> Optional[CampaignPerformance]:
+        """Performance summary for a campaign, read from its shard"""
+        return self.shard_for(campaign_id).get_campaign_performance(campaign_id, days_back)
+
+    def generate_performance_report(self, campaign_id: str, output_file: str = None,
+                                    incremental: bool = False) -> str:
+        """Performance report for a campaign, built from its shard"""
+        return self.shard_for(campaign_id).generate_performance_report(
+            campaign_id, output_file, incremental)
+
+    def __getattr__(self, name: str):
+        if name in ROUTED_METHODS:
+            def routed(campaign_id: str, *args, **kwargs):
+                return getattr(self.shard_for(campaign_id), name)(campaign_id, *args, **kwargs)
+            return routed
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def register_campaigns(self, campaigns: Iterable[Tuple[str, str, str]]) -> int:
+        """Register many (campaign_id, name, objective) campaigns, one transaction per shard"""
+        groups = self._partition(campaigns, lambda campaign: campaign[0])
+        results = self._fan_out({
+            index: (lambda shard, rows=rows: shard.register_campaigns(rows))
+            for index, rows in groups.items()
+        })
+        return sum(results.values())
+
+    def record_metrics(self, entries: Iterable[Union[MetricEntry, Tuple]],
+                       batch_size: int = 10000) -> int:
+        """
+        Record many metric measurements, writing each batch's shards in parallel
+
+        Args:
+            entries: MetricEntry objects or (campaign_id, metric_name, value,
+                timestamp, variant, source) tuples; may be a lazy iterator
+            batch_size: Rows read from entries before they are split by shard
+
+        Returns:
+            int: Number of rows recorded
+        """
+        iterator = iter(entries)
+        recorded = 0
+
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+            groups = self._partition(
+                batch, lambda e: e.campaign_id if isinstance(e, MetricEntry) else e[0])
+            results = self._fan_out({
+                index: (lambda shard, rows=rows: shard.record_metrics(rows, batch_size))
+                for index, rows in groups.items()
+            })
+            recorded += sum(results.values())
+
+        return recorded
+
+    def refresh_metric_rollups(self) -> int:
+        """Refresh the hourly rollups of every shard"""
+        results = self._fan_out({index: MetricsTracker.refresh_metric_rollups
+                                 for index in range(self.num_shards)})
+        return sum(results.values())
+
+    def get_campaign_performances(self, campaign_ids: Optional[Iterable[str]] = None,
+                                  days_back: int = 30) -> Dict[str, CampaignPerformance]:
+        """
+        Performance summaries for many campaigns, queried on all shards in parallel
+
+        Args:
+            campaign_ids: Campaigns to summarise (defaults to all active campaigns)
+            days_back: Reporting window in days
+
+        Returns:
+            Dict[str, CampaignPerformance]: Performance per campaign with metrics
+        """
+        if campaign_ids is None:
+            calls = {index: (lambda shard: shard.get_campaign_performances(None, days_back))
+                     for index in range(self.num_shards)}
+        else:
+            calls = {index: (lambda shard, ids=ids: shard.get_campaign_performances(ids, days_back))
+                     for index, ids in self._partition(campaign_ids, lambda cid: cid).items()}
+
+        merged: Dict[str, CampaignPerformance] = {}
+        for performances in self._fan_out(calls).values():
+            merged.update(performances)
+        return dict(sorted(merged.items()))
+
+    def generate_performance_reports(self, campaign_ids: Optional[Iterable[str]] = None,
+                                     output_dir: str = "performance_reports",
+                                     days_back: int = 30,
+                                     summary_format: Optional[str] = None,
+                                     max_workers: int = 8) -> Dict[str, CampaignPerformance]:
+        """Performance reports for campaigns across all shards (see MetricsTracker)"""
+        if summary_format not in (None, "csv", "json"):
+            raise ValueError(f"Unknown summary format: {summary_format}")
+
+        performances = self.get_campaign_performances(campaign_ids, days_back)
+        return self.shards[0].write_performance_reports(performances, output_dir,
+                                                        summary_format, max_workers)
+
+    def rebalance(self, num_shards: int) -> Dict[str, int]:
+        """
+        Move campaigns to their shards for a new shard count
+
+        Each campaign is copied to its new shard in one transaction, then
+        deleted from the old one. Copying first clears any partial copy, so
+        an interrupted rebalance can simply be run again with the same count.
+        Running aggregates and rollups are rebuilt on the new shard; reach
+        sketches move with the campaign.
+
+        Args:
+            num_shards: New number of shards
+
+        Returns:
+            Dict[str, int]: Campaigns and metric rows moved
+        """
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        if num_shards == self.num_shards:
+            return {"campaigns": 0, "metrics": 0}
+
+        old_count = self.num_shards
+        self.shards.extend(self._open_shard(i) for i in range(old_count, num_shards))
+
+        def rebalance_shard(source_index: int) -> Tuple[int, int]:
+            source = self.shards[source_index]
+            conn = source._connect()
+            try:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT campaign_id FROM campaigns
+                    UNION SELECT DISTINCT campaign_id FROM metrics
+                    UNION SELECT DISTINCT campaign_id FROM metric_sketches
+                ''')
+                campaign_ids = [row[0] for row in cursor.fetchall()]
+            finally:
+                source._release(conn)
+
+            campaigns = rows = 0
+            for campaign_id in campaign_ids:
+                target_index = self.shard_index(campaign_id, num_shards)
+                if target_index != source_index:
+                    rows += self._move_campaign(source, self.shards[target_index], campaign_id)
+                    campaigns += 1
+            return campaigns, rows
+
+        # Shards are scanned in parallel; concurrent moves into one target
+        # queue on its write lock
+        with ThreadPoolExecutor(max_workers=old_count) as executor:
+            moved = list(executor.map(rebalance_shard, range(old_count)))
+
+        for shard in self.shards[num_shards:]:
+            shard.backend.close()
+        if num_shards < old_count:
+            unused = ", ".join(self._shard_path(i).name for i in range(num_shards, old_count))
+            print(f"🗑️  Shard files no longer used (now empty): {unused}")
+
+        self.shards = self.shards[:num_shards]
+        self.num_shards = num_shards
+        self._write_manifest(num_shards)
+        self._executor.shutdown()
+        self._executor = ThreadPoolExecutor(max_workers=num_shards,
+                                            thread_name_prefix="presuader-shard")
+
+        result = {"campaigns": sum(c for c, _ in moved), "metrics": sum(r for _, r in moved)}
+        print(f"✅ Rebalanced to {num_shards} shards: moved {result['campaigns']:,} campaigns "
+              f"({result['metrics']:,} metric rows)")
+        return result
+
+    def _move_campaign(self, source: MetricsTracker, target: MetricsTracker,
+                       campaign_id: str, chunk_size: int = 10000) -> int:
+        """Copy one campaign's rows to target, then delete them from source"""
+        def clear(cursor):
+            for table in CAMPAIGN_TABLES:
+                cursor.execute(f'DELETE FROM {table} WHERE campaign_id = ?', (campaign_id,))
+
+        def copy(cursor):
+            clear(cursor)
+            conn = source._connect()
+            try:
+                reader = conn.cursor()
+                reader.execute('''
+                    SELECT campaign_id, metric_name, value, timestamp, variant, source
+                    FROM metrics WHERE campaign_id = ? ORDER BY id
+                ''', (campaign_id,))
+                copied = 0
+                while True:
+                    rows = reader.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    copied += target.backend.insert_metrics(cursor, rows)
+
+                reader.execute('''
+                    SELECT campaign_id, name, objective, start_date, end_date, status, created_at
+                    FROM campaigns WHERE campaign_id = ?
+                ''', (campaign_id,))
+                cursor.executemany('''
+                    INSERT INTO campaigns
+                    (campaign_id, name, objective, start_date, end_date, status, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', reader.fetchall())
+
+                # Quantile sketches are rebuilt from the moved metrics; reach
+                # sketches have no source rows and are carried over as-is
+                reader.execute('''
+                    SELECT campaign_id, metric_name, variant, hour, sketch
+                    FROM metric_sketches WHERE campaign_id = ? AND metric_name = ?
+                ''', (campaign_id, REACH_METRIC))
+                cursor.executemany('''
+                    INSERT INTO metric_sketches (campaign_id, metric_name, variant, hour, sketch)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', [(c, m, v, h, bytes(sketch)) for c, m, v, h, sketch in reader.fetchall()])
+            finally:
+                source._release(conn)
+            return copied
+
+        copied = target._execute_write(copy, exclusive=True)
+        source._execute_write(clear, exclusive=True)
+        target._report_cache.pop(campaign_id, None)
+        source._report_cache.pop(campaign_id, None)
+        return copied
+
+    def close(self):
+        """Stop the fan-out threads and close every shard's connections"""
+        self._executor.shutdown()
+        for shard in self.shards:
+            shard.backend.close()
+
+    def __enter__(self) -> "ShardedMetricsTracker":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,397 @@
+# /src/storage_backends.py
+# Version: 19-10-2026 15:30:00
+# Pre-Suader AI Agent - Metrics Storage Backends
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Storage backends for the metrics tracker.
+SQLite (a local file) is the default; the PostgreSQL backend lets several
+application nodes share one server database with pooled connections and
+COPY-based bulk ingest. MetricsTracker writes portable SQL with '?'
+placeholders and asks the backend for the few dialect-specific pieces.
+"""
+
+import importlib
+import os
+import queue
+import sqlite3
+import threading
+from typing import Iterable, List, Tuple
+
+METRIC_INSERT_COLUMNS = ('campaign_id', 'metric_name', 'value', 'timestamp', 'variant', 'source')
+
+# SQLite connections inherited across fork(); closing one in the child would
+# release the parent's locks and can reset the shared WAL, so they stay open
+_INHERITED_CONNECTIONS: List[sqlite3.Connection] = []
+
+# Schema shared by every backend; type names are filled in per dialect
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS metrics (
+        id {serial_pk},
+        campaign_id TEXT NOT NULL,
+        metric_name TEXT NOT NULL,
+        value {real} NOT NULL,
+        timestamp TEXT NOT NULL,
+        variant TEXT DEFAULT 'control',
+        source TEXT DEFAULT 'manual'
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS campaigns (
+        campaign_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        objective TEXT NOT NULL,
+        start_date TEXT NOT NULL,
+        end_date TEXT,
+        status TEXT DEFAULT 'active',
+        created_at TEXT NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS campaign_aggregates (
+        campaign_id TEXT NOT NULL,
+        metric_name TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        total {real} NOT NULL,
+        mean {real} NOT NULL,
+        m2 {real} NOT NULL,
+        first_timestamp TEXT NOT NULL,
+        last_timestamp TEXT NOT NULL,
+        PRIMARY KEY (campaign_id, metric_name)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS aggregate_watermarks (
+        campaign_id TEXT PRIMARY KEY,
+        last_row_id {bigint} NOT NULL,
+        updated_at TEXT NOT NULL
+    )
+    ''',
+    # Per-campaign index; the primary key is appended, so "id > ?" seeks directly
+    '''
+    CREATE INDEX IF NOT EXISTS idx_metrics_campaign
+    ON metrics (campaign_id{index_id})
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS metric_rollups_hourly (
+        campaign_id TEXT NOT NULL,
+        metric_name TEXT NOT NULL,
+        hour {bigint} NOT NULL,
+        total {real} NOT NULL,
+        count {bigint} NOT NULL,
+        PRIMARY KEY (campaign_id, metric_name, hour)
+    ) {without_rowid}
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS metric_sketches (
+        campaign_id TEXT NOT NULL,
+        metric_name TEXT NOT NULL,
+        variant TEXT NOT NULL,
+        hour {bigint} NOT NULL,
+        sketch {blob} NOT NULL,
+        PRIMARY KEY (campaign_id, metric_name, variant, hour)
+    ) {without_rowid}
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS rollup_watermarks (
+        rollup TEXT PRIMARY KEY,
+        last_row_id {bigint} NOT NULL
+    )
+    '''
+]
+
+class StorageBackend:
+    """Connection management and dialect details for one kind of database"""
+
+    name = "base"
+    types: dict = {}
+
+    def connect(self):
+        """Return a DB-API connection (pooled backends hand out a pooled one)"""
+        raise NotImplementedError
+
+    def release(self, conn):
+        """Give a connection back; closes it unless the backend pools connections"""
+        conn.close()
+
+    def initialize(self, conn):
+        """Create the schema on a fresh connection"""
+        cursor = conn.cursor()
+        for statement in SCHEMA:
+            cursor.execute(statement.format(**self.types))
+        conn.commit()
+
+    def begin_write(self, conn, exclusive: bool = False, appends_metrics: bool = False):
+        """
+        Start a write transaction
+
+        Exclusive writes are serialized across processes and nodes. Metric
+        appends may run alongside each other but never alongside an
+        exclusive write, so a watermark fold sees every metrics id handed
+        out before it as committed.
+        """
+
+    def is_retryable(self, error: Exception) -> bool:
+        """True for transient lock or serialization errors worth retrying"""
+        return False
+
+    def hour_expression(self, column: str) -> str:
+        """SQL expression giving the UTC hour index of an ISO timestamp column"""
+        raise NotImplementedError
+
+    def insert_metrics(self, cursor, rows: List[Tuple]) -> int:
+        """Bulk insert metric rows in METRIC_INSERT_COLUMNS order"""
+        cursor.executemany(
+            f"INSERT INTO metrics ({', '.join(METRIC_INSERT_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        return len(rows)
+
+    def close(self):
+        """Release any pooled resources"""
+
+class SQLiteBackend(StorageBackend):
+    """Local SQLite file in WAL mode (the default backend)"""
+
+    name = "sqlite"
+    types = {
+        "serial_pk": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "real": "REAL",
+        "bigint": "INTEGER",
+        "blob": "BLOB",
+        "index_id": "",
+        "without_rowid": "WITHOUT ROWID"
+    }
+
+    def __init__(self, db_path: str = "presuader_metrics.db", busy_timeout: float = 5.0):
+        """
+        Args:
+            db_path: SQLite database file
+            busy_timeout: Seconds a connection waits for a lock held by another writer
+        """
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: List[Tuple[int, sqlite3.Connection]] = []
+        self._lock = threading.Lock()
+
+    def connect(self) -> sqlite3.Connection:
+        # One connection per thread and process: reopening a WAL database on
+        # every call would checkpoint and delete the WAL each time the last
+        # connection closed
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+            with self._lock:
+                self._connections.append((os.getpid(), conn))
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        """Keep the thread's connection open for its next operation"""
+
+    def close(self):
+        # sqlite3 connections sit in a reference cycle, so they are closed
+        # here rather than whenever the garbage collector gets to them
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for pid, conn in connections:
+            if pid == os.getpid():
+                conn.close()
+            else:
+                _INHERITED_CONNECTIONS.append(conn)
+        self._local = threading.local()
+
+    def __del__(self):
+        self.close()
+
+    def initialize(self, conn):
+        # WAL lets readers proceed while one process writes; the mode is
+        # persistent, so every later connection to the file inherits it
+        conn.execute('PRAGMA journal_mode=WAL')
+        super().initialize(conn)
+
+    def begin_write(self, conn, exclusive: bool = False, appends_metrics: bool = False):
+        # Take the write lock up front so read-then-write transactions
+        # wait on busy_timeout instead of failing on lock upgrade
+        conn.execute('BEGIN IMMEDIATE')
+
+    def is_retryable(self, error: Exception) -> bool:
+        return isinstance(error, sqlite3.OperationalError) and (
+            'locked' in str(error) or 'busy' in str(error))
+
+    def hour_expression(self, column: str) -> str:
+        # Naive ISO timestamps are read as UTC
+        return f"CAST(strftime('%s', {column}) AS INTEGER) / 3600"
+
+class _TranslatingCursor:
+    """Cursor adapter rewriting '?' placeholders to the driver's '%s' style"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    @staticmethod
+    def _translate(sql: str) -> str:
+        return sql.replace('%', '%%').replace('?', '%s')
+
+    def execute(self, sql: str, params=None):
+        if params is None:
+            self._cursor.execute(sql)
+        else:
+            self._cursor.execute(self._translate(sql), params)
+        return self
+
+    def executemany(self, sql: str, rows: Iterable):
+        self._cursor.executemany(self._translate(sql), rows)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class _PooledConnection:
+    """Connection wrapper handing out translating cursors"""
+
+    def __init__(self, conn):
+        self.raw = conn
+
+    def cursor(self):
+        return _TranslatingCursor(self.raw.cursor())
+
+    def execute(self, sql: str, params=None):
+        return self.cursor().execute(sql, params)
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        self.raw.close()
+
+class PostgresBackend(StorageBackend):
+    """
+    Shared PostgreSQL-compatible server database.
+    Requires the optional 'psycopg' (v3) package.
+    """
+
+    name = "postgres"
+    types = {
+        "serial_pk": "BIGSERIAL PRIMARY KEY",
+        "real": "DOUBLE PRECISION",
+        "bigint": "BIGINT",
+        "blob": "BYTEA",
+        "index_id": ", id",
+        "without_rowid": ""
+    }
+
+    # Advisory lock key: watermark read-modify-write transactions hold it
+    # exclusively and metric appends hold it shared
+    EXCLUSIVE_LOCK_KEY = 0x50534452
+
+    # SQLSTATE codes for serialization failure and deadlock
+    RETRYABLE_SQLSTATES = ('40001', '40P01')
+
+    def __init__(self, dsn: str, pool_size: int = 8, connect_timeout: float = 10.0):
+        """
+        Args:
+            dsn: libpq connection string or postgresql:// URL
+            pool_size: Maximum open connections kept by this process
+            connect_timeout: Seconds to wait for a free pooled connection
+        """
+        try:
+            self._psycopg = importlib.import_module("psycopg")
+        except ImportError as e:
+            raise ImportError("The postgres backend requires the 'psycopg' package") from e
+        self.dsn = dsn
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def connect(self) -> _PooledConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.pool_size:
+                self._opened += 1
+                try:
+                    return _PooledConnection(self._psycopg.connect(self.dsn))
+                except Exception:
+                    self._opened -= 1
+                    raise
+        return self._idle.get(timeout=self.connect_timeout)
+
+    def release(self, conn: _PooledConnection):
+        if conn.raw.closed:
+            with self._lock:
+                self._opened -= 1
+            return
+        # Never hand a connection with an open transaction to the next caller
+        conn.rollback()
+        self._idle.put(conn)
+
+    def begin_write(self, conn, exclusive: bool = False, appends_metrics: bool = False):
+        # BIGSERIAL ids are handed out at insert time but may commit out of
+        # order; without the shared lock a fold could move its watermark past
+        # an id whose row is still uncommitted and never fold that row
+        if exclusive:
+            conn.execute('SELECT pg_advisory_xact_lock(?)', (self.EXCLUSIVE_LOCK_KEY,))
+        elif appends_metrics:
+            conn.execute('SELECT pg_advisory_xact_lock_shared(?)', (self.EXCLUSIVE_LOCK_KEY,))
+
+    def is_retryable(self, error: Exception) -> bool:
+        return getattr(error, 'sqlstate', None) in self.RETRYABLE_SQLSTATES
+
+    def hour_expression(self, column: str) -> str:
+        # Timestamps without time zone are read as UTC, matching SQLite
+        return f"CAST(EXTRACT(EPOCH FROM CAST({column} AS TIMESTAMP)) AS BIGINT) / 3600"
+
+    def insert_metrics(self, cursor, rows: List[Tuple]) -> int:
+        # COPY streams rows in one round trip instead of one per row
+        with cursor.copy(f"COPY metrics ({', '.join(METRIC_INSERT_COLUMNS)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+        return len(rows)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._opened = 0
+
+def backend_from_url(url: str, **options) -> StorageBackend:
+    """
+    Build a backend from a URL
+
+    Args:
+        url: 'postgresql://...' / 'postgres://...' for PostgreSQL, a
+            'sqlite:///path' URL or a plain file path for SQLite
+        options: Backend keyword arguments (e.g. pool_size, busy_timeout)
+
+    Returns:
+        StorageBackend: Configured backend
+    """
+    if url.startswith(("postgresql://", "postgres://")):
+        return PostgresBackend(url, **options)
+    if url.startswith("sqlite:///"):
+        url = url[len("sqlite:///"):]
+    return SQLiteBackend(url, **options)
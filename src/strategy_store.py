@@ -0,0 +1,141 @@
+# /src/strategy_store.py
+# Version: 19-10-2026 09:00:00
+# Pre-Suader AI Agent - Consolidated Strategy Store
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Consolidated storage for pre-suasive strategies.
+Keeps every strategy in a single SQLite file instead of one JSON file per
+campaign, so large strategy libraries stay fast to list and query.
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+try:
+    from .presuader_core_functions import PreSuasiveStrategy, strategy_from_dict
+    from .serialization import strategy_to_dict, dumps, loads
+except ImportError:
+    from presuader_core_functions import PreSuasiveStrategy, strategy_from_dict
+    from serialization import strategy_to_dict, dumps, loads
+
+class StrategyStore:
+    """SQLite-backed store for PreSuasiveStrategy objects"""
+
+    def __init__(self, db_path: str = "presuader_strategies.db"):
+        self.db_path = db_path
+        self.init_database()
+
+    def init_database(self):
+        """Initialize SQLite database for strategy storage"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS strategies (
+                campaign_id TEXT PRIMARY KEY,
+                segment_name TEXT NOT NULL,
+                objective TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                stored_at TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_strategies_segment
+            ON strategies (segment_name)
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def _row(self, strategy: PreSuasiveStrategy, stored_at: str) -> tuple:
+        return (
+            strategy.campaign_id,
+            strategy.target_audience.segment_name,
+            strategy.objective,
+            dumps(strategy_to_dict(strategy), compact=True).decode('utf-8'),
+            stored_at
+        )
+
+    def put(self, strategy: PreSuasiveStrategy) -> str:
+        """Insert or replace a strategy, returning its campaign ID"""
+        return self.put_many([strategy])[0]
+
+    def put_many(self, strategies: Iterable[PreSuasiveStrategy]) -> List[str]:
+        """Insert or replace several strategies in a single transaction"""
+        stored_at = datetime.now().isoformat()
+        rows = [self._row(strategy, stored_at) for strategy in strategies]
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT OR REPLACE INTO strategies
+            (campaign_id, segment_name, objective, payload, stored_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+        conn.close()
+
+        return [row[0] for row in rows]
+
+    def get(self, campaign_id: str) -> Optional[PreSuasiveStrategy]:
+        """Fetch a strategy by campaign ID, or None if it is not stored"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT payload FROM strategies WHERE campaign_id = ?', (campaign_id,)
+        )
+        row = cursor.fetchone()
+        conn.close()
+
+        if row is None:
+            return None
+        return strategy_from_dict(loads(row[0]))
+
+    def list_by_segment(self, segment_name: str,
+                       limit: Optional[int] = None) -> List[PreSuasiveStrategy]:
+        """List strategies for an audience segment, most recently stored first"""
+        query = '''
+            SELECT payload FROM strategies WHERE segment_name = ?
+            ORDER BY stored_at DESC
+        '''
+        params = [segment_name]
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [strategy_from_dict(loads(payload)) for (payload,) in rows]
+
+    def list_campaign_ids(self) -> List[str]:
+        """List every stored campaign ID"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT campaign_id FROM strategies ORDER BY campaign_id')
+        ids = [campaign_id for (campaign_id,) in cursor.fetchall()]
+        conn.close()
+        return ids
+
+    def delete(self, campaign_id: str) -> bool:
+        """Remove a strategy, returning True if it existed"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM strategies WHERE campaign_id = ?', (campaign_id,))
+        deleted = cursor.rowcount > 0
+        conn.commit()
+        conn.close()
+        return deleted
+
+    def __len__(self) -> int:
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM strategies')
+        count = cursor.fetchone()[0]
+        conn.close()
+        return count
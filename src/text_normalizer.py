@@ -0,0 +1,215 @@
+# /src/text_normalizer.py
+# Version: 19-10-2026 17:00:00
+# Pre-Suader AI Agent - Text Normalization
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+"""
+Unicode normalization ahead of compliance matching.
+Text is folded one character at a time (compatibility decomposition,
+accent stripping, casefolding and a confusables map), invisible format
+characters are dropped and whitespace runs collapse to one space, so
+'ＴＲＩＣＫ', 'tríck', 'tr​ick' and Cyrillic 'trісk' all read 'trick'.
+An offset map leads every normalized character back to the original text.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from bisect import bisect_right
+from functools import lru_cache
+from typing import List, Optional, Pattern, Set, Tuple
+
+# Documents whose normalized form is kept for reuse
+NORMALIZE_CACHE_SIZE = 256
+
+# Characters per extra UTF-8 byte above which non-ASCII runs are folded on their own
+SPARSE_NON_ASCII_SPACING = 32
+
+# Lowercase Cyrillic, Greek and other letters commonly swapped for Latin lookalikes
+CONFUSABLES = {
+    # Cyrillic
+    'а': 'a', 'в': 'b', 'е': 'e', 'һ': 'h', 'і': 'i', 'ј': 'j',
+    'к': 'k', 'м': 'm', 'н': 'h', 'о': 'o', 'р': 'p', 'с': 'c', 'т': 't', 'у': 'y',
+    'х': 'x', 'ѕ': 's', 'ԁ': 'd', 'ԛ': 'q', 'ԝ': 'w', 'ү': 'y', 'ɡ': 'g',
+    # Greek
+    'α': 'a', 'β': 'b', 'γ': 'y', 'ε': 'e', 'η': 'n', 'ι': 'i', 'κ': 'k', 'ν': 'v',
+    'ο': 'o', 'ρ': 'p', 'τ': 't', 'υ': 'u', 'χ': 'x', 'ϲ': 'c', 'ϳ': 'j',
+    # Latin lookalikes that survive compatibility decomposition
+    'ı': 'i', 'ȷ': 'j', 'ł': 'l', 'ø': 'o', 'đ': 'd', 'ħ': 'h', 'ŀ': 'l',
+}
+
+_SPACE_RUN = re.compile(r' {2,}')
+_NON_ASCII_RUN = re.compile(r'([^\x00-\x7f]+)')
+# How fold_char treats ASCII, beyond lowercasing
+_ASCII_WHITESPACE = str.maketrans('\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f', ' ' * 9)
+_ASCII_WHITESPACE_BYTES = b'\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f'
+
+class OffsetMap:
+    """
+    Piecewise map from positions in a derived string back to its source.
+    Each segment either advances one source character per character or
+    (for folded ligatures and collapsed whitespace) maps every character
+    to one fixed source span, so the map grows with the number of changes
+    rather than the text length.
+    """
+
+    def __init__(self):
+        self.marks: List[int] = []  # first derived position of each segment
+        self.origins: List[int] = []  # source position of that first character
+        self.fixed_ends: List[Optional[int]] = []  # source end for fixed segments, else None
+
+    def add(self, position: int, origin: int, fixed_end: Optional[int] = None):
+        """Start a segment at derived position, mapping to source origin"""
+        self.marks.append(position)
+        self.origins.append(origin)
+        self.fixed_ends.append(fixed_end)
+
+    def char_span(self, position: int) -> Tuple[int, int]:
+        """Source [start, end) of the derived character at position"""
+        segment = bisect_right(self.marks, position) - 1
+        fixed_end = self.fixed_ends[segment]
+        if fixed_end is not None:
+            return self.origins[segment], fixed_end
+        start = self.origins[segment] + position - self.marks[segment]
+        return start, start + 1
+
+    def span(self, start: int, end: int) -> Tuple[int, int]:
+        """Source [start, end) covering the derived characters start..end-1"""
+        return self.char_span(start)[0], self.char_span(end - 1)[1]
+
+@dataclass(frozen=True)
+class NormalizedText:
+    """Normalized text with the maps leading back to the original"""
+    text: str
+    offset_maps: Tuple[OffsetMap, ...] = ()  # outermost first; empty when offsets are unchanged
+
+    def span(self, start: int, end: int) -> Tuple[int, int]:
+        """Original [start, end) of the normalized text[start:end]"""
+        for offset_map in self.offset_maps:
+            start, end = offset_map.span(start, end)
+        return start, end
+
+def fold_char(ch: str) -> str:
+    """
+    Normalized form of one character
+
+    Returns:
+        str: '' for format characters (zero-width joiners, soft hyphens,
+            bidi marks) and combining marks, ' ' for any whitespace, else the
+            casefolded, unaccented compatibility form with confusables mapped
+    """
+    if unicodedata.category(ch) == 'Cf':
+        return ''
+    if ch.isspace():
+        return ' '
+    decomposed = unicodedata.normalize('NFKD', ch)
+    stripped = unicodedata.normalize(
+        'NFC', ''.join(c for c in decomposed if not unicodedata.combining(c)))
+    return ''.join(CONFUSABLES.get(c, c) for c in stripped.casefold())
+
+class _FoldTable(dict):
+    """str.translate table that folds each character the first time it is seen"""
+
+    def __init__(self):
+        super().__init__()
+        # Characters that fold to zero or several characters
+        self.reshaping: Set[str] = set()
+
+    def __missing__(self, code: int) -> str:
+        folded = fold_char(chr(code))
+        if len(folded) != 1:
+            self.reshaping.add(chr(code))
+        self[code] = folded
+        return folded
+
+_FOLD_TABLE = _FoldTable()
+# (size of the reshaping set it was built from, compiled character class)
+_RESHAPING_PATTERN: list = [0, re.compile('(?!)')]
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_text(text: str) -> NormalizedText:
+    """
+    Normalize text for matching, caching the result per document
+
+    Args:
+        text: Original text
+
+    Returns:
+        NormalizedText: Normalized text and, unless every character maps to
+            exactly one character, the offset maps back into text
+    """
+    return normalize_fragment(text)
+
+def normalize_fragment(text: str) -> NormalizedText:
+    """Normalize short-lived text (such as an edit window) without caching it"""
+    if text.isascii():
+        # ASCII only needs lowercasing unless it has whitespace other than
+        # single spaces; deleting those bytes is far cheaper than isprintable()
+        folded = text.lower()
+        raw = text.encode('ascii')
+        if len(raw.translate(None, _ASCII_WHITESPACE_BYTES)) == len(raw) and '  ' not in folded:
+            return NormalizedText(folded)
+        folded = folded.translate(_ASCII_WHITESPACE)
+    else:
+        # Translating through the fold table costs a lookup per character, so
+        # when non-ASCII is sparse (a few emoji in English copy) only those runs
+        # go through it; the UTF-8 length bounds the non-ASCII character count
+        if len(text.encode('utf-8')) - len(text) > len(text) // SPARSE_NON_ASCII_SPACING:
+            folded = text.translate(_FOLD_TABLE)
+        else:
+            pieces = _NON_ASCII_RUN.split(text)
+            pieces[::2] = [piece.lower().translate(_ASCII_WHITESPACE) for piece in pieces[::2]]
+            pieces[1::2] = [piece.translate(_FOLD_TABLE) for piece in pieces[1::2]]
+            folded = ''.join(pieces)
+
+    offset_maps = []
+    if not _FOLD_TABLE.reshaping.isdisjoint(text):
+        offset_maps.append(_reshaping_map(text))
+    if '  ' in folded:
+        folded, collapse_map = _collapse_spaces(folded)
+        offset_maps.insert(0, collapse_map)
+    return NormalizedText(folded, tuple(offset_maps))
+
+def _reshaping_pattern() -> Pattern:
+    """Character class of every character known to fold to zero or several characters"""
+    reshaping = _FOLD_TABLE.reshaping
+    size, pattern = _RESHAPING_PATTERN
+    if size != len(reshaping):
+        pattern = re.compile('[' + ''.join(re.escape(ch) for ch in sorted(reshaping)) + ']')
+        _RESHAPING_PATTERN[:] = [len(reshaping), pattern]
+    return pattern
+
+def _reshaping_map(text: str) -> OffsetMap:
+    """Offsets of the folded text, visiting only characters that did not fold one to one"""
+    table = _FOLD_TABLE
+    offset_map = OffsetMap()
+    offset_map.add(0, 0)
+    folded_position = 0
+    position = 0
+    for match in _reshaping_pattern().finditer(text):
+        at = match.start()
+        folded_position += at - position
+        width = len(table[ord(text[at])])
+        if width:
+            offset_map.add(folded_position, at, at + 1)
+            folded_position += width
+        offset_map.add(folded_position, at + 1)
+        position = at + 1
+    return offset_map
+
+def _collapse_spaces(folded: str) -> Tuple[str, OffsetMap]:
+    """Collapse runs of spaces, the kept space spanning the whole run"""
+    pieces: List[str] = []
+    offset_map = OffsetMap()
+    offset_map.add(0, 0)
+    position = 0
+    removed = 0
+    for run in _SPACE_RUN.finditer(folded):
+        first, last = run.span()
+        pieces.append(folded[position:first + 1])
+        offset_map.add(first - removed, first, last)
+        offset_map.add(first - removed + 1, last)
+        removed += last - first - 1
+        position = last
+    pieces.append(folded[position:])
+    return ''.join(pieces), offset_map
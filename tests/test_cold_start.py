@@ -0,0 +1,60 @@
+# /tests/test_cold_start.py
+# Version: 19-10-2026 13:00:00
+# Pre-Suader AI Agent - CLI Cold Start Regression Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# Total top-level import time allowed for `presuader_cli.py --help` (microseconds)
+COLD_START_BUDGET_US = 150_000
+
+# Modules that must stay deferred until a command actually needs them
+DEFERRED_MODULES = {
+    "presuader_core_functions", "metrics_tracker", "strategy_store", "storage_backends", "sharded_metrics", "ethics_rules",
+    "text_normalizer",
+    "pipeline", "content_explorer", "content_generator", "asyncio",
+    "serialization", "interchange", "instrumentation", "sqlite3", "csv", "hashlib",
+    "dataclasses", "http.server"
+}
+
+def _importtime(args):
+    """Run python -X importtime and return {module: cumulative_us} for top-level imports"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        capture_output=True, text=True, cwd=REPO_ROOT, timeout=30
+    )
+    assert result.returncode == 0, result.stderr
+    imported = {}
+    top_level_total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        imported[module] = int(cumulative)
+        if not name[1:].startswith(" "):
+            top_level_total += int(cumulative)
+    return imported, top_level_total
+
+def test_cli_help_cold_start_budget():
+    """`--help` loads no project modules and stays within the import-time budget"""
+    imported, total_us = _importtime(["src/presuader_cli.py", "--help"])
+
+    assert not DEFERRED_MODULES & set(imported), DEFERRED_MODULES & set(imported)
+    assert total_us < COLD_START_BUDGET_US, f"cold start imports took {total_us}us"
+
+def test_package_import_is_lazy():
+    """Importing the package defers submodules until an export is accessed"""
+    imported, _ = _importtime(["-c", "import src"])
+    assert not {"src.metrics_tracker", "sqlite3", "src.presuader_core_functions"} & set(imported)
+
+    result = subprocess.run(
+        [sys.executable, "-c",
+         "import sys; from src import MetricsTracker; print('src.metrics_tracker' in sys.modules)"],
+        capture_output=True, text=True, cwd=REPO_ROOT, timeout=30
+    )
+    assert result.stdout.strip() == "True", result.stderr
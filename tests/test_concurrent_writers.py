@@ -0,0 +1,68 @@
+# /tests/test_concurrent_writers.py
+# Version: 19-10-2026 15:00:00
+# Pre-Suader AI Agent - Concurrent Writer Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import multiprocessing
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from metrics_tracker import MetricsTracker
+from metrics_writer import MetricsWriterError, MetricsWriterProcess
+
+def _rows(worker, count):
+    return [(f"w{worker}", "clicks", 1.0, "2026-01-01T00:00:00", "control", "test")
+            for _ in range(count)]
+
+def _write(db_path, worker):
+    tracker = MetricsTracker(db_path, busy_timeout=0.01)
+    for _ in range(20):
+        tracker.record_metrics(_rows(worker, 50))
+
+def test_direct_writers_share_database_in_wal_mode(tmp_path):
+    """Concurrent processes all land their rows despite a tiny busy timeout"""
+    db_path = str(tmp_path / "metrics.db")
+    MetricsTracker(db_path)
+    processes = [multiprocessing.Process(target=_write, args=(db_path, w)) for w in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert conn.execute('SELECT COUNT(*) FROM metrics').fetchone()[0] == 4 * 20 * 50
+    conn.close()
+
+def test_single_writer_funnel(tmp_path):
+    """Batches submitted to the writer process are coalesced and recorded"""
+    db_path = str(tmp_path / "metrics.db")
+    with MetricsWriterProcess(db_path, batch_size=300) as writer:
+        for worker in range(10):
+            writer.submit(_rows(worker, 100))
+
+    assert writer.recorded == 1000
+    assert MetricsTracker(db_path).get_campaign_performance("w3", days_back=100000) \
+        .total_clicks == 100
+
+def test_writer_failures_are_reported_by_close(tmp_path):
+    """close() raises instead of waiting forever when the writer fails or dies"""
+    db_path = str(tmp_path / "metrics.db")
+    # One batch per transaction, so the rows before the malformed one are kept
+    writer = MetricsWriterProcess(db_path, batch_size=10).start()
+    writer.submit(_rows(0, 10))
+    writer.submit([("malformed",)])
+    writer.submit(_rows(1, 10))
+    with pytest.raises(MetricsWriterError, match="after recording 10 rows"):
+        writer.close(timeout=30)
+
+    with pytest.raises(MetricsWriterError, match="without reporting"):
+        with MetricsWriterProcess(db_path) as writer:
+            writer._process.kill()
+            writer.submit(_rows(2, 10))
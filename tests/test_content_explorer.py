@@ -0,0 +1,67 @@
+# /tests/test_content_explorer.py
+# Version: 19-10-2026 18:00:00
+# Pre-Suader AI Agent - Optimization Grid Search Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from content_explorer import (ContentExplorer, OptimizationParams, _BranchEvaluator,
+                              cue_engagement, pareto_top_k)
+from presuader_core_functions import PreSuaderCore, PRESUASIVE_HEADLINE, SOCIAL_PROOF
+
+AUDIENCE = {
+    "segment_name": "Explorer Segment",
+    "tech_savvy": True,
+    "risk_averse": True,
+    "preferences": "transparency",
+    "interests": "innovation"
+}
+CONTENT = "Discover our new platform with powerful features. Act now, it is a limited time offer!"
+
+def _summary(candidates):
+    return [(c.params, c.compliance_score, c.engagement, c.front) for c in candidates]
+
+def test_grid_covers_levers_and_renders_like_optimizer():
+    """Options vary only when their trigger is acted on; the default point matches the optimizer"""
+    presuader = PreSuaderCore()
+    profile = presuader.analyze_audience_psychology(AUDIENCE)
+    branches = ContentExplorer(presuader).grid(profile, max_values=1)
+    points = [params for branch in branches for params in branch]
+
+    assert all(params.headline == "" for params in points if "innovation" not in params.triggers)
+    assert all(params.social_proof == "" for params in points if "reliability" not in params.triggers)
+    # Trigger subsets {}, {innovation}, {reliability}, {both}; 3 value choices; 3 headlines, 2 lines
+    assert len(points) == 3 * (1 + 3 + 2 + 3 * 2)
+    assert len(set(points)) == len(points)
+
+    strategy = presuader.generate_presuasive_strategy(profile, "increase demo requests")
+    optimized = presuader.optimize_content_for_presuasion(CONTENT, strategy)["optimized"]
+    default = OptimizationParams(("innovation", "reliability"), tuple(profile.values[:2]),
+                                 PRESUASIVE_HEADLINE, SOCIAL_PROOF)
+    evaluator = _BranchEvaluator(presuader.rule_pack, CONTENT, cue_engagement, top_k=10)
+    candidate, = evaluator((default,))[0]
+    assert candidate.content == optimized
+    assert candidate.compliance_score == presuader.monitor_ethical_compliance(optimized)["compliance_score"]
+
+def test_pruned_parallel_search_matches_exhaustive_front():
+    """Pruning and the process pool leave the top-k Pareto selection unchanged"""
+    presuader = PreSuaderCore()
+    profile = presuader.analyze_audience_psychology(AUDIENCE)
+
+    explorer = ContentExplorer(presuader, engagement=cue_engagement, workers=0)
+    everything = _BranchEvaluator(presuader.rule_pack, CONTENT, cue_engagement, top_k=10 ** 6)
+    exhaustive = pareto_top_k([c for branch in explorer.grid(profile)
+                               for c in everything(branch)[0]], 4)
+
+    inline = explorer.explore(CONTENT, profile, top_k=4)
+    assert _summary(inline) == _summary(exhaustive)
+    assert [c.front for c in inline] == sorted(c.front for c in inline)
+    assert not any(a.dominates(b) for a in inline for b in inline if a.front == b.front)
+
+    pooled = ContentExplorer(presuader, engagement=cue_engagement, workers=2).explore(
+        CONTENT, profile, top_k=4)
+    assert _summary(pooled) == _summary(inline)
@@ -0,0 +1,141 @@
+# /tests/test_content_generator.py
+# Version: 19-10-2026 19:00:00
+# Pre-Suader AI Agent - Model-Backed Content Generation Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from content_generator import (AnthropicBackend, ContentGenerator, GenerationFailed, GenerationRequest,
+                               StubBackend, TokenBudgetExceeded, VARIANT_INSTRUCTIONS)
+from pipeline import PreSuaderPipeline
+from presuader_core_functions import PreSuaderCore
+
+AUDIENCE = {
+    "segment_name": "Generator Segment",
+    "tech_savvy": True,
+    "risk_averse": True,
+    "preferences": "transparency",
+    "pain_points": ["manual reporting"]
+}
+CONTENT = "Discover our new platform with powerful features."
+
+def test_identical_prompts_coalesce_and_cache_persists(tmp_path):
+    """Concurrent duplicates share one backend call; a new generator reuses the cache file"""
+    cache = tmp_path / "completions.db"
+    backend = StubBackend(latency=0.05)
+    generator = ContentGenerator(backend, cache_path=cache, max_concurrency=2)
+    requests = [GenerationRequest("<content>\nsame\n</content>")] * 5 + [GenerationRequest("other")]
+
+    completions = generator.generate(requests)
+    assert backend.calls == 2
+    assert [c.text for c in completions[:5]] == ["same"] * 5
+    assert not any(c.cached for c in completions)
+    generator.close()
+
+    fresh = StubBackend(latency=0.05)
+    reopened = ContentGenerator(fresh, cache_path=cache)
+    assert [c.text for c in reopened.generate(requests)] == [c.text for c in completions]
+    assert fresh.calls == 0
+    assert reopened.tokens_used == 0
+
+def test_token_budget_refuses_requests_that_could_overrun():
+    """Each call reserves its prompt plus max_tokens; spent usage counts against the budget"""
+    request = GenerationRequest("x" * 400, system="", max_tokens=100)  # up to 201 tokens
+    generator = ContentGenerator(StubBackend(), cache_path=None, token_budget=250)
+    generator.generate([request])
+    assert generator.tokens_used == 202  # 101 in, 101 out
+
+    with pytest.raises(GenerationFailed) as failed:
+        generator.generate([GenerationRequest("y", system="", max_tokens=100)])
+    assert isinstance(failed.value.errors[0], TokenBudgetExceeded)
+    # Cached completions cost nothing
+    generator.generate([request])
+
+def test_budget_running_out_midway_keeps_finished_completions():
+    """Requests that fit the budget complete and are cached; the error lists the rest"""
+    requests = [GenerationRequest(ch * 400, system="", max_tokens=100) for ch in "abcd"]
+    generator = ContentGenerator(StubBackend(), cache_path=None, max_concurrency=1, token_budget=450)
+    with pytest.raises(GenerationFailed, match="2 of 4") as failed:
+        generator.generate(requests)
+    assert [c and c.text for c in failed.value.completions] == ["a" * 400, "b" * 400, None, None]
+    assert failed.value.failed == ["2", "3"]
+    assert all(isinstance(error, TokenBudgetExceeded) for error in failed.value.errors.values())
+
+    generator.token_budget = None
+    assert [c.cached for c in generator.generate(requests)] == [True, True, False, False]
+
+    class Flaky(StubBackend):
+        async def complete(self, request):
+            if "variant_c_aggressive" in request.prompt:
+                raise ConnectionError("backend unavailable")
+            return await super().complete(request)
+
+    generator = ContentGenerator(Flaky(), cache_path=None)
+    with pytest.raises(GenerationFailed, match="variant_c_aggressive") as failed:
+        generator.optimize(CONTENT, None)
+    assert failed.value.failed == ["variant_c_aggressive"]
+    assert sum(c is not None for c in failed.value.completions) == len(VARIANT_INSTRUCTIONS) - 1
+
+def test_anthropic_backend_sends_messages_request():
+    """The async client gets the system prompt and one user message; text blocks are joined"""
+    sent = {}
+
+    class Messages:
+        async def create(self, **kwargs):
+            sent.update(kwargs)
+            return SimpleNamespace(
+                content=[SimpleNamespace(type="text", text="Rewritten "),
+                         SimpleNamespace(type="text", text="copy")],
+                usage=SimpleNamespace(input_tokens=12, output_tokens=3))
+
+    backend = AnthropicBackend("test-model", client=SimpleNamespace(messages=Messages()))
+    generator = ContentGenerator(backend, cache_path=None, max_tokens=256)
+    completion, = generator.generate([GenerationRequest("prompt", system="system", max_tokens=256)])
+
+    assert completion.text == "Rewritten copy"
+    assert generator.tokens_used == 15
+    assert sent == {"model": "test-model", "max_tokens": 256, "system": "system",
+                    "messages": [{"role": "user", "content": "prompt"}]}
+
+def test_generated_variants_flow_through_core_and_batch_pipeline():
+    """Core optimizes with the generator; a batch prefetches every prompt once"""
+    backend = StubBackend()
+    presuader = PreSuaderCore(generator=ContentGenerator(backend, cache_path=None))
+    profile = presuader.analyze_audience_psychology(AUDIENCE)
+    strategy = presuader.generate_presuasive_strategy(profile, "increase demo requests")
+
+    optimized = presuader.optimize_content_for_presuasion(CONTENT, strategy)
+    assert optimized["original"] == CONTENT
+    assert optimized["optimized"] == StubBackend.FRAMES["optimized"][0] + CONTENT + StubBackend.FRAMES["optimized"][1]
+    assert set(VARIANT_INSTRUCTIONS) < set(optimized)
+    assert "stub" in optimized["optimization_notes"]
+    assert backend.calls == len(VARIANT_INSTRUCTIONS)
+
+    variants, compliance = presuader.optimize_content_with_compliance(CONTENT, strategy)
+    assert variants == {name: optimized[name] for name in variants}
+    direct = presuader.monitor_ethical_compliance(variants["optimized"])
+    assert compliance["optimized"]["compliance_score"] == direct["compliance_score"]
+    assert backend.calls == len(VARIANT_INSTRUCTIONS)
+
+    item = {"audience": AUDIENCE, "content": "Another product page.", "objective": "demo"}
+    results = PreSuaderPipeline(presuader).run_batch([item, item])
+    assert backend.calls == 2 * len(VARIANT_INSTRUCTIONS)
+    assert results[0].content_variants == results[1].content_variants
+
+def test_generator_works_inside_running_loop():
+    """complete_all() can be awaited from async code"""
+    generator = ContentGenerator(StubBackend(), cache_path=None)
+
+    async def main():
+        return await generator.complete_all([GenerationRequest("a"), GenerationRequest("a")])
+
+    assert [c.text for c in asyncio.run(main())] == ["a", "a"]
+    assert generator.backend.calls == 1
@@ -0,0 +1,158 @@
+# /tests/test_ethics_rules.py
+# Version: 19-10-2026 16:30:00
+# Pre-Suader AI Agent - Ethics Rule Pack Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import ethics_rules
+from ethics_rules import CompiledRulePack, ComplianceSession, RulePack, load_rule_pack
+from presuader_core_functions import PreSuaderCore
+
+def test_default_pack_keeps_legacy_scoring():
+    """Keywords -10 once each, urgency -5 per pattern, missing transparency -3"""
+    presuader = PreSuaderCore()
+    report = presuader.monitor_ethical_compliance(
+        "Hurry, act now! Don't let them trick you - we never trick or deceive. Only 3 left.")
+    assert report["compliance_score"] == 100 - 2 * 10 - 3 * 5 - 3
+    assert report["issues"] == ["Potentially manipulative language detected: 'deceive'",
+                                "Potentially manipulative language detected: 'trick'"]
+    assert report["warnings"] == ["Urgency language detected: review for authenticity"] * 3 + \
+        ["Consider adding transparency indicators"]
+
+    clean = presuader.monitor_ethical_compliance("Clear, honest pricing.")
+    assert clean["compliance_score"] == 100 and not clean["issues"] and not clean["warnings"]
+
+def test_combined_scan_matches_per_pattern_scan(monkeypatch):
+    """The automaton path finds exactly the matches of the per-pattern path"""
+    rng = random.Random(7)
+    words = ["she", "he", "hers", "his", "aa", "a", "only 2 left", "limited"]
+    pack = RulePack.from_dict({"name": "overlap", "rules": [
+        {"id": w, "type": "keyword", "pattern": w, "weight": 1, "max_hits": None} for w in words
+    ] + [
+        {"id": "digits", "type": "regex", "pattern": r"\d+", "weight": 1, "max_hits": None},
+        {"id": "left", "type": "regex", "pattern": r"only \d+ left", "weight": 1, "max_hits": None},
+        {"id": "only", "type": "regex", "pattern": r"only \d", "weight": 1, "max_hits": None},
+        {"id": "o-word", "type": "regex", "pattern": r"o\w+", "weight": 1, "max_hits": None},
+        # Anchors and lookarounds may precede the literal prefix the automaton triggers on
+        {"id": "he-word", "type": "regex", "pattern": r"\bhe(?:rs)?", "weight": 1, "max_hits": None},
+        {"id": "after-s", "type": "regex", "pattern": r"(?<=s)he", "weight": 1, "max_hits": None},
+        # No literal prefix, group references or global flags: searched on their own
+        {"id": "named", "type": "regex", "pattern": r"(?P<n>\d)\d", "weight": 1, "max_hits": None},
+        {"id": "repeat", "type": "regex", "pattern": r"(\w)\1", "weight": 1, "max_hits": None},
+        {"id": "flags", "type": "regex", "pattern": r"(?i)HIS\b", "weight": 1, "max_hits": None},
+        {"id": "absent", "type": "absence", "pattern": ["honest", "he"], "weight": 3}
+    ]})
+    small = CompiledRulePack(pack)
+    monkeypatch.setattr(ethics_rules, "COMBINED_SCAN_MIN_PATTERNS", 0)
+    large = CompiledRulePack(pack)
+    assert large.combined and not small.combined
+
+    for _ in range(300):
+        text = "".join(rng.choice(["she", "hers", "a", "aaa", "his ", "only 2 left", "12", " "])
+                       for _ in range(rng.randint(0, 30)))
+        assert large.scan(text) == small.scan(text)
+        assert large.evaluate(text) == small.evaluate(text)
+
+def test_rule_pack_file_is_compiled_once_and_cached(tmp_path):
+    """A pack file is pickled on first load and reused; locales filter rules"""
+    pack_file = tmp_path / "legal.json"
+    pack_file.write_text(json.dumps({"name": "legal", "version": "2", "rules": [
+        {"id": "guarantee", "type": "keyword", "pattern": "Guaranteed", "weight": 10,
+         "severity": "issue", "message": "Unverifiable claim: '{pattern}'", "max_hits": None},
+        {"id": "gratuit", "type": "keyword", "pattern": "gratuit", "weight": 4, "locale": "fr"}
+    ]}))
+    cache = tmp_path / "cache"
+
+    compiled = load_rule_pack(pack_file, cache_dir=cache)
+    assert len(list(cache.glob("legal-*.pickle"))) == 1
+    ethics_rules._COMPILED.clear()
+    reloaded = load_rule_pack(pack_file, cache_dir=cache)
+    assert reloaded is not compiled and reloaded.fingerprint == compiled.fingerprint
+
+    text = "Guaranteed gains, guaranteed! Essai gratuit."
+    evaluation = reloaded.evaluate(text, locale="en")
+    assert evaluation.penalty == 20
+    assert evaluation.issues == ["Unverifiable claim: 'Guaranteed'"] * 2
+    assert reloaded.evaluate(text, locale="fr").penalty == 24
+
+    # Served from this process's copy, so nothing is written to the default cache
+    presuader = PreSuaderCore(rule_pack=str(pack_file))
+    assert presuader.rule_pack is reloaded
+    assert presuader.monitor_ethical_compliance(text)["compliance_score"] == 76
+
+def test_unwritable_cache_falls_back_to_compiled_pack(tmp_path, monkeypatch):
+    """A cache directory that cannot be created or written costs only the pickle"""
+    pack = {"name": "offline", "rules": [
+        {"id": "guarantee", "type": "keyword", "pattern": "guaranteed", "weight": 10}]}
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    compiled = load_rule_pack(pack, cache_dir=blocker / "rules")
+    assert compiled.evaluate("Guaranteed!").penalty == 10
+
+    def disk_full(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    ethics_rules._COMPILED.clear()
+    monkeypatch.setattr(ethics_rules.pickle, "dump", disk_full)
+    cache = tmp_path / "cache"
+    assert load_rule_pack(pack, cache_dir=cache).evaluate("Guaranteed!").penalty == 10
+    assert list(cache.iterdir()) == []
+
+def test_findings_carry_spans_and_occurrences():
+    """Every match is located in the original text; penalties stay capped by max_hits"""
+    presuader = PreSuaderCore()
+    text = "İİ Trick: trick, TRICK! Act now, only 2 left."
+    report = presuader.monitor_ethical_compliance(text)
+    findings = {finding["rule"]: finding for finding in report["findings"]}
+
+    trick = findings["manipulative:trick"]
+    assert trick["occurrences"] == 3 and trick["penalty"] == 10
+    assert [text[start:end] for start, end in trick["spans"]] == ["Trick", "trick", "TRICK"]
+    assert report["issues"].count("Potentially manipulative language detected: 'trick'") == 1
+
+    urgency = [finding for finding in report["findings"] if finding["severity"] == "warning"
+               and finding["spans"]]
+    assert {text[start:end].lower() for finding in urgency for start, end in finding["spans"]} == \
+        {"act now", "only 2 left"}
+    assert report["compliance_score"] == 100 - 10 - 2 * 5 - 3
+
+    quick = presuader.rule_pack.evaluate(text, spans=False)
+    assert quick.penalty == 23 and all(not finding.spans for finding in quick.findings)
+
+def test_session_edits_match_full_rescans():
+    """Incremental re-scans after random edits agree with scanning the whole text"""
+    rng = random.Random(11)
+    vocab = ["trick", "act now", "act", "now", "only 3 left", "12", "left", "honest", "clear",
+             "dark pattern", " ", "  ", "\n", "​", "ｔｒｉｃｋ", "x"]
+    presuader = PreSuaderCore()
+    compiled = presuader.rule_pack
+
+    for _ in range(60):
+        session = ComplianceSession(compiled, "".join(rng.choice(vocab) for _ in range(30)))
+        for _ in range(15):
+            offset = rng.randint(0, len(session.text))
+            deleted = rng.randint(0, min(6, len(session.text) - offset))
+            inserted = "".join(rng.choice(vocab) for _ in range(rng.randint(0, 2)))
+            evaluation = session.apply_edit(offset, deleted, inserted)
+            full = compiled.evaluate(session.text)
+            assert (evaluation.penalty, evaluation.issues, evaluation.warnings) == \
+                (full.penalty, full.issues, full.warnings)
+            assert [(f.rule.id, f.occurrences, f.spans) for f in evaluation.findings] == \
+                [(f.rule.id, f.occurrences, f.spans) for f in full.findings]
+
+    session = presuader.open_compliance_session("Clear pricing. Act fast.")
+    report = presuader.update_ethical_compliance(session, 19, 4, "now")
+    assert session.text == "Clear pricing. Act now."
+    assert report["warnings"] == ["Urgency language detected: review for authenticity"]
+    assert report["findings"] == presuader.monitor_ethical_compliance(session.text)["findings"]
+    with pytest.raises(ValueError):
+        session.apply_edit(20, 10, "")
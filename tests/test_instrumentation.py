@@ -0,0 +1,99 @@
+# /tests/test_instrumentation.py
+# Version: 19-10-2026 12:00:00
+# Pre-Suader AI Agent - Instrumentation Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import instrumentation
+from instrumentation import LatencyHistogram, REGISTRY, profile_call
+from presuader_core_functions import PreSuaderCore
+
+def test_histogram_buckets_bound_relative_error():
+    """Bucket upper bounds stay within one sub-bucket of the recorded value"""
+    for value in [0, 1, 7, 8, 15, 16, 17, 1000, 123456, 10 ** 9 + 7]:
+        index = LatencyHistogram.bucket_index(value)
+        upper = LatencyHistogram.bucket_upper_bound(index)
+        assert value <= upper <= value + value / LatencyHistogram.SUB_BUCKETS + 1
+
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(value * 1000)
+    assert histogram.count == 1000
+    assert 500_000 <= histogram.percentile(50) <= 500_000 * 1.125
+    assert histogram.percentile(100) == histogram.max_ns == 1_000_000
+
+def test_instrumented_methods_record_only_when_enabled():
+    """Core methods are timed into the registry only while instrumentation is on"""
+    presuader = PreSuaderCore()
+    REGISTRY.reset()
+
+    presuader.monitor_ethical_compliance("honest copy")
+    assert REGISTRY.snapshot() == {}
+
+    instrumentation.enable()
+    try:
+        presuader.monitor_ethical_compliance("honest copy")
+        presuader.monitor_ethical_compliance("act now")
+    finally:
+        instrumentation.disable()
+
+    stats = REGISTRY.snapshot()["PreSuaderCore.monitor_ethical_compliance"]
+    assert stats["count"] == 2
+    REGISTRY.reset()
+
+def test_collapsed_stack_profile(tmp_path):
+    """Collapsed-stack output has 'frame;frame weight' lines"""
+    output = tmp_path / "run.collapsed"
+    presuader = PreSuaderCore()
+
+    result = profile_call(lambda: [presuader.monitor_ethical_compliance("hurry " * 2000)
+                                   for _ in range(5)],
+                          str(output), fmt="collapsed")
+
+    assert len(result) == 5
+    lines = output.read_text().splitlines()
+    assert lines
+    assert any("monitor_ethical_compliance" in line for line in lines)
+    for line in lines:
+        stack, weight = line.rsplit(" ", 1)
+        assert stack and int(weight) > 0
+
+def test_metrics_exposition_formats_and_endpoint(tmp_path):
+    """Counters and latency histograms are exposed over HTTP and as a textfile"""
+    import urllib.request
+    from metrics_exposition import render_metrics, serve_metrics, write_textfile
+
+    REGISTRY.reset()
+    instrumentation.enable()
+    try:
+        PreSuaderCore().monitor_ethical_compliance("Act now, don't be tricked!")
+    finally:
+        instrumentation.disable()
+
+    openmetrics = render_metrics()
+    assert "# TYPE presuader_compliance_checks counter" in openmetrics
+    assert 'presuader_compliance_grades_total{grade="B"} 1' in openmetrics
+    assert 'presuader_flagged_keywords_total{keyword="trick"} 1' in openmetrics
+    assert ('presuader_operation_latency_seconds_bucket{operation='
+            '"PreSuaderCore.monitor_ethical_compliance",le="+Inf"} 1') in openmetrics
+    assert openmetrics.endswith("# EOF\n")
+
+    textfile = tmp_path / "presuader.prom"
+    write_textfile(str(textfile))
+    assert "# TYPE presuader_compliance_checks_total counter" in textfile.read_text()
+
+    server = serve_metrics(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        request = urllib.request.Request(url, headers={"Accept": "application/openmetrics-text"})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+            assert response.read().decode() == render_metrics()
+    finally:
+        server.shutdown()
+        REGISTRY.reset()
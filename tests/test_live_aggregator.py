@@ -0,0 +1,58 @@
+# /tests/test_live_aggregator.py
+# Version: 19-10-2026 14:00:00
+# Pre-Suader AI Agent - Live Aggregator Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import queue
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from live_aggregator import LiveCampaignAggregator
+from load_generator import generate_metric_rows
+from metrics_tracker import MetricEntry, MetricsTracker
+
+def test_live_snapshot_matches_database_after_checkpoint(tmp_path):
+    """Running counters agree with a recompute over the checkpointed rows"""
+    tracker = MetricsTracker(str(tmp_path / "metrics.db"))
+    aggregator = LiveCampaignAggregator(tracker, checkpoint_batch=500)
+    end = datetime.now()
+    rows = generate_metric_rows(["live_a", "live_b"], 2, 3000,
+                                end.replace(hour=0, minute=0), end, seed=3)
+
+    assert aggregator.consume(rows) == 3000
+    aggregator.close()
+
+    live = aggregator.snapshot("live_a")
+    stored = tracker.get_campaign_performance("live_a")
+    assert live.total_impressions == stored.total_impressions
+    assert live.total_clicks == stored.total_clicks
+    assert live.engagement_score == stored.engagement_score
+    assert aggregator.campaigns() == ["live_a", "live_b"]
+
+def test_tumbling_and_sliding_windows():
+    """Windows follow event time and drop events older than the ring"""
+    tumbling = LiveCampaignAggregator(window_seconds=60)
+    sliding = LiveCampaignAggregator(window_seconds=120, slide_seconds=60)
+    entries = []
+    for minute, clicks in [(0, 10), (1, 20), (2, 30)]:
+        timestamp = f"2026-01-01T10:0{minute}:30"
+        entries.append(MetricEntry("c1", "impressions", 1000.0, timestamp))
+        entries.append(MetricEntry("c1", "clicks", float(clicks), timestamp))
+
+    events = queue.Queue()
+    for entry in entries + [None]:
+        events.put(entry)
+    assert tumbling.consume(events) == 6
+    assert sliding.consume(entries) == 6
+
+    assert tumbling.window_snapshot("c1").total_clicks == 30
+    assert sliding.window_snapshot("c1").total_clicks == 50
+    assert sliding.snapshot("c1").total_clicks == 60
+
+    sliding.ingest(MetricEntry("c1", "clicks", 5.0, "2026-01-01T09:00:00"))
+    assert sliding.late_events == 1
+    assert sliding.window_snapshot("c1").total_clicks == 50
@@ -0,0 +1,131 @@
+# /tests/test_metrics.py
+# Version: 19-10-2026 11:30:00
+# Pre-Suader AI Agent - Metrics Tracker Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import metrics_tracker
+from metrics_tracker import MetricsTracker
+from load_generator import generate_load
+
+def test_generate_load_is_reproducible(tmp_path):
+    """The same seed and end timestamp produce byte-identical datasets"""
+    end = datetime(2026, 1, 31)
+    first = generate_load(str(tmp_path / "a"), events=500, creatives=10, end=end, seed=7)
+    second = generate_load(str(tmp_path / "b"), events=500, creatives=10, end=end, seed=7)
+
+    assert first == {"campaigns": 10, "metrics": 500, "creatives": 10}
+    assert first == second
+    for name in ("campaigns.csv", "metrics.csv", "creatives.csv"):
+        assert (tmp_path / "a" / name).read_bytes() == (tmp_path / "b" / name).read_bytes()
+
+def test_generate_load_streams_into_tracker(tmp_path):
+    """The db sink writes campaigns and metrics through batched inserts"""
+    tracker = MetricsTracker(str(tmp_path / "metrics.db"))
+
+    counts = generate_load(str(tmp_path / "out"), campaigns=3, events=2000,
+                           creatives=5, sink="db", tracker=tracker)
+
+    assert counts["metrics"] == 2000
+    performance = tracker.get_campaign_performance("load_000000")
+    assert performance is not None
+    assert performance.total_impressions > 0
+
+def test_incremental_performance_matches_full_recompute(tmp_path, monkeypatch):
+    """Running aggregates fold only new rows and agree with a full recompute"""
+    tracker = MetricsTracker(str(tmp_path / "metrics.db"))
+    generate_load(str(tmp_path / "out"), campaigns=2, events=1000, creatives=1,
+                  days=5, end=datetime.now(), sink="db", tracker=tracker)
+
+    first_fold = tracker.update_campaign_aggregates("load_000000")
+    assert first_fold > 0
+    assert tracker.update_campaign_aggregates("load_000000") == 0
+
+    tracker.record_metrics([("load_000000", "engagement_score", 9.0,
+                             datetime.now().isoformat(), "control", "test")])
+    assert tracker.update_campaign_aggregates("load_000000") == 1
+
+    full = tracker.get_campaign_performance("load_000000")
+    incremental = tracker.get_campaign_performance_incremental("load_000000")
+    for field in ("total_impressions", "total_clicks", "total_conversions",
+                  "click_through_rate", "conversion_rate", "engagement_score",
+                  "roi_estimate", "ethical_compliance_score"):
+        assert getattr(incremental, field) == getattr(full, field)
+
+    # A report folds new rows once, then reads the aggregates as they stand
+    tracker.record_metrics([("load_000000", "clicks", 1.0, datetime.now().isoformat(), "control", "test")])
+    folds = []
+    update = tracker.update_campaign_aggregates
+
+    def counted_update(campaign_id):
+        folds.append(update(campaign_id))
+        return folds[-1]
+
+    monkeypatch.setattr(tracker, "update_campaign_aggregates", counted_update)
+    report = tracker.generate_performance_report("load_000000", incremental=True)
+    assert folds == [1]
+    assert "### Metric Stability" in report
+    assert report.split("## Executive Summary")[1] == \
+        tracker.generate_performance_report("load_000000", incremental=True).split("## Executive Summary")[1]
+
+def test_bulk_reports_match_single_campaign_reports(tmp_path, monkeypatch):
+    """One grouped query produces the same KPIs as per-campaign queries"""
+    tracker = MetricsTracker(str(tmp_path / "metrics.db"))
+    generate_load(str(tmp_path / "out"), campaigns=4, events=2000, creatives=1,
+                  days=5, end=datetime.now(), sink="db", tracker=tracker)
+
+    performances = tracker.generate_performance_reports(output_dir=str(tmp_path / "reports"),
+                                                        summary_format="csv")
+
+    assert sorted(performances) == [f"load_{i:06d}" for i in range(4)]
+    for campaign_id, bulk in performances.items():
+        single = tracker.get_campaign_performance(campaign_id)
+        assert bulk.total_impressions == single.total_impressions
+        assert bulk.conversion_rate == single.conversion_rate
+        assert bulk.ethical_compliance_score == single.ethical_compliance_score
+        assert (tmp_path / "reports" / f"{campaign_id}_performance_report.md").exists()
+
+    summary = (tmp_path / "reports" / "performance_summary.csv").read_text().splitlines()
+    assert summary[0].startswith("campaign_id,")
+    assert len(summary) == 5
+
+    # Requested campaigns are queried by id, a chunk of ids at a time
+    monkeypatch.setattr(metrics_tracker, "CAMPAIGN_ID_CHUNK", 2)
+    subset = tracker.get_campaign_performances(["load_000003", "load_000001", "load_000000", "unknown"])
+    assert sorted(subset) == ["load_000000", "load_000001", "load_000003"]
+    assert all(subset[cid].total_impressions == performances[cid].total_impressions for cid in subset)
+
+def test_timeseries_buckets_match_raw_metrics(tmp_path):
+    """Hourly rollups resample into aligned arrays that sum back to the raw rows"""
+    tracker = MetricsTracker(str(tmp_path / "metrics.db"))
+    end = datetime(2026, 1, 31)
+    generate_load(str(tmp_path / "out"), campaigns=2, events=3000, creatives=1,
+                  days=3, end=end, sink="db", tracker=tracker)
+    performance = tracker.get_campaign_performance("load_000000", days_back=10000)
+
+    hourly = tracker.get_campaign_timeseries("load_000000", "impressions", bucket="1h",
+                                             days_back=4, end_date=end)
+    daily = tracker.get_campaign_timeseries("load_000000", "impressions", bucket="1d",
+                                            days_back=4, end_date=end)
+
+    assert len(hourly["sum"]) == len(hourly["count"]) == len(hourly["bucket_start"])
+    assert hourly["sum"].sum() == daily["sum"].sum() == performance.total_impressions
+    assert str(daily["bucket_start"][-1]) == "2026-01-31T00"
+
+    # New rows are folded into the rollup on the next query
+    tracker.record_metrics([("load_000000", "impressions", 7.0, "2026-01-30T12:30:00",
+                             "control", "test")])
+    daily = tracker.get_campaign_timeseries("load_000000", "impressions", bucket="1d",
+                                            days_back=4, end_date=end)
+    assert daily["sum"].sum() == performance.total_impressions + 7
+
+    rates = tracker.get_rolling_rates("load_000000", bucket="1h", rolling_buckets=24,
+                                      days_back=4, end_date=end)
+    assert len(rates["click_through_rate"]) == len(hourly["sum"])
+    assert (rates["click_through_rate"][-24:] > 0).all()
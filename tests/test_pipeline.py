@@ -0,0 +1,136 @@
+# /tests/test_pipeline.py
+# Version: 19-10-2026 10:30:00
+# Pre-Suader AI Agent - Pipeline Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ethics_rules import load_rule_pack
+from pipeline import PreSuaderPipeline
+import presuader_core_functions as core
+from presuader_core_functions import PreSuaderCore
+
+AUDIENCE = {
+    "segment_name": "Pipeline Segment",
+    "tech_savvy": True,
+    "preferences": "transparency"
+}
+CONTENT = "Discover our new platform with powerful features. Act now!"
+
+def test_pipeline_runs_in_memory(tmp_path, monkeypatch):
+    """The pipeline runs every stage without touching the filesystem"""
+    monkeypatch.chdir(tmp_path)
+    result = PreSuaderPipeline().run(AUDIENCE, CONTENT, "increase demo requests")
+
+    assert result.profile.segment_name == "Pipeline Segment"
+    assert result.strategy.target_audience is result.profile
+    assert set(result.compliance) == set(result.content_variants)
+    assert "optimization_notes" not in result.content_variants
+    assert result.artifacts == []
+    assert list(tmp_path.iterdir()) == []
+
+def test_pipeline_batch_persists_on_request(tmp_path):
+    """Batches produce one result per item and persist artifacts when asked"""
+    pipeline = PreSuaderPipeline(persist_dir=str(tmp_path / "out"))
+    items = [{"audience": AUDIENCE, "content": CONTENT, "objective": f"objective {i}"}
+             for i in range(3)]
+
+    results = pipeline.run_batch(items)
+
+    assert [r.strategy.objective for r in results] == ["objective 0", "objective 1", "objective 2"]
+    for result in results:
+        assert result.artifacts
+        assert all(Path(path).exists() for path in result.artifacts)
+
+def test_min_grade_drops_low_scoring_variants(tmp_path):
+    """Gated variants match plain optimization; those graded too low are set aside"""
+    pack_file = tmp_path / "claims.json"
+    pack_file.write_text(json.dumps({"name": "claims", "rules": [
+        {"id": "breakthrough", "type": "keyword", "pattern": "breakthrough", "weight": 15}
+    ]}))
+    presuader = PreSuaderCore(rule_pack=load_rule_pack(pack_file, cache_dir=tmp_path / "cache"))
+    content = "Clear pricing for our new platform."
+    strategy = presuader.generate_presuasive_strategy(
+        presuader.analyze_audience_psychology(AUDIENCE), "increase demo requests")
+
+    variants, compliance = presuader.optimize_content_with_compliance(content, strategy)
+    plain = presuader.optimize_content_for_presuasion(content, strategy)
+    assert variants == {name: text for name, text in plain.items() if name != "optimization_notes"}
+    for name, text in variants.items():
+        full = presuader.monitor_ethical_compliance(text)
+        assert (compliance[name]["compliance_score"], compliance[name]["findings"]) == \
+            (full["compliance_score"], full["findings"])
+
+    result = PreSuaderPipeline(presuader, min_grade="A").run(AUDIENCE, content, "increase demo requests")
+    assert set(result.rejected_variants) == {"variant_c_aggressive"}
+    assert result.rejected_variants["variant_c_aggressive"]["grade"].startswith("B")
+    assert set(result.compliance) == set(result.content_variants) == set(variants) - {"variant_c_aggressive"}
+    with pytest.raises(ValueError):
+        presuader.optimize_content_with_compliance(content, strategy, min_grade="E")
+
+def test_planned_edits_match_in_place_edits(monkeypatch):
+    """Planning the optimizer's edits gives the same text as editing in place"""
+    rng = random.Random(3)
+    atoms = ["features", "feat", "ures", "Features", " ", "\n", "İ", "ΑΣ", "trust", "Transparency",
+             "-focused ", "quality", "fe", "atures", "x"]
+
+    def pick(size):
+        return "".join(rng.choice(atoms) for _ in range(rng.randint(0, size)))
+
+    presuader = PreSuaderCore()
+    for _ in range(500):
+        text = pick(12) * rng.choice([1, 40])
+        args = (rng.sample(["innovation", "trust", "reliability"], rng.randint(0, 3)),
+                [pick(3) for _ in range(rng.randint(0, 3))], pick(3), pick(3))
+        rendered = []
+        for min_length in (0, 10 ** 9):
+            monkeypatch.setattr(core, "EDIT_PLAN_MIN_LENGTH", min_length)
+            draft = core._ContentDraft(text)
+            presuader._apply_presuasive_optimization(draft, *args)
+            rendered.append(draft.text)
+        assert rendered[0] == rendered[1]
+
+def test_planned_edits_match_sequential_string_edits(monkeypatch):
+    """Planned edits give the text of the original string-by-string optimizer"""
+    def sequential(content, triggers, values, headline, social_proof):
+        optimized = content
+        if 'innovation' in triggers:
+            optimized = f"{headline}{optimized}"
+        for value in values[:2]:
+            if value.lower() not in optimized.lower():
+                optimized = optimized.replace("features", f"{value}-focused features", 1)
+        if 'trust' in triggers or 'reliability' in triggers:
+            optimized += social_proof
+        return optimized
+
+    rng = random.Random(5)
+    atoms = ["a", "b", "A", "ab", "features", "feat", "-focused ", " "]
+
+    def pick(size):
+        return "".join(rng.choice(atoms) for _ in range(rng.randint(0, size)))
+
+    monkeypatch.setattr(core, "EDIT_PLAN_MIN_LENGTH", 0)
+    presuader = PreSuaderCore()
+    cases = [("afeaturesab", ["innovation"], ["-focused featuresa", "abafeatures"], "bab", "")]
+    for _ in range(1000):
+        content = pick(2) + "features" + pick(3)
+        headline = pick(2) + rng.choice(atoms)
+        # The second value spans the start of "features", which the first value's
+        # insertion splits, so it is searched across the headline and both pieces
+        copy = headline + content
+        split = copy.index("features")
+        spanning = copy[rng.randint(0, split):split + rng.randint(1, 8)]
+        cases.append((content, ["innovation"] + rng.sample(["trust", "reliability"], rng.randint(0, 2)),
+                      [pick(2), spanning], headline, pick(2)))
+    for content, *args in cases:
+        draft = core._ContentDraft(content)
+        presuader._apply_presuasive_optimization(draft, *args)
+        assert draft.text == sequential(content, *args)
@@ -0,0 +1,86 @@
+# /tests/test_sharded_metrics.py
+# Version: 19-10-2026 16:00:00
+# Pre-Suader AI Agent - Sharded Metrics Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sharded_metrics import ShardedMetricsTracker
+
+def _load(tracker, campaigns=20, rows_per_metric=5):
+    now = datetime.now().isoformat()
+    tracker.register_campaigns((f"c{i:02d}", f"Campaign {i}", "demo") for i in range(campaigns))
+    tracker.record_metrics(
+        (f"c{i:02d}", metric, value, now, "control", "test")
+        for i in range(campaigns)
+        for metric, value in (("impressions", 100.0), ("clicks", float(i + 1)))
+        for _ in range(rows_per_metric)
+    )
+
+def _campaigns_in(shard_path):
+    conn = sqlite3.connect(shard_path)
+    ids = {row[0] for row in conn.execute('SELECT DISTINCT campaign_id FROM metrics')}
+    conn.close()
+    return ids
+
+def test_campaigns_are_routed_and_merged_across_shards(tmp_path):
+    """Each campaign lives in exactly its hashed shard; fan-out sees them all"""
+    with ShardedMetricsTracker(str(tmp_path), num_shards=4) as tracker:
+        _load(tracker)
+        tracker.record_metric("c03", "clicks", 6.0)
+
+        seen = set()
+        for index in range(4):
+            owned = _campaigns_in(tmp_path / f"shard_{index:03d}.db")
+            assert all(ShardedMetricsTracker.shard_index(c, 4) == index for c in owned)
+            seen |= owned
+        assert len(seen) == 20
+
+        assert tracker.get_campaign_performance("c03").total_clicks == 26
+        performances = tracker.get_campaign_performances()
+        assert list(performances) == [f"c{i:02d}" for i in range(20)]
+        assert performances["c07"].total_impressions == 500
+
+        reports = tracker.generate_performance_reports(["c01", "c02"], output_dir=str(tmp_path / "r"))
+        assert set(reports) == {"c01", "c02"}
+        assert tracker.update_campaign_aggregates("c05") == 10
+        assert tracker.get_metric_statistics("c05")["clicks"]["count"] == 5
+
+    with pytest.raises(ValueError):
+        ShardedMetricsTracker(str(tmp_path), num_shards=8)
+
+def test_rebalance_moves_campaigns_to_new_shards(tmp_path):
+    """Growing and shrinking the shard count keeps every campaign's data intact"""
+    with ShardedMetricsTracker(str(tmp_path), num_shards=2) as tracker:
+        _load(tracker)
+        tracker.record_reach("c04", ["u1", "u2", "u3"])
+        tracker.update_campaign_aggregates("c04")
+        before = tracker.get_campaign_performances()
+
+        moved = tracker.rebalance(5)
+        assert moved["metrics"] == 10 * moved["campaigns"] > 0
+        for cid, perf in tracker.get_campaign_performances().items():
+            assert (perf.total_clicks, perf.total_impressions) == \
+                (before[cid].total_clicks, before[cid].total_impressions)
+        assert round(tracker.get_unique_reach("c04")) == 3
+        assert tracker.get_metric_statistics("c04")["clicks"]["count"] == 5
+
+        tracker.rebalance(3)
+        assert len(tracker.get_campaign_performances()) == 20
+
+    reopened = ShardedMetricsTracker(str(tmp_path))
+    assert reopened.num_shards == 3
+    assert reopened.get_campaign_performance("c09").total_clicks == 50
+    for index in range(3):
+        owned = _campaigns_in(tmp_path / f"shard_{index:03d}.db")
+        assert all(ShardedMetricsTracker.shard_index(c, 3) == index for c in owned)
+    assert not _campaigns_in(tmp_path / "shard_004.db")
+    reopened.close()
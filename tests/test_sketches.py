@@ -0,0 +1,52 @@
+# /tests/test_sketches.py
+# Version: 19-10-2026 14:30:00
+# Pre-Suader AI Agent - Metric Sketch Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sketches import HyperLogLog, KLLSketch, sketch_from_bytes
+from metrics_tracker import MetricsTracker
+
+def test_sketches_merge_and_round_trip():
+    """Merged sketches stay within their error bounds after encoding"""
+    rng = random.Random(5)
+    values = [rng.uniform(0, 100) for _ in range(50000)]
+    first = KLLSketch().update(values[:25000])
+    second = KLLSketch().update(values[25000:])
+    merged = sketch_from_bytes(first.merge(second).to_bytes())
+
+    ordered = sorted(values)
+    assert merged.n == 50000
+    for q in (0.5, 0.95, 0.99):
+        assert abs(merged.quantile(q) - ordered[int(q * len(ordered)) - 1]) < 2.0
+
+    reach = HyperLogLog().update(range(20000))
+    reach.merge(HyperLogLog().update(range(10000, 30000)))
+    estimate = sketch_from_bytes(reach.to_bytes()).estimate()
+    assert abs(estimate - 30000) / 30000 < 0.05
+
+def test_tracker_quantiles_and_reach(tmp_path):
+    """Hourly sketches merge across variants and hours at query time"""
+    tracker = MetricsTracker(str(tmp_path / "metrics.db"), sketches=True)
+    end = datetime(2026, 1, 31)
+    rows = [("c1", "engagement_score", float(i % 100), f"2026-01-30T{i % 24:02d}:15:00",
+             "control" if i % 2 else "treatment_a", "test") for i in range(10000)]
+    tracker.record_metrics(rows)
+
+    quantiles = tracker.get_metric_quantiles("c1", "engagement_score", (0.5, 0.95),
+                                             days_back=2, end_date=end)
+    assert abs(quantiles[0.5] - 49) <= 2
+    assert abs(quantiles[0.95] - 94) <= 2
+
+    tracker.record_reach("c1", range(0, 3000), "2026-01-30T10:00:00")
+    tracker.record_reach("c1", range(2000, 5000), "2026-01-30T11:00:00", variant="treatment_a")
+    assert abs(tracker.get_unique_reach("c1", days_back=2, end_date=end) - 5000) < 250
+    assert abs(tracker.get_unique_reach("c1", days_back=2, variant="control",
+                                        end_date=end) - 3000) < 150
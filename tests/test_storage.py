@@ -0,0 +1,79 @@
+# /tests/test_storage.py
+# Version: 19-10-2026 09:00:00
+# Pre-Suader AI Agent - Strategy Storage Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from presuader_core_functions import PreSuaderCore
+from strategy_store import StrategyStore
+
+def _make_strategy(segment_name="Test Segment", objective="increase demo requests"):
+    presuader = PreSuaderCore()
+    profile = presuader.analyze_audience_psychology({
+        "segment_name": segment_name,
+        "tech_savvy": True,
+        "preferences": "transparency"
+    })
+    return presuader.generate_presuasive_strategy(profile, objective)
+
+def test_strategy_store_round_trip(tmp_path):
+    """Strategies come back from the store identical to what was put in"""
+    store = StrategyStore(str(tmp_path / "strategies.db"))
+    strategy = _make_strategy()
+
+    campaign_id = store.put(strategy)
+
+    assert campaign_id == strategy.campaign_id
+    assert store.get(campaign_id) == strategy
+    assert store.get("missing") is None
+    assert len(store) == 1
+
+def test_strategy_store_list_by_segment(tmp_path):
+    """Strategies can be listed per audience segment"""
+    store = StrategyStore(str(tmp_path / "strategies.db"))
+    founders = [_make_strategy("Founders", f"objective {i}") for i in range(3)]
+    store.put_many(founders + [_make_strategy("Agencies")])
+
+    listed = store.list_by_segment("Founders")
+
+    assert sorted(s.campaign_id for s in listed) == sorted(s.campaign_id for s in founders)
+    assert len(store.list_by_segment("Founders", limit=2)) == 2
+    assert store.delete(founders[0].campaign_id)
+    assert len(store) == 3
+
+def test_serialization_matches_asdict():
+    """Hand-written to-dict output matches dataclasses.asdict in both modes"""
+    import json
+    from dataclasses import asdict
+    from serialization import strategy_to_dict, dumps, loads
+
+    strategy = _make_strategy()
+
+    assert strategy_to_dict(strategy) == asdict(strategy)
+    assert loads(dumps(strategy_to_dict(strategy))) == asdict(strategy)
+    compact = dumps(strategy_to_dict(strategy), compact=True)
+    assert b"\n" not in compact
+    assert json.loads(compact) == asdict(strategy)
+
+def test_binary_interchange_round_trip(tmp_path):
+    """Strategy reports survive every interchange format and are auto-detected"""
+    from interchange import available_formats, read_document, detect_format, cbor_dumps, cbor_loads
+    from presuader_core_functions import strategy_from_dict
+
+    presuader = PreSuaderCore()
+    strategy = _make_strategy()
+
+    for fmt in available_formats():
+        path = presuader.save_strategy_report(strategy, str(tmp_path / f"strategy.{fmt}"), fmt=fmt)
+        with open(path, 'rb') as f:
+            assert detect_format(f.read()) == fmt
+        report = read_document(path, expected_kind="strategy_report")
+        assert strategy_from_dict(report["strategy"]) == strategy
+
+    sample = {"n": -70000, "big": 2 ** 40, "f": 1.5, "b": b"\x00\x01", "l": [None, True, False], "s": "ü"}
+    assert cbor_loads(cbor_dumps(sample)) == sample
@@ -0,0 +1,295 @@
+# /tests/test_storage_backends.py
+# Version: 19-10-2026 15:30:00
+# Pre-Suader AI Agent - Storage Backend Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import metrics_tracker
+from metrics_tracker import MetricsTracker
+from storage_backends import PostgresBackend, SQLiteBackend, _TranslatingCursor, backend_from_url
+
+POSTGRES_DSN = os.environ.get("PRESUADER_TEST_POSTGRES_DSN")
+
+# SQLite-only syntax that must never reach a PostgreSQL server
+SQLITE_ONLY = re.compile(r"\?|WITHOUT ROWID|AUTOINCREMENT|BEGIN IMMEDIATE|strftime|INSERT OR", re.IGNORECASE)
+# PostgreSQL spellings the stand-in rewrites for SQLite
+POSTGRES_DIALECT = [
+    (re.compile(r"%([%s])"), lambda m: "%" if m.group(1) == "%" else "?"),
+    (re.compile(r"BIGSERIAL PRIMARY KEY"), "INTEGER PRIMARY KEY"),
+    (re.compile(r"DOUBLE PRECISION"), "REAL"),
+    (re.compile(r"CAST\(EXTRACT\(EPOCH FROM CAST\((\w+) AS TIMESTAMP\)\) AS BIGINT\)"),
+     r"CAST(strftime('%s', \1) AS INTEGER)")
+]
+ADVISORY_LOCK = re.compile(r"\s*SELECT pg_advisory_xact_lock(_shared)?\(\?\)\s*$")
+METRICS_INSERT = re.compile(r"\s*(?:INSERT INTO|COPY) metrics\s*\(([^)]*)\)")
+
+class _StandInServer:
+    """
+    Shared state of one stand-in database: a BIGSERIAL-like sequence for
+    metrics ids and transaction-scoped advisory locks
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.next_id = None
+        self.condition = threading.Condition()
+        self.exclusive = {}  # key -> holding connection
+        self.shared = {}  # key -> number of shared holders
+
+    def allocate_ids(self, conn: sqlite3.Connection, n: int) -> range:
+        with self.condition:
+            if self.next_id is None:
+                self.next_id = (conn.execute("SELECT MAX(id) FROM metrics").fetchone()[0] or 0) + 1
+            ids = range(self.next_id, self.next_id + n)
+            self.next_id += n
+            return ids
+
+    def lock(self, owner, key: int, shared: bool):
+        with self.condition:
+            if shared:
+                self.condition.wait_for(lambda: self.exclusive.get(key) in (None, owner))
+                self.shared[key] = self.shared.get(key, 0) + 1
+            else:
+                self.condition.wait_for(lambda: self.exclusive.get(key) in (None, owner)
+                                        and not self.shared.get(key))
+                self.exclusive[key] = owner
+
+    def unlock(self, owner, locks):
+        with self.condition:
+            for key, shared in locks:
+                if shared:
+                    self.shared[key] -= 1
+                elif self.exclusive.get(key) is owner:
+                    del self.exclusive[key]
+            self.condition.notify_all()
+
+class _StandInCursor:
+    def __init__(self, conn: '_StandInConnection'):
+        self._conn = conn
+        self._cursor = conn.sqlite.cursor()
+
+    def execute(self, sql: str, params=None):
+        if SQLITE_ONLY.search(sql):
+            raise AssertionError(f"SQLite syntax sent to PostgreSQL: {sql}")
+        for pattern, replacement in POSTGRES_DIALECT:
+            sql = pattern.sub(replacement, sql)
+        lock = ADVISORY_LOCK.match(sql)
+        insert = METRICS_INSERT.match(sql)
+        if lock:
+            self._conn.advisory_lock(params[0], shared=bool(lock.group(1)))
+        elif insert:
+            self._conn.buffer_metrics(insert.group(1), [params])
+        else:
+            self._cursor.execute(sql, params or ())
+        return self
+
+    def executemany(self, sql: str, rows):
+        for row in rows:
+            self.execute(sql, row)
+        return self
+
+    def copy(self, sql: str):
+        columns = METRICS_INSERT.match(sql).group(1)
+        conn = self._conn
+
+        class Copy:
+            def __enter__(self):
+                return self
+
+            def write_row(self, row):
+                conn.buffer_metrics(columns, [row])
+
+            def __exit__(self, *exc):
+                return False
+        return Copy()
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size: int):
+        return self._cursor.fetchmany(size)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+class _StandInConnection:
+    """
+    psycopg-style connection over SQLite. Metrics rows take their ids
+    when inserted but only become visible at commit, like BIGSERIAL rows
+    under MVCC, so ids can commit out of order.
+    """
+
+    def __init__(self, server: _StandInServer):
+        self.server = server
+        self.sqlite = sqlite3.connect(server.path, timeout=30, check_same_thread=False)
+        self.closed = False
+        self._pending = []
+        self._locks = []
+
+    def cursor(self):
+        return _StandInCursor(self)
+
+    def advisory_lock(self, key: int, shared: bool):
+        self.server.lock(self, key, shared)
+        self._locks.append((key, shared))
+
+    def buffer_metrics(self, columns: str, rows):
+        ids = self.server.allocate_ids(self.sqlite, len(rows))
+        self._pending.extend((columns, (row_id, *row)) for row_id, row in zip(ids, rows))
+
+    def commit(self):
+        for columns, row in self._pending:
+            self.sqlite.execute(f"INSERT INTO metrics (id, {columns}) VALUES "
+                                f"({', '.join('?' * len(row))})", row)
+        self.sqlite.commit()
+        self._end()
+
+    def rollback(self):
+        self.sqlite.rollback()
+        self._end()
+
+    def _end(self):
+        self._pending = []
+        locks, self._locks = self._locks, []
+        self.server.unlock(self, locks)
+
+    def close(self):
+        self.rollback()
+        self.sqlite.close()
+        self.closed = True
+
+def _stand_in_psycopg(path: Path) -> SimpleNamespace:
+    """psycopg stand-in whose connect() opens the SQLite database at path"""
+    server = _StandInServer(str(path))
+    return SimpleNamespace(connect=lambda dsn: _StandInConnection(server))
+
+@pytest.fixture(params=["stand-in", "server"])
+def postgres_backend(request, tmp_path, monkeypatch):
+    """PostgresBackend on the SQLite stand-in, or on PRESUADER_TEST_POSTGRES_DSN when set"""
+    if request.param == "server":
+        if not POSTGRES_DSN:
+            pytest.skip("set PRESUADER_TEST_POSTGRES_DSN to a throwaway database")
+        backend = backend_from_url(POSTGRES_DSN, pool_size=4)
+    else:
+        monkeypatch.setitem(sys.modules, "psycopg", _stand_in_psycopg(tmp_path / "standin.db"))
+        backend = PostgresBackend("postgresql://stand-in/presuader", pool_size=4)
+    yield backend
+    backend.close()
+
+class _RecordingCursor:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+
+def test_backend_selection_and_placeholder_translation(tmp_path):
+    """URLs pick the backend; '?' placeholders become '%s' for server drivers"""
+    assert isinstance(backend_from_url(str(tmp_path / "m.db")), SQLiteBackend)
+    assert backend_from_url("sqlite:///" + str(tmp_path / "m.db")).db_path == str(tmp_path / "m.db")
+
+    raw = _RecordingCursor()
+    _TranslatingCursor(raw).execute("SELECT 1 WHERE a = ? AND b LIKE '5%'", (1,))
+    assert raw.statements == ["SELECT 1 WHERE a = %s AND b LIKE '5%%'"]
+
+def _exercise_backend(tracker: MetricsTracker, campaign_id: str):
+    now = datetime.now().replace(minute=0, second=0, microsecond=0)
+    rows = [(campaign_id, name, value, now.isoformat(), "control", "test")
+            for name, value in [("impressions", 1000.0), ("clicks", 40.0),
+                                ("conversions", 4.0), ("engagement_score", 8.0)]]
+    assert tracker.register_campaigns([(campaign_id, "Backend test", "verify")]) == 1
+    assert tracker.record_metrics(rows) == 4
+
+    performance = tracker.get_campaign_performance(campaign_id)
+    assert performance.click_through_rate == 4.0
+    assert performance.conversion_rate == 10.0
+
+    assert tracker.update_campaign_aggregates(campaign_id) == 4
+    assert tracker.get_campaign_performance_incremental(campaign_id).total_clicks == 40
+    series = tracker.get_campaign_timeseries(campaign_id, "clicks", days_back=1, end_date=now)
+    assert series["sum"].sum() == 40
+
+def test_sqlite_backend_round_trip(tmp_path):
+    tracker = MetricsTracker(backend=SQLiteBackend(str(tmp_path / "metrics.db")))
+    _exercise_backend(tracker, "backend_sqlite")
+
+def test_postgres_backend_round_trip(postgres_backend):
+    tracker = MetricsTracker(backend=postgres_backend, sketches=True)
+    campaign_id = f"backend_pg_{uuid.uuid4().hex[:8]}"
+    _exercise_backend(tracker, campaign_id)
+    # Rollups fold again on conflict rather than replacing the hour
+    assert tracker.record_metric(campaign_id, "clicks", 2.0)
+    assert tracker.get_campaign_timeseries(campaign_id, "clicks", days_back=1)["sum"].sum() == 42
+
+def test_folds_wait_for_metric_ids_committed_out_of_order(postgres_backend):
+    """A metrics id handed out first but committed last is still rolled up and aggregated"""
+    tracker = MetricsTracker(backend=postgres_backend)
+    campaign_id = f"backend_order_{uuid.uuid4().hex[:8]}"
+    hour = datetime.now().replace(minute=0, second=0, microsecond=0)
+    row = (campaign_id, "clicks", 1.0, hour.isoformat(), "control", "test")
+    tracker.refresh_metric_rollups()
+
+    # The first writer takes the lower id and stays open...
+    slow = postgres_backend.connect()
+    postgres_backend.begin_write(slow, appends_metrics=True)
+    postgres_backend.insert_metrics(slow.cursor(), [row])
+    # ...while a second writer takes the next id and commits
+    assert tracker.record_metrics([row]) == 1
+
+    folded = []
+    fold = threading.Thread(target=lambda: folded.append(
+        (tracker.refresh_metric_rollups(), tracker.update_campaign_aggregates(campaign_id))))
+    fold.start()
+    fold.join(timeout=0.5)
+    assert fold.is_alive()
+    slow.commit()
+    postgres_backend.release(slow)
+    fold.join(timeout=10)
+
+    assert folded and folded[0][1] == 2
+    assert tracker.get_metric_statistics(campaign_id)["clicks"]["count"] == 2
+    series = tracker.get_campaign_timeseries(campaign_id, "clicks", days_back=1, end_date=hour)
+    assert series["count"].sum() == 2
+
+def test_concurrent_reach_writes_keep_every_user(postgres_backend, monkeypatch):
+    """Writers merging into the same hourly reach sketch do not overwrite each other"""
+    tracker = MetricsTracker(backend=postgres_backend)
+    campaign_id = f"backend_reach_{uuid.uuid4().hex[:8]}"
+    hour = datetime.now().replace(minute=0, second=0, microsecond=0).isoformat()
+    assert tracker.record_reach(campaign_id, ["seed"], hour)
+
+    # Widen the gap between reading the stored sketch and writing it back
+    sketch_from_bytes = metrics_tracker.sketch_from_bytes
+
+    def slow_sketch_from_bytes(blob):
+        time.sleep(0.05)
+        return sketch_from_bytes(blob)
+
+    monkeypatch.setattr(metrics_tracker, "sketch_from_bytes", slow_sketch_from_bytes)
+    writers = [threading.Thread(target=tracker.record_reach,
+                                args=(campaign_id, [f"user-{i}-{j}" for j in range(5)], hour))
+               for i in range(4)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+
+    assert round(tracker.get_unique_reach(campaign_id, days_back=1)) == 21
@@ -0,0 +1,52 @@
+# /tests/test_text_normalizer.py
+# Version: 19-10-2026 17:00:00
+# Pre-Suader AI Agent - Text Normalization Tests
+# Author: Sotiris Spyrou, CEO, VerityAI
+
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from presuader_core_functions import PreSuaderCore
+from text_normalizer import normalize_text
+
+def test_disguised_spellings_normalize_with_offsets():
+    """Full-width, accented, zero-width and homoglyph spellings fold to plain text"""
+    text = "ＴＲＩＣＫ  tríck\ttr​ick trісk Straße ﬁne"
+    normalized = normalize_text(text)
+    assert normalized.text == "trick trick trick trick strasse fine"
+    assert normalize_text(text) is normalized
+
+    for start in range(0, 24, 6):
+        assert normalized.text[start:start + 5] == "trick"
+    assert normalized.span(0, 5) == (0, 5)
+    assert normalized.span(5, 6) == (5, 7)
+    assert text[slice(*normalized.span(6, 11))] == "tríck"
+    assert text[slice(*normalized.span(12, 17))] == "tr​ick"
+    assert text[slice(*normalized.span(24, 31))] == "Straße"
+    assert text[slice(*normalized.span(32, 36))] == "ﬁne"
+
+    plain = normalize_text("Plain ASCII copy")
+    assert plain.text == "plain ascii copy" and not plain.offset_maps
+    # ASCII control whitespace folds to spaces; other control characters are kept
+    controls = normalize_text("Act\tNOW\x1f\r\nok\x07")
+    assert controls.text == "act now ok\x07" and controls.span(7, 10) == (7, 12)
+
+def test_compliance_catches_disguised_keywords():
+    """Disguised keywords are flagged once and located in the original content"""
+    presuader = PreSuaderCore()
+    text = "We never ｔｒｉｃｋ you.\nNo dece​ive, no mаnipulate. Act  now - honest."
+    report = presuader.monitor_ethical_compliance(text)
+    assert report["issues"] == ["Potentially manipulative language detected: 'manipulate'",
+                                "Potentially manipulative language detected: 'deceive'",
+                                "Potentially manipulative language detected: 'trick'"]
+    assert report["compliance_score"] == 100 - 3 * 10 - 5
+
+    located = {finding["rule"]: [text[start:end] for start, end in finding["spans"]]
+               for finding in report["findings"]}
+    assert located["manipulative:trick"] == ["ｔｒｉｃｋ"]
+    assert located["manipulative:deceive"] == ["dece​ive"]
+    assert located["manipulative:manipulate"] == ["mаnipulate"]
+    assert located["urgency:act_now"] == ["Act  now"]